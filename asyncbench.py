@@ -0,0 +1,76 @@
+# Compare getting events from background work onto the Tk thread with an
+# AsyncTk against polling a queue with after(), as logwindow.py and
+# longrunning.py used to.
+#
+#   python asyncbench.py [--mode async|poll] [--interval 200] [--events 100] [--idle 5]
+#
+# Events are produced at random intervals (by a coroutine, or by a thread
+# for 'poll'); we report how long each took to reach the Tk thread, then
+# how much CPU the process uses while sitting idle for --idle seconds.
+
+from tkinter import *
+import argparse
+import asyncio
+import queue
+import random
+import statistics
+import threading
+import time
+from tkasync import AsyncTk
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--mode', choices=('async', 'poll'), default='async')
+parser.add_argument('--interval', type=int, default=200, help='poll interval, ms')
+parser.add_argument('--events', type=int, default=100)
+parser.add_argument('--idle', type=float, default=5)
+args = parser.parse_args()
+
+root = Tk()
+Label(root, text='asyncbench: %s' % args.mode).pack()
+latencies = []
+
+def received(sent):
+    latencies.append(time.perf_counter() - sent)
+    if len(latencies) == args.events:
+        root.after(10, idle)
+
+if args.mode == 'async':
+    aio = AsyncTk(root)
+
+    async def produce():
+        for i in range(args.events):
+            await asyncio.sleep(random.uniform(0.005, 0.05))
+            aio.call(received, time.perf_counter())
+    root.after(100, lambda: aio.submit(produce()))
+else:
+    q = queue.Queue()
+
+    def produce():
+        for i in range(args.events):
+            time.sleep(random.uniform(0.005, 0.05))
+            q.put(time.perf_counter())
+
+    def check():
+        while not q.empty():
+            received(q.get())
+        root.after(args.interval, check)
+    root.after(100, lambda: threading.Thread(target=produce, daemon=True).start())
+    root.after(args.interval, check)
+
+cpu = {}
+def idle():
+    cpu['start'] = time.process_time(), time.perf_counter()
+    root.after(int(args.idle * 1000), finish)
+
+def finish():
+    cpu0, wall0 = cpu['start']
+    cpu['used'] = (time.process_time() - cpu0) / (time.perf_counter() - wall0)
+    root.destroy()
+
+root.mainloop()
+
+ms = sorted(l * 1000 for l in latencies)
+print('mode %s%s' % (args.mode, ', polling every %d ms' % args.interval if args.mode == 'poll' else ''))
+print('latency over %d events: median %.2f ms, p90 %.2f ms, max %.2f ms' %
+      (len(ms), statistics.median(ms), ms[int(len(ms) * 0.9) - 1], ms[-1]))
+print('idle CPU: %.2f%% over %.1f s' % (cpu['used'] * 100, args.idle))
@@ -0,0 +1,63 @@
+from tkinter import *
+from tkinter import ttk
+from datetime import datetime
+from logview import LogView
+from tkasync import AsyncTk
+import asyncio
+
+root = Tk()
+aio = AsyncTk(root)
+running = None
+
+# Coroutines run on the asyncio loop; anything touching widgets goes
+# through aio.call (or aio.tk, to wait for the result).
+async def clock():
+    while True:
+        aio.call(clocktime.set, datetime.now().strftime('%H:%M:%S'))
+        await asyncio.sleep(1)
+
+async def run(cmd):
+    proc = await asyncio.create_subprocess_shell(cmd, stdout=asyncio.subprocess.PIPE,
+                                                 stderr=asyncio.subprocess.STDOUT)
+    try:
+        async for line in proc.stdout:
+            log.write(line.decode(errors='replace').rstrip('\n'))
+        return await proc.wait()
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+
+# One command at a time: while it runs, the button stops it, and the
+# entry is disabled and Return does nothing.
+def start(*args):
+    global running
+    if running is not None:
+        return
+    b.configure(text='Stop', command=stop)
+    e.state(['disabled'])
+    running = aio.submit(run(command.get()), done=finished)
+
+def stop():
+    running.cancel()
+
+def finished(status):
+    global running
+    running = None
+    b.configure(text='Run', command=start)
+    e.state(['!disabled'])
+    log.write('--- exit status %s' % status if status is not None else '--- stopped')
+
+f = ttk.Frame(root, padding=5); f.grid(sticky=(N,W,E,S))
+command = StringVar(value='ping -c 5 localhost')
+clocktime = StringVar()
+e = ttk.Entry(f, textvariable=command, width=50); e.grid(column=0, row=0, sticky=(W,E))
+b = ttk.Button(f, text='Run', command=start); b.grid(column=1, row=0, padx=5)
+ttk.Label(f, textvariable=clocktime).grid(column=2, row=0)
+log = LogView(f, maxlines=1000, width=80, height=24, wrap='none')
+log.grid(column=0, row=1, columnspan=3, pady=5, sticky=(N,W,E,S))
+root.columnconfigure(0, weight=1); root.rowconfigure(0, weight=1)
+f.columnconfigure(0, weight=1); f.rowconfigure(1, weight=1)
+e.bind('<Return>', start)
+
+aio.submit(clock())
+root.mainloop()
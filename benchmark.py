@@ -0,0 +1,263 @@
+# Run the examples under scripted input and measure how they perform.
+#
+#   python benchmark.py [scenario ...] [--json results.json]
+#                       [--baseline baseline.json] [--tolerance 0.25] [--xvfb]
+#
+# Each scenario runs one example in its own process.  The example is run
+# as usual, except that its call to mainloop() is intercepted: instead, we
+# wait for the application to first go idle, then drive it with events
+# sent with event_generate (mouse drags on the sketches, keystrokes into
+# the validated entries, selections in the country list), or in the case
+# of logwindow.py, floods of log messages.  For each scenario we record:
+#
+#   first_idle_ms   time from starting the example until it's first idle
+#   p50_ms, p90_ms, p99_ms, max_ms
+#                   latency of each scripted event: how long until its
+#                   callbacks have run and Tk has caught up (idle tasks)
+#   tcl_commands    Tcl commands evaluated while driving it (info cmdcount)
+#   rss_mb          memory in use afterwards
+#
+# Results are printed, and written as JSON with --json.  With --baseline
+# (the JSON from an earlier run), any metric more than --tolerance worse
+# than in the baseline fails the run (exit status 1).
+#
+# With no display (or with --xvfb), an Xvfb server is started for the
+# duration of the run.
+
+import argparse
+import json
+import os
+import random
+import resource
+import runpy
+import shutil
+import subprocess
+import sys
+import time
+import tkinter
+from tkinter import ttk
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# Memory in use by this process (the peak, where /proc isn't available);
+# the other *bench.py scripts use this too.
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def find(widget, cls):
+    found = [widget] if isinstance(widget, cls) else []
+    for child in widget.winfo_children():
+        found += find(child, cls)
+    return found
+
+
+class Driver:
+    def __init__(self, root, env):
+        self.root, self.env = root, env
+        self.latencies = []
+
+    def timed(self, fn, *args):
+        start = time.perf_counter()
+        fn(*args)
+        self.root.update_idletasks()
+        self.latencies.append(time.perf_counter() - start)
+
+    def event(self, widget, sequence, **kw):
+        self.timed(widget.event_generate, sequence, **kw)
+
+
+# Scenarios: each is given a Driver once the example's window is up.
+
+def drags(d, strokes=30, points=200):
+    canvas = find(d.root, tkinter.Canvas)[0]
+    rnd = random.Random(1)
+    for s in range(strokes):
+        x, y = rnd.randrange(50, 350), rnd.randrange(50, 250)
+        d.event(canvas, '<ButtonPress-1>', x=x, y=y)
+        for p in range(points):
+            x += rnd.randint(-4, 4)
+            y += rnd.randint(-4, 4)
+            d.event(canvas, '<B1-Motion>', x=x, y=y)
+        d.event(canvas, '<ButtonRelease-1>', x=x, y=y)
+
+
+def typing(d, text='12a345-x6789', rounds=50):
+    entry = [e for e in find(d.root, ttk.Entry) if str(e.cget('validatecommand'))][0]
+    entry.focus_force()
+    for r in range(rounds):
+        for ch in text:
+            keysym = {'-': 'minus'}.get(ch, ch)
+            d.event(entry, '<KeyPress>', keysym=keysym)
+        for ch in text:
+            d.event(entry, '<KeyPress>', keysym='BackSpace')
+
+
+def selecting(d, clicks=300):
+    lbox = d.env['lbox']
+    entry = find(d.root, ttk.Entry)[0]
+    entry.focus_force()
+    rnd = random.Random(1)
+    height = max(1, lbox.winfo_height() // max(1, int(lbox['height'])))
+    for i in range(clicks):
+        y = rnd.randrange(int(lbox['height'])) * height + height // 2
+        d.event(lbox, '<ButtonPress-1>', x=10, y=y)
+        d.event(lbox, '<ButtonRelease-1>', x=10, y=y)
+        if i % 30 == 0:
+            for ch in 'ca':
+                d.event(entry, '<KeyPress>', keysym=ch)
+            d.event(entry, '<KeyPress>', keysym='BackSpace')
+            d.event(entry, '<KeyPress>', keysym='BackSpace')
+
+
+def flooding(d, bursts=30, size=5000):
+    log, write = d.env['log'], d.env['writeToLog']
+    for b in range(bursts):
+        start = time.perf_counter()
+        for i in range(size):
+            write('flood %d message %d' % (b, i))
+        while log.queue:
+            d.root.update()
+        d.latencies.append(time.perf_counter() - start)
+
+
+SCENARIOS = {
+    'sketch1': ('sketch1.py', drags),
+    'sketch2': ('sketch2.py', drags),
+    'sketch3': ('sketch3.py', drags),
+    'sketch4': ('sketch4.py', drags),
+    'sketcho': ('sketcho.py', drags),
+    'validate': ('validate.py', typing),
+    'numvalidate': ('numvalidate.py', lambda d: typing(d, '12x345', 100)),
+    'country': ('country.py', selecting),
+    'logwindow': ('logwindow.py', flooding),
+}
+
+
+class Finished(Exception):
+    pass
+
+
+# In the child process: run the example, taking over at mainloop().
+def run(name):
+    path, scenario = SCENARIOS[name]
+    start = time.perf_counter()
+    results = {}
+
+    def mainloop(root, n=0):
+        env = sys._getframe(1).f_globals
+        idle = []
+        root.after_idle(lambda: idle.append(time.perf_counter()))
+        while not idle:
+            root.update()
+        results['first_idle_ms'] = (idle[0] - start) * 1000
+        driver = Driver(root, env)
+        before = int(root.tk.call('info', 'cmdcount'))
+        scenario(driver)
+        results['tcl_commands'] = int(root.tk.call('info', 'cmdcount')) - before
+        ms = sorted(t * 1000 for t in driver.latencies)
+        for p in (50, 90, 99):
+            results['p%d_ms' % p] = ms[min(len(ms) - 1, len(ms) * p // 100)] if ms else 0
+        results['max_ms'] = ms[-1] if ms else 0
+        results['events'] = len(ms)
+        results['rss_mb'] = rss_mb()
+        raise Finished
+
+    tkinter.Misc.mainloop = mainloop
+    sys.argv = [path]
+    sys.path.insert(0, HERE)
+    try:
+        runpy.run_path(os.path.join(HERE, path), run_name='__main__')
+    except Finished:
+        pass
+    print(json.dumps(results))
+
+
+def xvfb():
+    server = shutil.which('Xvfb')
+    if not server:
+        sys.exit('no display, and Xvfb is not installed')
+    for n in range(99, 199):
+        if not os.path.exists('/tmp/.X%d-lock' % n):
+            break
+    proc = subprocess.Popen([server, ':%d' % n, '-screen', '0', '1280x1024x24', '-nolisten', 'tcp'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for i in range(50):
+        if os.path.exists('/tmp/.X11-unix/X%d' % n) or proc.poll() is not None:
+            break
+        time.sleep(0.1)
+    else:
+        proc.terminate()
+    if proc.poll() is not None:
+        sys.exit("Xvfb didn't start on :%d" % n)
+    os.environ['DISPLAY'] = ':%d' % n
+    return proc
+
+
+# Metrics compared against the baseline, and how much noise to allow in
+# absolute terms on top of the relative tolerance.
+COMPARED = {'first_idle_ms': 20, 'p90_ms': 0.5, 'p99_ms': 1, 'tcl_commands': 100, 'rss_mb': 5}
+
+
+def compare(results, baseline, tolerance):
+    failures = []
+    for name, metrics in results.items():
+        for metric, slack in COMPARED.items():
+            old = baseline.get(name, {}).get(metric)
+            new = metrics.get(metric)
+            if old is not None and new is not None and new > old * (1 + tolerance) + slack:
+                failures.append('%s %s: %.2f, was %.2f' % (name, metric, new, old))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('scenarios', nargs='*', help='default: all of %s' % ', '.join(SCENARIOS))
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--baseline', help='compare with results from this file')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--xvfb', action='store_true', help='always run under Xvfb')
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        return run(args.run)
+
+    server = xvfb() if args.xvfb or not os.environ.get('DISPLAY') else None
+    results = {}
+    try:
+        for name in args.scenarios or SCENARIOS:
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--run', name],
+                                  capture_output=True, text=True, timeout=600)
+            lines = proc.stdout.strip().splitlines()
+            if proc.returncode or not lines:
+                print('%-12s FAILED\n%s' % (name, proc.stderr.strip()))
+                results[name] = {'error': proc.stderr.strip().splitlines()[-1:]}
+                continue
+            results[name] = metrics = json.loads(lines[-1])
+            print('%-12s first idle %7.1f ms, %6d events p50 %6.2f p90 %6.2f p99 %6.2f max %7.2f ms, '
+                  '%8d Tcl commands, %6.1f MB' %
+                  (name, metrics['first_idle_ms'], metrics['events'], metrics['p50_ms'], metrics['p90_ms'],
+                   metrics['p99_ms'], metrics['max_ms'], metrics['tcl_commands'], metrics['rss_mb']))
+    finally:
+        if server:
+            server.terminate()
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=1)
+    failed = any('error' in m for m in results.values())
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(results, json.load(f), args.tolerance)
+        for failure in failures:
+            print('REGRESSION', failure)
+        failed = failed or bool(failures)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
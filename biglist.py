@@ -0,0 +1,25 @@
+from tkinter import *
+from tkinter import ttk
+from virtuallist import VirtualListbox
+
+root = Tk()
+
+# A million rows, but the listbox itself only ever holds the few that
+# are visible; see virtuallist.py.
+rows = ['Line %d of 1000000' % i for i in range(1, 1000001)]
+l = VirtualListbox(root, rows, height=10, selectmode='extended')
+l.grid(column=0, row=0, sticky=(N,W,E,S))
+s = ttk.Scrollbar(root, orient=VERTICAL, command=l.yview)
+s.grid(column=1, row=0, sticky=(N,S))
+l['yscrollcommand'] = s.set
+
+status = StringVar()
+ttk.Label(root, textvariable=status, anchor=(W)).grid(column=0, columnspan=2, row=1, sticky=(W,E))
+def showSelection(*args):
+    idxs = l.curselection()
+    status.set('%d selected%s' % (len(idxs), ': ' + l.get(idxs[0]) if idxs else ''))
+l.bind('<<ListboxSelect>>', showSelection)
+
+root.grid_columnconfigure(0, weight=1)
+root.grid_rowconfigure(0, weight=1)
+root.mainloop()
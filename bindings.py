@@ -1,11 +1,15 @@
 from tkinter import *
 from tkinter import ttk
+from throttle import FrameScheduler
 root = Tk()
+frames = FrameScheduler(root)
 l =ttk.Label(root, text="Starting...")
 l.grid()
 l.bind('<Enter>', lambda e: l.configure(text='Moved mouse inside'))
 l.bind('<Leave>', lambda e: l.configure(text='Moved mouse outside'))
 l.bind('<1>', lambda e: l.configure(text='Clicked left mouse button'))
 l.bind('<Double-1>', lambda e: l.configure(text='Double clicked'))
-l.bind('<B3-Motion>', lambda e: l.configure(text='right button drag to %d,%d' % (e.x, e.y)))
+# drag events come much faster than the screen refreshes; only the
+# latest one each frame is shown
+l.bind('<B3-Motion>', frames.throttle(lambda e: l.configure(text='right button drag to %d,%d' % (e.x, e.y))))
 root.mainloop()
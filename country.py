@@ -1,26 +1,36 @@
 from tkinter import *
 from tkinter import ttk
+from virtuallist import VirtualListbox
+from places import Places, PrefixFilter
+import sys
 root = Tk()
 
-# Initialize our country "databases":
-#  - the list of country codes (a subset anyway)
-#  - parallel list of country names, same order as the country codes
-#  - a hash table mapping country code to population
-countrycodes = ('ar', 'au', 'be', 'br', 'ca', 'cn', 'dk', 'fi', 'fr', 'gr', 'in', 'it', 'jp', 'mx', 'nl', 'no', 'es', 'se', 'ch')
-countrynames = ('Argentina', 'Australia', 'Belgium', 'Brazil', 'Canada', 'China', 'Denmark', \
-        'Finland', 'France', 'Greece', 'India', 'Italy', 'Japan', 'Mexico', 'Netherlands', 'Norway', 'Spain', \
-        'Sweden', 'Switzerland')
-cnames = StringVar(value=countrynames)
-populations = {'ar':41000000, 'au':21179211, 'be':10584534, 'br':185971537, \
-        'ca':33148682, 'cn':1323128240, 'dk':5457415, 'fi':5302000, 'fr':64102140, 'gr':11147000, \
-        'in':1131043000, 'it':59206382, 'jp':127718000, 'mx':106535000, 'nl':16402414, \
-        'no':4738085, 'es':45116894, 'se':9174082, 'ch':7508700}
+# Initialize our country "database": a Places store holding the code,
+# name and population of each country (a subset anyway), or of every
+# place in a CSV file with code, name and population columns if one is
+# given on the command line.  See places.py.
+if len(sys.argv) > 1:
+    countries = Places.from_csv(sys.argv[1])
+else:
+    countries = Places([('ar', 'Argentina', 41000000), ('au', 'Australia', 21179211),
+        ('be', 'Belgium', 10584534), ('br', 'Brazil', 185971537), ('ca', 'Canada', 33148682),
+        ('cn', 'China', 1323128240), ('dk', 'Denmark', 5457415), ('fi', 'Finland', 5302000),
+        ('fr', 'France', 64102140), ('gr', 'Greece', 11147000), ('in', 'India', 1131043000),
+        ('it', 'Italy', 59206382), ('jp', 'Japan', 127718000), ('mx', 'Mexico', 106535000),
+        ('nl', 'Netherlands', 16402414), ('no', 'Norway', 4738085), ('es', 'Spain', 45116894),
+        ('se', 'Sweden', 9174082), ('ch', 'Switzerland', 7508700)])
+
+# The countries currently shown in the listbox, i.e. those whose names
+# start with whatever has been typed into the filter entry.
+countryfilter = PrefixFilter(countries)
+matches = countryfilter.update('')
 
 # Names of the gifts we can send
 gifts = { 'card':'Greeting card', 'flowers':'Flowers', 'nastygram':'Nastygram'}
 
 # State variables
 gift = StringVar()
+filtertext = StringVar()
 sentmsg = StringVar()
 statusmsg = StringVar()
 
@@ -33,10 +43,10 @@ statusmsg = StringVar()
 def showPopulation(*args):
     idxs = lbox.curselection()
     if len(idxs)==1:
-        idx = int(idxs[0])
-        code = countrycodes[idx]
-        name = countrynames[idx]
-        popn = populations[code]
+        i = matches.record(int(idxs[0]))
+        code = countries.code(i)
+        name = countries.name(i)
+        popn = countries.population(i)
         statusmsg.set("The population of %s (%s) is %d" % (name, code, popn))
     sentmsg.set('')
 
@@ -51,10 +61,24 @@ def sendGift(*args):
     if len(idxs)==1:
         idx = int(idxs[0])
         lbox.see(idx)
-        name = countrynames[idx]
+        name = countries.name(matches.record(idx))
         # Gift sending left as an exercise to the reader
         sentmsg.set("Sent %s to leader of %s" % (gifts[gift.get()], name))
 
+# Called whenever the text in the filter entry changes.  Each keystroke
+# narrows down the previous matches rather than searching everything
+# again, and the listbox only redraws visible rows whose text changed.
+def applyFilter(*args):
+    global matches
+    matches = countryfilter.update(filtertext.get())
+    lbox.set_items(matches)
+    lbox.see(0)
+    if len(matches):
+        lbox.selection_set(0)
+    else:
+        statusmsg.set('No matching countries')
+    showPopulation()
+
 # Create and grid the outer content frame
 c = ttk.Frame(root, padding=(5, 5, 12, 0))
 c.grid(column=0, row=0, sticky=(N,W,E,S))
@@ -63,8 +87,11 @@ root.grid_rowconfigure(0,weight=1)
 
 # Create the different widgets; note the variables that many
 # of them are bound to, as well as the button callback.
-# We're using the StringVar() 'cnames', constructed from 'countrynames'
-lbox = Listbox(c, listvariable=cnames, height=5)
+# The VirtualListbox shows the names in 'matches' directly, and only holds
+# the rows currently visible, so it copes just as well with a million
+# names.  It also stripes alternating rows for us.
+filt = ttk.Entry(c, textvariable=filtertext)
+lbox = VirtualListbox(c, matches, height=5)
 lbl = ttk.Label(c, text="Send to country's leader:")
 g1 = ttk.Radiobutton(c, text=gifts['card'], variable=gift, value='card')
 g2 = ttk.Radiobutton(c, text=gifts['flowers'], variable=gift, value='flowers')
@@ -74,7 +101,8 @@ sentlbl = ttk.Label(c, textvariable=sentmsg, anchor='center')
 status = ttk.Label(c, textvariable=statusmsg, anchor=W)
 
 # Grid all the widgets
-lbox.grid(column=0, row=0, rowspan=6, sticky=(N,S,E,W))
+filt.grid(column=0, row=0, sticky=(W,E), pady=5)
+lbox.grid(column=0, row=1, rowspan=5, sticky=(N,S,E,W))
 lbl.grid(column=1, row=0, padx=10, pady=5)
 g1.grid(column=1, row=1, sticky=W, padx=20)
 g2.grid(column=1, row=2, sticky=W, padx=20)
@@ -90,10 +118,7 @@ c.grid_rowconfigure(5, weight=1)
 lbox.bind('<<ListboxSelect>>', showPopulation)
 lbox.bind('<Double-1>', sendGift)
 root.bind('<Return>', sendGift)
-
-# Colorize alternating lines of the listbox
-for i in range(0,len(countrynames),2):
-    lbox.itemconfigure(i, background='#f0f0ff')
+filtertext.trace_add('write', applyFilter)
 
 # Set the starting state of the interface, including selecting the
 # default gift to send, and clearing the messages.  Select the first
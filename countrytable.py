@@ -0,0 +1,50 @@
+from tkinter import *
+from tkinter import ttk
+from places import Places
+from tableview import Column, VirtualTable
+import sys
+root = Tk()
+
+# The same country "database" as country.py (or a CSV file of places with
+# code, name and population columns), shown as a table that can be sorted
+# by clicking any column heading.  country.py remains the way to pick a
+# country and send a gift; this is for browsing the data.
+if len(sys.argv) > 1:
+    countries = Places.from_csv(sys.argv[1])
+else:
+    countries = Places([('ar', 'Argentina', 41000000), ('au', 'Australia', 21179211),
+        ('be', 'Belgium', 10584534), ('br', 'Brazil', 185971537), ('ca', 'Canada', 33148682),
+        ('cn', 'China', 1323128240), ('dk', 'Denmark', 5457415), ('fi', 'Finland', 5302000),
+        ('fr', 'France', 64102140), ('gr', 'Greece', 11147000), ('in', 'India', 1131043000),
+        ('it', 'Italy', 59206382), ('jp', 'Japan', 127718000), ('mx', 'Mexico', 106535000),
+        ('nl', 'Netherlands', 16402414), ('no', 'Norway', 4738085), ('es', 'Spain', 45116894),
+        ('se', 'Sweden', 9174082), ('ch', 'Switzerland', 7508700)])
+total = max(sum(countries.populations), 1)
+
+columns = [
+    Column('code', 'Code', countries.code, width=60),
+    Column('name', 'Name', countries.name, key=lambda i: countries.name(i).casefold(), width=200),
+    Column('population', 'Population', countries.population, format='{:,}'.format, anchor='e'),
+    Column('share', 'Share', countries.population, format=lambda p: '%.3f%%' % (100 * p / total), anchor='e', width=80),
+]
+
+c = ttk.Frame(root, padding=(5, 5, 5, 0))
+c.grid(column=0, row=0, sticky=(N,W,E,S))
+table = VirtualTable(c, len(countries), columns, height=15)
+table.grid(column=0, row=0, sticky=(N,W,E,S))
+statusmsg = StringVar()
+ttk.Label(c, textvariable=statusmsg, anchor=W).grid(column=0, row=1, sticky=(W,E), pady=5)
+root.grid_columnconfigure(0, weight=1)
+root.grid_rowconfigure(0, weight=1)
+c.grid_columnconfigure(0, weight=1)
+c.grid_rowconfigure(0, weight=1)
+
+def showPopulation(*args):
+    idxs = table.curselection()
+    if len(idxs)==1:
+        i = idxs[0]
+        statusmsg.set("The population of %s (%s) is %d" % (countries.name(i), countries.code(i), countries.population(i)))
+
+table.bind('<<TableSelect>>', showPopulation)
+table.selection_set([0])
+root.mainloop()
@@ -1,20 +1,31 @@
 from tkinter import *
 from tkinter import ttk
+from dialogs import DialogPool
 root = Tk()
 
 ttk.Entry(root).grid()   # something to interact with
-def dismiss ():
-    dlg.grab_release()
-    dlg.destroy()
-
-dlg = Toplevel(root)
-ttk.Button(dlg, text="Done", command=dismiss).grid()
-dlg.protocol("WM_DELETE_WINDOW", dismiss) # intercept close button
-dlg.transient(root)   # dialog window is related to main
-dlg.wait_visibility() # can't grab until window appears, so we wait
-dlg.grab_set()        # ensure all input goes to our window
-dlg.wait_window()     # block until window is destroyed
 
-root.mainloop()
+# The dialog is built once (while the application is idle, just after
+# startup), then just hidden when dismissed and shown again next time.
+pool = DialogPool(root)
+
+def build(dlg):
+    dlg.count = StringVar()
+    ttk.Label(dlg.top, textvariable=dlg.count).grid(padx=10, pady=5)
+    ttk.Button(dlg.top, text="Done", command=dlg.dismiss).grid(padx=10, pady=5)
+
+def reset(dlg, times):
+    dlg.count.set("Opened %d time%s" % (times, "" if times == 1 else "s"))
 
+pool.register('done', build, reset)
+opened = 0
 
+def launch():
+    global opened
+    opened += 1
+    pool.show('done', opened)   # block until the dialog is dismissed
+
+ttk.Button(root, text="Open Dialog", command=launch).grid()
+root.after(100, launch)
+
+root.mainloop()
@@ -0,0 +1,97 @@
+# How long a dialog takes to open, built from scratch each time (as
+# dialog.py used to) or reused from a DialogPool, and whether opening and
+# closing it many times leaks.
+#
+#   python dialogbench.py [--mode cold|pooled] [--widgets 300] [--cycles 200]
+#
+# The dialog is a form of --widgets labels and entries.  Opening time runs
+# from asking for the dialog until it's on screen with its grab set.  The
+# leak check compares Tcl commands, Tk windows, Python objects and memory
+# after a warm-up with the same numbers after --cycles more opens; it
+# exits with status 1 if the counts grew.
+
+from tkinter import *
+from tkinter import ttk
+import argparse
+import gc
+import statistics
+import sys
+import time
+from benchmark import rss_mb
+from dialogs import Dialog
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--mode', choices=('cold', 'pooled'), default='pooled')
+parser.add_argument('--widgets', type=int, default=300)
+parser.add_argument('--cycles', type=int, default=200)
+args = parser.parse_args()
+
+root = Tk()
+ttk.Entry(root).grid()
+
+def build(dlg):
+    dlg.vars = []
+    for i in range(args.widgets // 2):
+        var = StringVar()
+        ttk.Label(dlg.top, text='Field %d' % i).grid(column=0, row=i, sticky=W)
+        ttk.Entry(dlg.top, textvariable=var).grid(column=1, row=i)
+        dlg.vars.append(var)
+    ttk.Button(dlg.top, text='Done', command=dlg.dismiss).grid(column=1, row=args.widgets)
+
+def reset(dlg):
+    for var in dlg.vars:
+        var.set('')
+
+pooled = Dialog(root, build, reset)
+if args.mode == 'pooled':
+    pooled.build()
+    root.update()
+
+def cycle():
+    start = time.perf_counter()
+    if args.mode == 'cold':
+        dlg = Dialog(root, build, reset)
+    else:
+        dlg = pooled
+    dlg.show(wait=False)
+    root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    dlg.dismiss()
+    if args.mode == 'cold':
+        dlg.destroy()
+    root.update()
+    return elapsed
+
+def windows(w):
+    return 1 + sum(windows(c) for c in w.winfo_children())
+
+def counts():
+    gc.collect()
+    return {'tcl commands': len(root.tk.splitlist(root.tk.call('info', 'commands'))),
+            'tk windows': windows(root),
+            'python objects': len(gc.get_objects()),
+            'rss (MB)': rss_mb()}
+
+first = cycle()
+for i in range(10):
+    cycle()
+times = [0.0] * args.cycles
+before = counts()
+for i in range(args.cycles):
+    times[i] = cycle()
+after = counts()
+root.destroy()
+
+ms = sorted(t * 1000 for t in times)
+print('mode %s, %d widgets, %d cycles' % (args.mode, args.widgets, args.cycles))
+print('first open: %.1f ms' % (first * 1000))
+print('open: median %.2f ms, p90 %.2f ms, max %.2f ms' % (statistics.median(ms), ms[int(len(ms) * 0.9) - 1], ms[-1]))
+leaked = False
+for name in before:
+    grew = after[name] - before[name]
+    print('%-15s %10.1f -> %10.1f' % (name, before[name], after[name]))
+    if name != 'rss (MB)' and grew > 0:
+        leaked = True
+if leaked:
+    print('FAIL: resources grew over repeated open/close cycles')
+    sys.exit(1)
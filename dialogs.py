@@ -0,0 +1,109 @@
+# Dialogs that open instantly, because they're only built once.
+#
+# Building a complicated dialog (a Toplevel full of widgets) every time
+# it's opened, and destroying it afterwards, can make it slow to appear.
+# A Dialog instead builds its window the first time it's needed (or
+# earlier: see DialogPool), and after that just withdraws it when it's
+# dismissed and shows it again next time.  A reset function puts its
+# contents back to how they should look each time it's opened.
+#
+# Otherwise it behaves like the usual modal dialog: it's transient for its
+# parent, grabs input while open, and the window manager's close button
+# dismisses it.  show() waits until it's dismissed and returns the result
+# passed to dismiss(); the keyboard focus then goes back to wherever it
+# was before.
+#
+# A DialogPool keeps the application's dialogs by name, and builds any not
+# yet built one at a time when the application is idle, shortly after
+# startup, so they're ready before the user asks for them.
+
+from tkinter import *
+
+
+class Dialog:
+    # build(dialog) creates the widgets inside dialog.top, and may keep
+    # anything it needs on the dialog; reset(dialog, *args) is called with
+    # the arguments to show() before each opening.
+    def __init__(self, root, build, reset=None, title=None):
+        self.root = root
+        self.builder, self.reset = build, reset
+        self.title = title
+        self.top = None
+        self.result = None
+        self.showing = False
+        self.focus = None
+        self.closed = BooleanVar(root)
+
+    def build(self):
+        if self.top is None:
+            self.top = Toplevel(self.root)
+            self.top.withdraw()
+            if self.title:
+                self.top.title(self.title)
+            self.top.protocol('WM_DELETE_WINDOW', self.dismiss)   # intercept close button
+            self.builder(self)
+        return self
+
+    def show(self, *args, parent=None, wait=True):
+        self.build()
+        if not self.showing:
+            self.focus = self.root.tk.call('focus')   # given back on dismiss
+        if self.reset:
+            self.reset(self, *args)
+        self.result = None
+        self.showing = True
+        self.top.transient(parent or self.root)   # dialog window is related to main
+        self.top.deiconify()
+        if not self.top.winfo_viewable():
+            self.top.wait_visibility()   # can't grab until window appears, so we wait
+        self.top.grab_set()          # ensure all input goes to our window
+        self.top.focus_set()
+        if wait:
+            self.top.wait_variable(self.closed)
+            return self.result
+
+    def dismiss(self, result=None):
+        if self.showing:
+            self.showing = False
+            self.result = result
+            self.top.grab_release()
+            self.top.withdraw()
+            if self.focus and self.root.tk.call('winfo', 'exists', self.focus):
+                self.root.tk.call('focus', self.focus)
+            self.focus = None
+            self.closed.set(True)
+
+    def destroy(self):
+        self.dismiss()
+        if self.top is not None:
+            self.top.destroy()
+            self.top = None
+
+
+class DialogPool:
+    def __init__(self, root, prewarm=True):
+        self.root = root
+        self.dialogs = {}
+        self.pending = None
+        self.prewarm = prewarm
+
+    def register(self, name, build, reset=None, title=None):
+        self.dialogs[name] = Dialog(self.root, build, reset, title)
+        if self.prewarm and not self.pending:
+            self.pending = self.root.after_idle(self._warm)
+        return self.dialogs[name]
+
+    def __getitem__(self, name):
+        return self.dialogs[name].build()
+
+    def show(self, name, *args, **kwargs):
+        return self[name].show(*args, **kwargs)
+
+    # Build one dialog each time the application is idle.
+    def _warm(self):
+        self.pending = None
+        for dialog in self.dialogs.values():
+            if dialog.top is None:
+                dialog.build()
+                self.pending = self.root.after_idle(self._warm)
+                break
@@ -0,0 +1,225 @@
+# Export a drawing of any size to PNG or PostScript without holding up the
+# user interface.
+#
+# Canvas.postscript has Tk render every item in one go on the Tk thread,
+# and building a bitmap of a whole large drawing needs memory in proportion
+# to its area.  Instead, the drawing's stroke geometry (a sketchfile
+# Drawing) is sent once to a pool of worker processes, which each render
+# fixed-size tiles of it: with raster.py for PNG, or as PostScript for one
+# page.  As tiles come back they're written out in order, a band of tiles
+# at a time, PNG rows going through a streaming PNGWriter and PostScript
+# pages straight to the file.  Only about two bands of tiles are ever in
+# flight, and PNG tiles are made shorter for very wide images so that a
+# band's pixels stay within BAND bytes, so memory use doesn't depend on
+# how big the image is or how much is drawn.  (Except for images more
+# than BAND / 64 pixels wide, whose tiles can't get any shorter.)
+#
+# export_png() and export_ps() are jobs for a TaskRunner (see tasks.py):
+# they report progress as the fraction of tiles written, and stop early,
+# leaving no file behind, if cancelled or if anything goes wrong.
+# Exporter does the Tk side for a StrokeList, choosing the format from the
+# file name:
+#
+#   exporter = Exporter(TaskRunner(root), strokes)
+#   exporter.export('drawing.png', progress=..., done=...)
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+from raster import Raster, PNGWriter
+from sketchfile import Drawing
+
+# The most memory the pixels of one band of PNG tiles should take.
+BAND = 32 << 20
+
+# Set in each worker process by _init().
+_drawing = None
+_colors = None
+
+
+def _init(drawing, colors):
+    global _drawing, _colors
+    _drawing, _colors = drawing, colors
+
+
+def _strokes(indexes):
+    ends, styles, coords = _drawing.ends, _drawing.styles, _drawing.coords
+    for i in indexes:
+        start = ends[i - 1] if i else 0
+        color, width = _drawing.palette[styles[i]]
+        yield coords[start:ends[i]], _colors[styles[i]], width
+
+
+def _tile(indexes, x, y, width, height, background):
+    raster = Raster(width, height)
+    if background:
+        raster.pixels[:] = (bytes(background) + b'\xff') * (width * height)
+    for coords, color, w in _strokes(indexes):
+        raster.line(coords, color, w, x, y)
+    return raster.pixels
+
+
+# Pages are drawn from the top left, with the y axis pointing down as on
+# the canvas; a page at the bottom or right edge may be only partly used.
+def _page(indexes, x, y, width, height, pageheight):
+    out = ['gsave 0 %d translate 1 -1 scale %d %d translate' % (pageheight, -x, -y),
+           'newpath %d %d moveto %d 0 rlineto 0 %d rlineto %d 0 rlineto closepath clip newpath'
+           % (x, y, width, height, -width)]
+    for coords, color, w in _strokes(indexes):
+        out.append('%.3f %.3f %.3f setrgbcolor %g setlinewidth' % (color[0] / 255, color[1] / 255, color[2] / 255, w))
+        points = ' '.join('%.1f %.1f l' % (coords[i], coords[i + 1]) for i in range(2, len(coords), 2))
+        out.append('%.1f %.1f m %s s' % (coords[0], coords[1], points or '0 0 rlineto'))
+    out.append('grestore showpage')
+    return '\n'.join(out) + '\n'
+
+
+# For each tile (by row and column) of a region, the strokes touching it.
+def _buckets(drawing, region, tilewidth, tileheight):
+    x0, y0, x1, y1 = region
+    cols, rows = -((x0 - x1) // tilewidth), -((y0 - y1) // tileheight)
+    buckets = {}
+    start = 0
+    for i, (end, style) in enumerate(zip(drawing.ends, drawing.styles)):
+        xs, ys = drawing.coords[start:end:2], drawing.coords[start + 1:end:2]
+        pad = drawing.palette[style][1] / 2 + 1
+        c0, c1 = max(0, int((min(xs) - pad - x0) // tilewidth)), min(cols - 1, int((max(xs) + pad - x0) // tilewidth))
+        r0, r1 = max(0, int((min(ys) - pad - y0) // tileheight)), min(rows - 1, int((max(ys) + pad - y0) // tileheight))
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                buckets.setdefault((r, c), []).append(i)
+        start = end
+    return cols, rows, buckets
+
+
+# Render every tile of the region with fn(indexes, x, y, width, height,
+# *args) in the workers, and hand back the results a row of tiles at a
+# time, in order; or None, if cancelled.
+def _tiles(control, drawing, colors, region, size, workers, fn, *args):
+    tilewidth, tileheight = size
+    cols, rows, buckets = _buckets(drawing, region, tilewidth, tileheight)
+    x0, y0, x1, y1 = region
+    limit = max(2 * cols, 4 * (workers or os.cpu_count() or 1))
+    # Workers are started afresh rather than forked: this runs on a worker
+    # thread of a process that also has Tk in it, neither of which a
+    # forked child can safely inherit.
+    executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init, initargs=(drawing, colors))
+    try:
+        pending = deque()
+        tiles = ((r, c) for r in range(rows) for c in range(cols))
+        band = []
+        done = 0
+        while True:
+            for r, c in tiles:
+                x, y = x0 + c * tilewidth, y0 + r * tileheight
+                pending.append(executor.submit(fn, buckets.pop((r, c), ()), x, y,
+                                               min(tilewidth, x1 - x), min(tileheight, y1 - y), *args))
+                if len(pending) >= limit:
+                    break
+            if not pending:
+                return
+            band.append(pending.popleft().result())
+            if control.cancelled():
+                yield None
+                return
+            if len(band) == cols:
+                done += 1
+                yield band
+                band = []
+                control.progress(done / rows)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _region(region):
+    x0, y0, x1, y1 = (int(round(float(v))) for v in region)
+    return x0, y0, max(x1, x0 + 1), max(y1, y0 + 1)
+
+
+# Write a file by calling write(f) on a temporary file, then put it in
+# place; if cancelled, or anything goes wrong, leave no file behind.
+def _write(control, path, mode, write):
+    temp = path + '.tmp'
+    try:
+        with open(temp, mode) as f:
+            write(f)
+        if control.cancelled():
+            os.remove(temp)
+            return None
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    os.replace(temp, path)
+    return path
+
+
+# Write the region (x0, y0, x1, y1) of the drawing as a PNG.  colors is
+# the (r, g, b) of each entry in the drawing's palette.
+def export_png(control, drawing, colors, region, path, tilesize=256, workers=None, background=(255, 255, 255)):
+    x0, y0, x1, y1 = region = _region(region)
+    tileheight = min(tilesize, max(16, BAND // (4 * (x1 - x0))))
+
+    def write(f):
+        writer = PNGWriter(f, x1 - x0, y1 - y0)
+        for band in _tiles(control, drawing, colors, region, (tilesize, tileheight), workers, _tile, background):
+            if band is None:
+                return
+            widths = [(min(tilesize, x1 - x0 - c * tilesize)) * 4 for c in range(len(band))]
+            height = len(band[0]) // widths[0]
+            writer.write(b''.join(tile[y * w:(y + 1) * w] for tile, w in zip(band, widths))
+                         for y in range(height))
+        writer.close()
+
+    return _write(control, path, 'wb', write)
+
+
+# Write the region of the drawing as PostScript, one page per
+# page-sized piece of it (at one point per pixel).
+def export_ps(control, drawing, colors, region, path, page=(612, 792), workers=None):
+    x0, y0, x1, y1 = region = _region(region)
+    width, height = page
+    cols, rows = -((x0 - x1) // width), -((y0 - y1) // height)
+
+    def write(f):
+        f.write('%%!PS-Adobe-3.0\n%%%%BoundingBox: 0 0 %d %d\n%%%%Pages: %d\n%%%%EndComments\n'
+                '/m {moveto} bind def /l {lineto} bind def /s {stroke} bind def\n'
+                '1 setlinecap 1 setlinejoin\n' % (width, height, cols * rows))
+        number = 0
+        for band in _tiles(control, drawing, colors, region, page, workers, _page, height):
+            if band is None:
+                return
+            for text in band:
+                number += 1
+                f.write('%%%%Page: %d %d\n' % (number, number) + text)
+        f.write('%%EOF\n')
+
+    return _write(control, path, 'w', write)
+
+
+# Export a StrokeList's drawing, as PostScript if the file name ends in
+# .ps or .eps, or as PNG, using a TaskRunner (a thread-based one is best:
+# the job itself mostly waits on the workers).  The strokes' geometry and
+# colors are collected on the Tk thread first, so the drawing can go on
+# changing while it's exported.
+class Exporter:
+    def __init__(self, runner, strokes, workers=None, tilesize=256, page=(612, 792)):
+        self.runner, self.strokes, self.workers = runner, strokes, workers
+        self.tilesize, self.page = tilesize, page
+        self.canvas = strokes.canvas
+
+    def rgb(self, color):
+        return tuple(c >> 8 for c in self.canvas.winfo_rgb(color))
+
+    # The region defaults to the canvas's scrollregion.
+    def export(self, path, region=None, progress=None, done=None):
+        drawing = Drawing.from_strokes(self.strokes)
+        colors = [self.rgb(color) for color, width in drawing.palette]
+        region = region or self.canvas.tk.splitlist(self.canvas['scrollregion']) or \
+            self.canvas.bbox('all') or (0, 0, self.canvas.winfo_width(), self.canvas.winfo_height())
+        if path.lower().endswith(('.ps', '.eps')):
+            return self.runner.submit(export_ps, drawing, colors, region, path, self.page, self.workers,
+                                      progress=progress, done=done)
+        return self.runner.submit(export_png, drawing, colors, region, path, self.tilesize, self.workers,
+                                  self.rgb(self.canvas['background']), progress=progress, done=done)
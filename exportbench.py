@@ -0,0 +1,81 @@
+# Time and peak memory to export a large drawing as PNG: tiled, in worker
+# processes, streaming into the file (export.py), or rendered as one
+# bitmap and then encoded (what flattening the whole canvas would take).
+#
+#   python exportbench.py [--mode tiled|whole] [--size 4000] [--points 1000000]
+#                         [--workers N] [--tilesize 256]
+#
+# The drawing is --points random-walk points spread over a --size pixel
+# square.  Peak memory is reported for this process and for the largest
+# worker; with --mode tiled it should barely change as --size grows, and
+# the time should drop as --workers goes up (up to the number of cores).
+
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+from export import export_png
+from raster import Raster
+from sketchfile import Drawing
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--mode', choices=('tiled', 'whole'), default='tiled')
+parser.add_argument('--size', type=int, default=4000)
+parser.add_argument('--points', type=int, default=1000000)
+parser.add_argument('--workers', type=int, default=os.cpu_count())
+parser.add_argument('--tilesize', type=int, default=256)
+args = parser.parse_args()
+
+
+class Control:
+    def progress(self, value):
+        pass
+
+    def cancelled(self):
+        return False
+
+
+def peak_mb(who):
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+rnd = random.Random(1)
+drawing = Drawing()
+points = 0
+while points < args.points:
+    n = min(args.points - points, rnd.randint(100, 300))
+    x, y = rnd.uniform(0, args.size), rnd.uniform(0, args.size)
+    coords = []
+    for i in range(n):
+        x = min(max(x + rnd.uniform(-3, 3), 0), args.size)
+        y = min(max(y + rnd.uniform(-3, 3), 0), args.size)
+        coords += (x, y)
+    drawing.add(coords, rnd.choice(('black', 'red', 'blue')), rnd.choice((1, 1, 5)))
+    points += n
+colors = [{'black': (0, 0, 0), 'red': (255, 0, 0), 'blue': (0, 0, 255)}[c] for c, w in drawing.palette]
+path = os.path.join(tempfile.mkdtemp(), 'export.png')
+before = peak_mb(resource.RUSAGE_SELF)
+
+start = time.perf_counter()
+if args.mode == 'tiled':
+    export_png(Control(), drawing, colors, (0, 0, args.size, args.size), path, args.tilesize, args.workers)
+else:
+    raster = Raster(args.size, args.size)
+    raster.pixels[:] = b'\xff\xff\xff\xff' * (args.size * args.size)
+    for coords, (color, width) in drawing:
+        raster.line(coords, colors[drawing.lookup[color, width]], width)
+    with open(path, 'wb') as f:
+        f.write(raster.png())
+elapsed = time.perf_counter() - start
+
+size = os.path.getsize(path)
+os.remove(path)
+os.rmdir(os.path.dirname(path))
+print('mode %s, %dx%d, %d points, %s' % (args.mode, args.size, args.size, points,
+                                         '%d workers' % args.workers if args.mode == 'tiled' else '1 process'))
+print('time: %.2f s, file %.1f MB' % (elapsed, size / 2**20))
+print('peak memory: %.0f MB here (%.0f MB before exporting)' % (peak_mb(resource.RUSAGE_SELF), before))
+if args.mode == 'tiled':
+    print('             %.0f MB in the largest worker' % peak_mb(resource.RUSAGE_CHILDREN))
@@ -0,0 +1,44 @@
+# Throughput of feet-to-meters conversion: one value at a time (as the
+# Calculate button does it) versus the vectorized kernel, plus parsing a
+# pasted column and streaming a CSV file.
+#
+#   python f2mbench.py [--rows 1000000]
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import feetmeters
+from feetmeters import convert, convert_all, convert_column, convert_csv, parse, results
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--rows', type=int, default=1000000)
+args = parser.parse_args()
+
+random.seed(1)
+values = [random.uniform(-10000, 10000) for i in range(args.rows)]
+text = '\n'.join('%.3f' % v for v in values)
+
+def timed(name, fn, *a):
+    start = time.perf_counter()
+    result = fn(*a)
+    elapsed = time.perf_counter() - start
+    print('%-34s %8.3f s  %12.0f rows/s' % (name, elapsed, args.rows / elapsed))
+    return result
+
+print('%d rows, NumPy %s' % (args.rows, feetmeters.numpy.__version__ if feetmeters.numpy else 'not available'))
+scalar = timed('scalar (per value)', lambda: [convert(v) for v in values])
+vector = timed('vectorized kernel', convert_all, values)
+assert results(vector) == scalar, 'kernel rounds differently'
+timed('parse + convert pasted column', convert_column, text)
+timed('parse only', parse, text.splitlines())
+
+source = os.path.join(tempfile.gettempdir(), 'f2mbench.csv')
+dest = os.path.join(tempfile.gettempdir(), 'f2mbench-meters.csv')
+with open(source, 'w') as f:
+    f.write('id,feet\n')
+    f.writelines('%d,%.3f\n' % (i, v) for i, v in enumerate(values))
+timed('CSV file', convert_csv, None, source, dest, 'feet')
+os.remove(source)
+os.remove(dest)
@@ -1,5 +1,8 @@
 from tkinter import *
 from tkinter import ttk
+from tkinter import filedialog
+from feetmeters import convert, convert_column, convert_csv
+from tasks import TaskRunner
 
 class FeetToMeters:
 
@@ -30,13 +33,84 @@ class FeetToMeters:
         feet_entry.focus()
         root.bind("<Return>", self.calculate)
         
+        self.batch(root, mainframe)
+
     def calculate(self, *args):
         try:
             value = float(self.feet.get())
-            self.meters.set(int(0.3048 * value * 10000.0 + 0.5)/10000.0)
-        except ValueError:
+            self.meters.set(convert(value))
+        except (ValueError, OverflowError):
             pass
 
+    # Batch mode: paste a column of values in feet to convert them all at
+    # once, or convert a whole CSV file in the background.
+    def batch(self, root, mainframe):
+        batchframe = ttk.Labelframe(mainframe, text="Batch", padding=5)
+        batchframe.grid(column=1, row=4, columnspan=3, sticky=(N, W, E, S), padx=5, pady=5)
+        mainframe.columnconfigure(2, weight=1)
+        mainframe.rowconfigure(4, weight=1)
+
+        self.column_in = Text(batchframe, width=15, height=10)
+        self.column_out = Text(batchframe, width=15, height=10, state='disabled')
+        ttk.Label(batchframe, text="feet (paste a column)").grid(column=0, row=0, sticky=W)
+        ttk.Label(batchframe, text="meters").grid(column=2, row=0, sticky=W)
+        self.column_in.grid(column=0, row=1, sticky=(N, W, E, S))
+        ttk.Button(batchframe, text="Convert", command=self.convertColumn).grid(column=1, row=1, padx=5)
+        self.column_out.grid(column=2, row=1, sticky=(N, W, E, S))
+        batchframe.columnconfigure(0, weight=1)
+        batchframe.columnconfigure(2, weight=1)
+        batchframe.rowconfigure(1, weight=1)
+
+        # CSV files: the column in feet is picked by its name in the header
+        # row (or by number, counting from 0).
+        self.runner = TaskRunner(root, workers=1)
+        self.job = None
+        self.csv_column = StringVar(value="feet")
+        ttk.Label(batchframe, text="feet column in CSV files").grid(column=0, row=2, sticky=W, pady=5)
+        ttk.Entry(batchframe, width=10, textvariable=self.csv_column).grid(column=2, row=2, sticky=(W, E), pady=5)
+        self.csv_button = ttk.Button(batchframe, text="Convert CSV file...", command=self.convertFile)
+        self.csv_button.grid(column=0, row=3, sticky=W, pady=5)
+        self.progress = ttk.Progressbar(batchframe, orient="horizontal", mode="determinate", maximum=1.0)
+        self.progress.grid(column=1, row=3, columnspan=2, sticky=(W, E), pady=5)
+        self.status = StringVar()
+        ttk.Label(batchframe, textvariable=self.status).grid(column=0, row=4, columnspan=3, sticky=W)
+
+    def convertColumn(self):
+        result = convert_column(self.column_in.get('1.0', 'end - 1 char'))
+        self.column_out['state'] = 'normal'
+        self.column_out.delete('1.0', 'end')
+        self.column_out.insert('1.0', result)
+        self.column_out['state'] = 'disabled'
+
+    def convertFile(self):
+        source = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("All files", "*")])
+        if not source:
+            return
+        dest = filedialog.asksaveasfilename(defaultextension=".csv", initialfile="meters.csv")
+        if not dest:
+            return
+        column = self.csv_column.get().strip()
+        column = int(column) if column.isdigit() else column
+        self.status.set("Converting %s..." % source)
+        self.csv_button.configure(text="Stop", command=self.stopFile)
+        self.job = self.runner.submit(convert_csv, source, dest, column, True,
+                                      done=self.fileDone, error=self.fileFailed,
+                                      progress=lambda fraction: self.progress.configure(value=fraction))
+
+    def stopFile(self):
+        self.job.cancel()
+
+    def fileDone(self, rows):
+        self.fileFinished("%d rows converted" % rows if rows is not None else "Stopped")
+
+    def fileFailed(self, error):
+        self.fileFinished("Failed: %s" % error)
+
+    def fileFinished(self, message):
+        self.progress['value'] = 0
+        self.csv_button.configure(text="Convert CSV file...", command=self.convertFile)
+        self.status.set(message)
+
 root = Tk()
 FeetToMeters(root)
 root.mainloop()
\ No newline at end of file
@@ -0,0 +1,175 @@
+# Convert feet to meters in bulk: pasted columns of numbers, CSV files,
+# millions of rows.
+#
+# The conversion rounds to four decimal places exactly as the Feet to
+# Meters examples do, int(0.3048 * value * 10000.0 + 0.5) / 10000.0, but
+# on whole arrays at once using NumPy when it's available (int() truncates
+# towards zero, hence numpy.trunc).  Without NumPy the same thing is done
+# a value at a time.  Values that aren't numbers, or are too big to
+# convert, come out as None.
+#
+# CSV files are converted a chunk of rows at a time, so they can be any
+# size; convert_csv takes an optional Control (see tasks.py) to report
+# progress and notice cancellation when run in the background.
+#
+# As a script:
+#
+#   python feetmeters.py [input.csv] [-o output.csv] [--column feet]
+#
+# adds a meters column to a CSV file (or converts one value per line from
+# standard input to standard output, if no file is given).
+
+import argparse
+import csv
+import itertools
+import math
+import os
+import sys
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def convert(value):
+    return int(0.3048 * value * 10000.0 + 0.5) / 10000.0
+
+
+# convert(), or NaN for a value that isn't a number, or is too big to
+# round.
+def _convert(value):
+    try:
+        return convert(value)
+    except (OverflowError, ValueError):
+        return math.nan
+
+
+# Convert a sequence of floats (NaN for missing values); gives an array
+# with NumPy, otherwise a list.
+def convert_all(values):
+    if numpy is not None:
+        with numpy.errstate(over='ignore', invalid='ignore'):
+            meters = numpy.trunc(0.3048 * numpy.asarray(values, dtype=numpy.float64) * 10000.0 + 0.5) / 10000.0
+        meters[~numpy.isfinite(meters)] = numpy.nan
+        return meters
+    return [_convert(v) for v in values]
+
+
+# Strings to floats, with NaN for anything that isn't a (finite) number.
+def parse(strings):
+    if numpy is not None:
+        try:
+            values = numpy.array(strings, dtype=numpy.float64)
+        except ValueError:
+            values = numpy.array([_parse(s) for s in strings], dtype=numpy.float64)
+        values[~numpy.isfinite(values)] = numpy.nan
+        return values
+    return [_parse(s) for s in strings]
+
+
+def _parse(s):
+    try:
+        value = float(s)
+    except ValueError:
+        return math.nan
+    return value if math.isfinite(value) else math.nan
+
+
+def results(converted):
+    values = converted.tolist() if numpy is not None and isinstance(converted, numpy.ndarray) else converted
+    return [None if v != v else v for v in values]
+
+
+# A pasted column: one value per line in, one per line out (blank where
+# the input wasn't a number).
+def convert_column(text):
+    lines = text.splitlines()
+    return '\n'.join('' if v is None else str(v) for v in results(convert_all(parse(lines))))
+
+
+# Add a meters column to a CSV file.  column is the name (if the file has
+# a header row) or number of the column holding feet.  The output is
+# written to a temporary file and only put in place once it's complete,
+# so a cancelled or failed conversion leaves no partial file behind.
+def convert_csv(control, source, dest, column=0, header=True, chunksize=100000):
+    if os.path.abspath(source) == os.path.abspath(dest) or \
+            os.path.exists(dest) and os.path.samefile(source, dest):
+        raise ValueError("can't write the output over the input file")
+    temp = dest + '.tmp'
+    try:
+        with open(temp, 'w', newline='', encoding='utf-8') as dst:
+            rows = _convert_csv(control, source, dst, column, header, chunksize)
+        if rows is None:
+            os.remove(temp)
+            return None
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    os.replace(temp, dest)
+    return rows
+
+
+def _convert_csv(control, source, dst, column, header, chunksize):
+    total = os.path.getsize(source) or 1
+    done = 0
+    with open(source, newline='', encoding='utf-8') as src:
+        def lines():
+            nonlocal done
+            for line in src:
+                done += len(line)
+                yield line
+        reader, writer = csv.reader(lines()), csv.writer(dst)
+        if header:
+            names = next(reader, [])
+            if not isinstance(column, int):
+                if column not in names:
+                    raise ValueError('no column named %r in %s' % (column, source))
+                column = names.index(column)
+            writer.writerow(names + ['meters'])
+        rows = 0
+        while True:
+            chunk = list(itertools.islice(reader, chunksize))
+            if not chunk:
+                break
+            feet = parse([row[column] if column < len(row) else '' for row in chunk])
+            for row, m in zip(chunk, results(convert_all(feet))):
+                row.append('' if m is None else m)
+            writer.writerows(chunk)
+            rows += len(chunk)
+            if control:
+                if control.cancelled():
+                    return None
+                control.progress(min(1.0, done / total))
+    return rows
+
+
+# One value per line from src to dst, a chunk of lines at a time.
+def convert_lines(src, dst, chunksize=100000):
+    while True:
+        lines = list(itertools.islice(src, chunksize))
+        if not lines:
+            break
+        dst.writelines('%s\n' % ('' if v is None else v) for v in results(convert_all(parse(lines))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert feet to meters.')
+    parser.add_argument('input', nargs='?', help='CSV file (default: one value per line on stdin)')
+    parser.add_argument('-o', '--output', help='CSV file to write (default: input-meters.csv)')
+    parser.add_argument('--column', default='0', help='name or number of the column in feet')
+    parser.add_argument('--no-header', action='store_true', help='the CSV file has no header row')
+    args = parser.parse_args(argv)
+    if not args.input:
+        convert_lines(sys.stdin, sys.stdout)
+        return 0
+    column = int(args.column) if args.column.isdigit() else args.column
+    output = args.output or os.path.splitext(args.input)[0] + '-meters.csv'
+    rows = convert_csv(None, args.input, output, column, header=not args.no_header)
+    print('%d rows written to %s' % (rows, output), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# A read-only viewer for very large (multi-gigabyte) text files.
+#
+# The file is memory-mapped rather than read, and a background thread
+# builds a sparse line index: the byte offset of every 'stride'-th line.
+# To find any line we jump to the nearest indexed line and skip at most
+# stride-1 newlines, so going to a line costs the same anywhere in the
+# file, while the index itself stays small (one offset per 64 lines).
+#
+# The Text widget only ever holds the lines currently on screen plus a
+# few extra.  Scrolling is handled here instead of by the Text widget:
+# the scrollbar talks to FileView.yview, and the scrollbar position is
+# computed from the line index.  If the file grows, new lines are picked
+# up, and the view follows the end of the file while scrolled to the end;
+# if it's truncated (say, a log being rotated), indexing starts over.
+
+from tkinter import *
+from tkinter import ttk
+from tkinter import font
+from array import array
+import mmap
+import os
+import re
+import threading
+import time
+
+
+class LineIndex:
+    def __init__(self, path, stride=64, chunksize=1<<20):
+        self.stride = stride
+        self.chunksize = chunksize
+        self.file = open(path, 'rb')
+        self.map = None
+        self.size = 0
+        self.marks = array('q', [0])
+        self.lines = 0
+        self.scanned = 0
+        self.stopped = False
+        self.patterns = {}
+        # Held while the scanning thread changes the map or the index, and
+        # while the Tk thread reads them.
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.scan, daemon=True)
+        self.thread.start()
+
+    # Number of lines, counting a final line without a newline.
+    def count(self):
+        with self.lock:
+            return self.lines + (1 if self.size > self.scanned else 0)
+
+    # Stop scanning; the scanning thread closes the map and the file on
+    # its way out.
+    def close(self):
+        with self.lock:
+            self.stopped = True
+            self.map = None
+
+    def scan(self):
+        map = None
+        try:
+            while not self.stopped:
+                size = os.fstat(self.file.fileno()).st_size
+                if size != self.size:
+                    # Truncated (or rotated), or grown: map it afresh, and
+                    # start over if it got smaller.
+                    old = map
+                    map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+                    with self.lock:
+                        if not self.stopped:
+                            if size < self.size:
+                                self.marks, self.lines, self.scanned = array('q', [0]), 0, 0
+                            self.map, self.size = map, size
+                    if old is not None:
+                        old.close()
+                pos = self.scanned
+                if map is not None and pos < size:
+                    self._index(map, pos, size)
+                if self.scanned == pos:
+                    time.sleep(0.25)
+        finally:
+            if map is not None:
+                map.close()
+            self.file.close()
+
+    # Index the complete lines in map[pos:end] a chunk at a time.
+    # Matching 'stride' lines at once with a regular expression keeps the
+    # work in C.
+    def _index(self, map, pos, end):
+        while pos < end and not self.stopped:
+            chunk = map[pos:min(pos + self.chunksize, end)]
+            cut = chunk.rfind(b'\n') + 1
+            if cut == 0:
+                newline = map.find(b'\n', pos + len(chunk), end)
+                if newline < 0:
+                    break
+                chunk, cut = map[pos:newline+1], newline + 1 - pos
+            chunk = chunk[:cut]
+            marks = []
+            match = self._pattern(self.stride - self.lines % self.stride).match(chunk)
+            if match:
+                marks.append(pos + match.end())
+                for match in self._pattern(self.stride).finditer(chunk, match.end()):
+                    marks.append(pos + match.end())
+            pos += cut
+            with self.lock:
+                self.marks.extend(marks)
+                self.lines += chunk.count(b'\n')
+                self.scanned = pos
+
+    def _pattern(self, lines):
+        if lines not in self.patterns:
+            self.patterns[lines] = re.compile(rb'(?:[^\n]*\n){%d}' % lines)
+        return self.patterns[lines]
+
+    def offset(self, line):
+        map, pos = self.map, self.marks[line // self.stride]
+        for i in range(line % self.stride):
+            pos = map.find(b'\n', pos) + 1
+        return pos
+
+    # Up to 'count' lines starting at 'line', as strings.  Nothing while
+    # the file is smaller than what's mapped (it has just been truncated,
+    # and reading past its end would crash), until it has been rescanned.
+    def read(self, line, count):
+        with self.lock:
+            total = self.lines + (1 if self.size > self.scanned else 0)
+            if self.map is None or line >= total or os.fstat(self.file.fileno()).st_size < self.size:
+                return []
+            return self._read(line, min(count, total - line))
+
+    def _read(self, line, count):
+        map, pos, end = self.map, self.offset(line), self.size
+        lines = []
+        for i in range(count):
+            newline = map.find(b'\n', pos, end)
+            stop = newline if newline >= 0 else end
+            lines.append(map[pos:stop].rstrip(b'\r').decode('utf-8', 'replace'))
+            if newline < 0:
+                break
+            pos = newline + 1
+        return lines
+
+
+class FileView(ttk.Frame):
+    def __init__(self, parent, path, overscan=2, **kwargs):
+        super().__init__(parent)
+        self.index = LineIndex(path)
+        self.overscan = overscan
+        self.top = 0
+        self.total = 0
+        self.follow = True
+        kwargs.setdefault('wrap', 'none')
+        self.text = Text(self, state='disabled', **kwargs)
+        self.rows = int(self.text['height'])
+        self.ys = ttk.Scrollbar(self, orient=VERTICAL, command=self.yview)
+        self.xs = ttk.Scrollbar(self, orient=HORIZONTAL, command=self.text.xview)
+        self.text['xscrollcommand'] = self.xs.set
+        self.text.grid(column=0, row=0, sticky=(N,W,E,S))
+        self.ys.grid(column=1, row=0, sticky=(N,S))
+        self.xs.grid(column=0, row=1, sticky=(W,E))
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.linespace = font.Font(font=self.text['font']).metrics('linespace')
+        self.text.bind('<Configure>', self.resized)
+        self.text.bind('<MouseWheel>', lambda e: self.scroll(-e.delta // 120 * 3))
+        self.text.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.text.bind('<Button-5>', lambda e: self.scroll(3))
+        self.text.bind('<Up>', lambda e: self.scroll(-1))
+        self.text.bind('<Down>', lambda e: self.scroll(1))
+        self.text.bind('<Prior>', lambda e: self.scroll(-self.rows))
+        self.text.bind('<Next>', lambda e: self.scroll(self.rows))
+        self.text.bind('<Control-Home>', lambda e: self.goto(0) or 'break')
+        self.text.bind('<Control-End>', lambda e: self.goto(self.total) or 'break')
+        self.polling = None
+        self.bind('<Destroy>', self.destroyed)
+        self.poll()
+
+    def destroyed(self, event):
+        if event.widget is self:
+            if self.polling:
+                self.after_cancel(self.polling)
+                self.polling = None
+            self.index.close()
+
+    def poll(self):
+        total = self.index.count()
+        if total != self.total:
+            self.total = total
+            if self.follow:
+                self.top = max(0, total - self.rows)
+            self.render()
+        self.polling = self.after(250, self.poll)
+
+    def resized(self, event):
+        rows = max(1, event.height // self.linespace)
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
+
+    def render(self):
+        lines = self.index.read(self.top, self.rows + self.overscan)
+        self.text['state'] = 'normal'
+        self.text.delete('1.0', 'end')
+        self.text.insert('1.0', '\n'.join(lines))
+        self.text['state'] = 'disabled'
+        total = max(self.total, 1)
+        self.ys.set(self.top / total, min(1.0, (self.top + self.rows) / total))
+
+    def goto(self, line):
+        self.top = max(0, min(line, self.total - self.rows))
+        self.follow = self.top + self.rows >= self.total
+        self.render()
+
+    def scroll(self, amount):
+        self.goto(self.top + amount)
+        return 'break'
+
+    # Scrollbar command, as for any scrollable widget.
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.goto(int(float(args[1]) * self.total))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self.scroll(amount * self.rows if args[2] == 'pages' else amount)
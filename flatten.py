@@ -0,0 +1,129 @@
+# Keep the number of canvas items bounded in long drawing sessions by
+# "flattening" older strokes into images.
+#
+# Only the most recent 'keep' strokes of a StrokeList remain vector line
+# items.  Older ones are rendered into fixed-size image tiles that are
+# placed underneath everything else on the canvas, and their line items
+# are then deleted.  Rendering happens a few tiles at a time from the
+# event loop, so drawing stays responsive.  When an edit (delete, recolor,
+# undo, redo) affects a flattened stroke, only the tiles it overlaps are
+# rendered again.  Flattened strokes have no canvas item to click on, so
+# find() looks them up by position instead.
+
+from tkinter import *
+import base64
+import time
+from raster import Raster
+from viewport import distance
+
+
+class FlattenLayer:
+    def __init__(self, strokes, keep=200, tilesize=256):
+        self.strokes = strokes
+        self.canvas = strokes.canvas
+        self.keep = keep
+        self.tilesize = tilesize
+        self.recent = {}
+        self.pending = {}
+        self.placed = {}
+        self.tiles = {}
+        self.images = {}
+        self.dirty = set()
+        self.colors = {}
+        self.scheduled = None
+        strokes.watchers.append(self.update)
+
+    def update(self, event, stroke):
+        if event == 'added':
+            self.recent[stroke.id] = stroke
+            while len(self.recent) > self.keep:
+                old = self.recent.pop(next(iter(self.recent)))
+                self.pending[old.id] = old
+                self._place(old)
+        elif event == 'removed':
+            self.recent.pop(stroke.id, None)
+            self.pending.pop(stroke.id, None)
+            self._unplace(stroke)
+        elif event == 'changed' and stroke.id in self.placed:
+            self.dirty.update(self.placed[stroke.id])
+        if self.dirty and self.scheduled is None:
+            self.scheduled = self.canvas.after(10, self.render)
+
+    # Render dirty tiles for up to 'budget' seconds, then let the event
+    # loop run again.  Once every tile is up to date, the vector items of
+    # strokes that were waiting to be flattened can go.
+    def render(self, budget=0.01):
+        self.scheduled = None
+        deadline = time.perf_counter() + budget
+        while self.dirty and time.perf_counter() < deadline:
+            self._render(self.dirty.pop())
+        if self.dirty:
+            self.scheduled = self.canvas.after(1, self.render)
+            return
+        for stroke in self.pending.values():
+            self.strokes.release(stroke)
+        self.pending.clear()
+
+    # Bring everything up to date right away.
+    def flush(self):
+        if self.scheduled is not None:
+            self.canvas.after_cancel(self.scheduled)
+        self.render(budget=float('inf'))
+
+    # The topmost flattened stroke passing within 'halo' of the point, or
+    # None.
+    def find(self, x, y, halo=3):
+        size = self.tilesize
+        ids = set()
+        for col in range(int((x - halo) // size), int((x + halo) // size) + 1):
+            for row in range(int((y - halo) // size), int((y + halo) // size) + 1):
+                ids.update(self.tiles.get((col, row), ()))
+        for id in sorted(ids, reverse=True):
+            stroke = self.strokes.strokes[id]
+            if distance(stroke.coords, x, y) <= halo + float(stroke.options.get('width', 1)) / 2:
+                return stroke
+        return None
+
+    def _place(self, stroke):
+        size = self.tilesize
+        x0, y0, x1, y1 = stroke.bounds()
+        keys = [(col, row) for col in range(int(x0 // size), int(x1 // size) + 1)
+                           for row in range(int(y0 // size), int(y1 // size) + 1)]
+        for key in keys:
+            self.tiles.setdefault(key, set()).add(stroke.id)
+        self.placed[stroke.id] = keys
+        self.dirty.update(keys)
+
+    def _unplace(self, stroke):
+        for key in self.placed.pop(stroke.id, ()):
+            self.tiles[key].discard(stroke.id)
+            self.dirty.add(key)
+
+    def _render(self, key):
+        ids = self.tiles.get(key)
+        if not ids:
+            self.tiles.pop(key, None)
+            if key in self.images:
+                self.canvas.delete(self.images.pop(key)[1])
+            return
+        size = self.tilesize
+        x0, y0 = key[0] * size, key[1] * size
+        raster = Raster(size, size)
+        for id in sorted(ids):
+            stroke = self.strokes.strokes[id]
+            raster.line(stroke.coords, self._rgb(stroke.options.get('fill', 'black')),
+                        float(stroke.options.get('width', 1)), x0, y0)
+        data = base64.b64encode(raster.png()).decode('ascii')
+        if key in self.images:
+            self.images[key][0].blank()
+            self.images[key][0].configure(data=data, format='png')
+        else:
+            photo = PhotoImage(master=self.canvas, data=data, format='png')
+            item = self.canvas.create_image(x0, y0, image=photo, anchor='nw', tags='flattened')
+            self.canvas.tag_lower(item)
+            self.images[key] = (photo, item)
+
+    def _rgb(self, color):
+        if color not in self.colors:
+            self.colors[color] = tuple(c >> 8 for c in self.canvas.winfo_rgb(color))
+        return self.colors[color]
@@ -0,0 +1,62 @@
+# Compare scrolling and redrawing a large drawing kept entirely as vector
+# line items with the same drawing flattened into image tiles.
+#
+#   python flattenbench.py [--strokes 20000] [--points 30] [--keep 200]
+
+from tkinter import *
+import argparse
+import random
+import statistics
+import time
+from strokes import StrokeList
+from flatten import FlattenLayer
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--strokes', type=int, default=20000)
+parser.add_argument('--points', type=int, default=30, help='points per stroke')
+parser.add_argument('--keep', type=int, default=200, help='strokes left as vectors')
+parser.add_argument('--size', type=int, default=1000, help='scrollregion width and height')
+args = parser.parse_args()
+
+root = Tk()
+
+def run(flatten):
+    canvas = Canvas(root, width=400, height=400, scrollregion=(0, 0, args.size, args.size))
+    canvas.grid(column=0, row=0)
+    root.update()
+    strokes = StrokeList(canvas, width=5)
+    layer = FlattenLayer(strokes, keep=args.keep) if flatten else None
+    rnd = random.Random(1)
+    start = time.perf_counter()
+    for n in range(args.strokes):
+        x, y = rnd.randrange(args.size), rnd.randrange(args.size)
+        strokes.begin(x, y)
+        for i in range(args.points):
+            x, y = x + rnd.randint(-6, 6), y + rnd.randint(-6, 6)
+            strokes.add(x, y)
+        strokes.finish(width=1)
+    if layer:
+        layer.flush()
+    root.update()
+    build = time.perf_counter() - start
+
+    scrolls = []
+    for i in range(50):
+        start = time.perf_counter()
+        canvas.xview_moveto(rnd.random())
+        canvas.yview_moveto(rnd.random())
+        root.update_idletasks()
+        scrolls.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    canvas.move('all', 0, 0)
+    root.update_idletasks()
+    redraw = time.perf_counter() - start
+    print('%-10s %8d %10.2f %10.2f %10.2f %10.2f' % ('flattened' if flatten else 'vectors',
+          len(canvas.find('all')), build, statistics.median(scrolls) * 1e3,
+          max(scrolls) * 1e3, redraw * 1e3))
+    canvas.destroy()
+
+print('%-10s %8s %10s %10s %10s %10s' % ('mode', 'items', 'build s', 'scroll ms', 'worst ms', 'redraw ms'))
+run(False)
+run(True)
+root.destroy()
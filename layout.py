@@ -0,0 +1,126 @@
+# Build a whole form from a declarative description, in one go.
+#
+# Creating widgets one by one, then gridding them and configuring rows and
+# columns, takes a separate call from Python into Tcl for each step, which
+# adds up for forms with thousands of fields.  Here a form is described by
+# a dict (which could come from a JSON file), turned into a list of Tcl
+# commands, and run with a single call.
+#
+#   handles = build(root, {
+#       'columns': {0: {'weight': 1}}, 'rows': {0: {'weight': 1}},
+#       'children': [
+#           {'type': 'Frame', 'name': 'content', 'options': {'padding': 5},
+#            'grid': {'column': 0, 'row': 0, 'sticky': 'nsew'},
+#            'columns': {1: {'weight': 1}},
+#            'children': [
+#                {'type': 'Label', 'options': {'text': 'Name'}, 'grid': {'column': 0, 'row': 0}},
+#                {'type': 'Entry', 'name': 'name', 'grid': {'column': 1, 'row': 0, 'sticky': 'we'}},
+#            ]},
+#       ]})
+#   handles['name'].get()
+#
+# Each widget has a 'type': a widget class, or the name of one ('Label'
+# means ttk.Label, 'tk.Text' the classic tkinter Text), plus optional
+# 'options' (as you'd pass when creating it), 'grid' options, 'columns'
+# and 'rows' (grid row/column options by index), and 'children'.  A spec
+# without a type configures the parent it's built into.  Widgets with a
+# 'name' are returned in the dict of handles, as ordinary tkinter widget
+# objects.  Types not known here (your own widget classes, say) are still
+# allowed, but are created the usual way, outside the batch.
+
+import tkinter
+from tkinter import ttk
+
+# Widget classes that can be created from Tcl and adopted, and the Tcl
+# commands that create them.
+WIDGETS = {cls: name for cls, name in [
+    (tkinter.Button, 'button'), (tkinter.Canvas, 'canvas'), (tkinter.Checkbutton, 'checkbutton'),
+    (tkinter.Entry, 'entry'), (tkinter.Frame, 'frame'), (tkinter.Label, 'label'),
+    (tkinter.LabelFrame, 'labelframe'), (tkinter.Listbox, 'listbox'), (tkinter.Message, 'message'),
+    (tkinter.PanedWindow, 'panedwindow'), (tkinter.Radiobutton, 'radiobutton'),
+    (tkinter.Scale, 'scale'), (tkinter.Scrollbar, 'scrollbar'), (tkinter.Spinbox, 'spinbox'),
+    (tkinter.Text, 'text'),
+    (ttk.Button, 'ttk::button'), (ttk.Checkbutton, 'ttk::checkbutton'), (ttk.Combobox, 'ttk::combobox'),
+    (ttk.Entry, 'ttk::entry'), (ttk.Frame, 'ttk::frame'), (ttk.Label, 'ttk::label'),
+    (ttk.Labelframe, 'ttk::labelframe'), (ttk.Menubutton, 'ttk::menubutton'),
+    (ttk.Notebook, 'ttk::notebook'), (ttk.Panedwindow, 'ttk::panedwindow'),
+    (ttk.Progressbar, 'ttk::progressbar'), (ttk.Radiobutton, 'ttk::radiobutton'),
+    (ttk.Scale, 'ttk::scale'), (ttk.Scrollbar, 'ttk::scrollbar'), (ttk.Separator, 'ttk::separator'),
+    (ttk.Sizegrip, 'ttk::sizegrip'), (ttk.Spinbox, 'ttk::spinbox'), (ttk.Treeview, 'ttk::treeview'),
+]}
+
+RUN = ('commands', 'foreach command $commands {{*}$command}')
+
+# Adopting a widget created in the batch relies on tkinter internals: the
+# _setup and _options methods its constructor uses, and the _tclCommands
+# list.  They've been there since Python 2, but aren't promised, so without
+# them every widget is simply created the usual way, one call at a time.
+ADOPT = all(hasattr(tkinter.BaseWidget, name) for name in ('_setup', '_options', '_tclCommands'))
+
+
+def widgetclass(type):
+    if not isinstance(type, str):
+        return type
+    module, dot, name = type.rpartition('.')
+    if module in ('tk', 'tkinter'):
+        return getattr(tkinter, name)
+    if module == 'ttk' or hasattr(ttk, name):
+        return getattr(ttk, name)
+    return getattr(tkinter, name)
+
+
+def build(parent, spec):
+    handles, commands, created = {}, [], []
+    for item in spec if isinstance(spec, (list, tuple)) else [spec]:
+        _compile(parent, item, handles, commands, created)
+    try:
+        if commands:
+            parent.tk.call('apply', RUN, tuple(commands))
+    except tkinter.TclError:
+        for w in reversed(created):
+            if w.master.children.get(str(w).rpartition('.')[2]) is w:
+                w.destroy()
+        raise
+    return handles
+
+
+def _compile(parent, spec, handles, commands, created):
+    widget = parent
+    if 'type' in spec:
+        cls = widgetclass(spec['type'])
+        options = dict(spec.get('options', {}))
+        if spec.get('name'):
+            options['name'] = spec['name']
+        if ADOPT and cls in WIDGETS:
+            # Make the Python object without creating the Tk widget (that
+            # happens in the batch), the way tkinter's own constructor does.
+            widget = cls.__new__(cls)
+            widget.widgetName = WIDGETS[cls]
+            widget._setup(parent, options)
+            if widget._tclCommands is None:
+                widget._tclCommands = []
+            commands.append((widget.widgetName, widget._w) + widget._options(options))
+        else:
+            widget = cls(parent, **options)
+        created.append(widget)
+        if spec.get('name'):
+            handles[spec['name']] = widget
+        if 'grid' in spec:
+            commands.append(('grid', 'configure', str(widget)) + _args(_sticky(spec['grid'])))
+    for kind in ('columns', 'rows'):
+        for index, options in spec.get(kind, {}).items():
+            commands.append(('grid', kind[:-1] + 'configure', str(widget), int(index)) + _args(options))
+    for child in spec.get('children', ()):
+        _compile(widget, child, handles, commands, created)
+
+
+def _sticky(options):
+    sticky = options.get('sticky')
+    if isinstance(sticky, (tuple, list)):
+        options = dict(options, sticky=''.join(sticky))
+    return options
+
+
+# Grid options as Tcl arguments ('in_' is passed as -in).
+def _args(options):
+    return tuple(arg for key, value in options.items() for arg in ('-' + key.rstrip('_'), value))
@@ -0,0 +1,61 @@
+# Time to construct a form of label/entry pairs, one widget and one grid
+# call at a time, or with layout.build().
+#
+#   python layoutbench.py [--sizes 100,1000,10000] [--repeat 3]
+#
+# Each form is built in its own Toplevel, which is destroyed afterwards.
+
+from tkinter import *
+from tkinter import ttk
+import argparse
+import statistics
+import time
+from layout import build
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--sizes', default='100,1000,10000')
+parser.add_argument('--repeat', type=int, default=3)
+args = parser.parse_args()
+
+root = Tk()
+root.withdraw()
+
+def imperative(top, count):
+    content = ttk.Frame(top, padding=5)
+    content.grid(column=0, row=0, sticky=(N, S, E, W))
+    top.columnconfigure(0, weight=1)
+    top.rowconfigure(0, weight=1)
+    for i in range(count // 2):
+        l = ttk.Label(content, text='Field %d' % i)
+        e = ttk.Entry(content)
+        l.grid(column=0, row=i, sticky=W, padx=5)
+        e.grid(column=1, row=i, sticky=(E, W), padx=5, pady=2)
+    content.columnconfigure(1, weight=1)
+
+def declarative(top, count):
+    rows = []
+    for i in range(count // 2):
+        rows.append({'type': 'Label', 'options': {'text': 'Field %d' % i},
+                     'grid': {'column': 0, 'row': i, 'sticky': W, 'padx': 5}})
+        rows.append({'type': 'Entry', 'grid': {'column': 1, 'row': i, 'sticky': (E, W), 'padx': 5, 'pady': 2}})
+    build(top, {'columns': {0: {'weight': 1}}, 'rows': {0: {'weight': 1}},
+                'children': [{'type': 'Frame', 'options': {'padding': 5},
+                              'grid': {'column': 0, 'row': 0, 'sticky': (N, S, E, W)},
+                              'columns': {1: {'weight': 1}}, 'children': rows}]})
+
+print('%8s %14s %14s %8s' % ('widgets', 'imperative', 'layout', 'speedup'))
+for count in map(int, args.sizes.split(',')):
+    results = {}
+    for name, fn in (('imperative', imperative), ('layout', declarative)):
+        times = []
+        for r in range(args.repeat):
+            top = Toplevel(root)
+            start = time.perf_counter()
+            fn(top, count)
+            times.append(time.perf_counter() - start)
+            top.destroy()
+            root.update()
+        results[name] = statistics.median(times)
+    print('%8d %12.1fms %12.1fms %7.1fx' % (count, results['imperative'] * 1000, results['layout'] * 1000,
+                                          results['imperative'] / results['layout']))
+root.destroy()
@@ -0,0 +1,43 @@
+from tkinter import *
+from tkinter import ttk
+from layout import build
+
+root = Tk()
+
+onevar = BooleanVar(value=True)
+twovar = BooleanVar(value=False)
+threevar = BooleanVar(value=True)
+
+# The same form as gridexample2.py, described rather than built step by
+# step; build() creates and grids all of it with a single call into Tcl.
+form = build(root, {
+    'columns': {0: {'weight': 1}},
+    'rows': {0: {'weight': 1}},
+    'children': [
+        {'type': 'Frame', 'name': 'content', 'options': {'padding': (3, 3, 12, 12)},
+         'grid': {'column': 0, 'row': 0, 'sticky': (N, S, E, W)},
+         'columns': {0: {'weight': 3}, 1: {'weight': 3}, 2: {'weight': 3}, 3: {'weight': 1}, 4: {'weight': 1}},
+         'rows': {1: {'weight': 1}},
+         'children': [
+             {'type': 'Frame', 'name': 'frame',
+              'options': {'borderwidth': 5, 'relief': 'sunken', 'width': 200, 'height': 100},
+              'grid': {'column': 0, 'row': 0, 'columnspan': 3, 'rowspan': 2, 'sticky': (N, S, E, W)}},
+             {'type': 'Label', 'name': 'namelbl', 'options': {'text': 'Name'},
+              'grid': {'column': 3, 'row': 0, 'columnspan': 2, 'sticky': (N, W), 'padx': 5}},
+             {'type': 'Entry', 'name': 'name',
+              'grid': {'column': 3, 'row': 1, 'columnspan': 2, 'sticky': (N, E, W), 'pady': 5, 'padx': 5}},
+             {'type': 'Checkbutton', 'name': 'one', 'options': {'text': 'One', 'variable': onevar, 'onvalue': True},
+              'grid': {'column': 0, 'row': 3}},
+             {'type': 'Checkbutton', 'name': 'two', 'options': {'text': 'Two', 'variable': twovar, 'onvalue': True},
+              'grid': {'column': 1, 'row': 3}},
+             {'type': 'Checkbutton', 'name': 'three', 'options': {'text': 'Three', 'variable': threevar, 'onvalue': True},
+              'grid': {'column': 2, 'row': 3}},
+             {'type': 'Button', 'name': 'ok', 'options': {'text': 'Okay', 'command': lambda: print(form['name'].get())},
+              'grid': {'column': 3, 'row': 3}},
+             {'type': 'Button', 'name': 'cancel', 'options': {'text': 'Cancel', 'command': root.destroy},
+              'grid': {'column': 4, 'row': 3}},
+         ]},
+    ]})
+
+form['name'].focus()
+root.mainloop()
@@ -0,0 +1,87 @@
+# Time to first paint and total load time for a big file in a Text
+# widget, streamed with a StreamLoader or inserted in one go.
+#
+#   python loadbench.py [--mode stream|single] [--mb 50] [--chunk 65536] [--tag]
+#
+# Generates a --mb megabyte Python-like file.  "First paint" is when the
+# window has been drawn with some text in it; we also report the longest
+# the event loop went without servicing a 10 ms timer.
+
+from tkinter import *
+from tkinter import ttk
+import argparse
+import os
+import tempfile
+import time
+from textload import StreamLoader, LazyTagger
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--mode', choices=('stream', 'single'), default='stream')
+parser.add_argument('--mb', type=float, default=50)
+parser.add_argument('--chunk', type=int, default=1 << 16)
+parser.add_argument('--tag', action='store_true', help='color keywords as well')
+args = parser.parse_args()
+
+path = os.path.join(tempfile.gettempdir(), 'loadbench-%g.py' % args.mb)
+if not os.path.exists(path) or os.path.getsize(path) < args.mb * 1e6:
+    with open(path, 'w') as f:
+        i, written = 0, 0
+        while written < args.mb * 1e6:
+            line = 'def function%d(x):  # comment %d\n    return x * %d if x else None\n' % (i, i, i)
+            f.write(line)
+            written += len(line)
+            i += 1
+
+def tagLines(t, first, last):
+    text = t.get('%d.0' % first, '%d.0' % last)
+    ranges = []
+    for n, line in enumerate(text.split('\n'), first):
+        k = line.find('return')
+        if k >= 0:
+            ranges += ['%d.%d' % (n, k), '%d.%d' % (n, k + 6)]
+    if ranges:
+        t.tag_add('keyword', *ranges)
+
+start = time.perf_counter()
+root = Tk()
+t = Text(root, width=80, height=40, wrap='none')
+ys = ttk.Scrollbar(root, orient='vertical', command=t.yview)
+t['yscrollcommand'] = ys.set
+t.tag_configure('keyword', foreground='blue')
+t.grid(column=0, row=0, sticky='nwes')
+ys.grid(column=1, row=0, sticky='ns')
+times = {}
+gaps = []
+last = [None]
+
+def probe():
+    now = time.perf_counter()
+    if last[0]:
+        gaps.append(now - last[0])
+    last[0] = now
+    if 'paint' not in times and t.index('end - 1 char') != '1.0':
+        root.update_idletasks()
+        times['paint'] = time.perf_counter() - start
+    root.after(10, probe)
+
+def finished(complete=True):
+    times['total'] = time.perf_counter() - start
+    root.after(10, root.destroy)
+
+root.after(0, probe)
+if args.mode == 'stream':
+    StreamLoader(t, path, chunksize=args.chunk, done=finished,
+                 tagger=LazyTagger(t, tagLines) if args.tag else None)
+else:
+    with open(path) as f:
+        t.insert('end', f.read())
+    if args.tag:
+        tagLines(t, 1, int(t.index('end').split('.')[0]))
+    root.after_idle(finished)
+root.mainloop()
+
+print('mode %s, %.1f MB%s' % (args.mode, os.path.getsize(path) / 1e6, ', tagged' if args.tag else ''))
+print('first paint: %.3f s' % times.get('paint', times['total']))
+print('total load: %.3f s' % times['total'])
+if gaps:
+    print('longest event loop stall: %.1f ms' % (max(gaps) * 1000))
@@ -0,0 +1,112 @@
+# Flood a log window from worker threads and report sustained throughput
+# and how long the Tk thread spends per UI tick.
+#
+#   python logbench.py [--threads 4] [--seconds 5] [--rate 0] [--mode logview|perline]
+#
+# 'perline' is the original logwindow.py approach (one index/state/
+# delete/insert round per message) fed from the same queue, for comparison.
+# --rate limits each thread to that many lines per second (0 = flat out).
+
+from tkinter import *
+from collections import deque
+import argparse
+import statistics
+import threading
+import time
+from logview import LogView
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--threads', type=int, default=4)
+parser.add_argument('--seconds', type=float, default=5)
+parser.add_argument('--rate', type=float, default=0, help='lines per second per thread')
+parser.add_argument('--maxlines', type=int, default=1000)
+parser.add_argument('--mode', choices=('logview', 'perline'), default='logview')
+args = parser.parse_args()
+
+root = Tk()
+ticks = []
+probes = []
+running = True
+
+class TimedLogView(LogView):
+    def drain(self):
+        start = time.perf_counter()
+        super().drain()
+        ticks.append(time.perf_counter() - start)
+
+if args.mode == 'logview':
+    log = TimedLogView(root, maxlines=args.maxlines, width=80, height=24, wrap='none')
+    write = log.write
+else:
+    log = Text(root, state='disabled', width=80, height=24, wrap='none')
+    queue = deque()
+    write = queue.append
+    shown = 0
+
+    def writeToLog(msg):
+        numlines = int(log.index('end - 1 line').split('.')[0])
+        log['state'] = 'normal'
+        if numlines == args.maxlines:
+            log.delete(1.0, 2.0)
+        if log.index('end-1c') != '1.0':
+            log.insert('end', '\n')
+        log.insert('end', msg)
+        log['state'] = 'disabled'
+
+    def tick():
+        global shown
+        start = time.perf_counter()
+        for i in range(len(queue)):
+            writeToLog(queue.popleft())
+            shown += 1
+        ticks.append(time.perf_counter() - start)
+        root.after(50, tick)
+    root.after(50, tick)
+log.grid()
+
+def produce(n):
+    count = 0
+    start = time.perf_counter()
+    while running:
+        write('worker %d line %d: all is well' % (n, count))
+        count += 1
+        if args.rate and count % 100 == 0:
+            delay = start + count / args.rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+# How late does a callback scheduled with after(0) actually run?
+def probe():
+    scheduled = time.perf_counter()
+    def landed():
+        probes.append(time.perf_counter() - scheduled)
+        if running:
+            root.after(10, probe)
+    root.after(0, landed)
+
+def finish():
+    global running
+    running = False
+    root.quit()
+
+root.update()
+threads = [threading.Thread(target=produce, args=(n,), daemon=True) for n in range(args.threads)]
+start = time.perf_counter()
+for t in threads:
+    t.start()
+probe()
+root.after(int(args.seconds * 1000), finish)
+root.mainloop()
+elapsed = time.perf_counter() - start
+
+received = log.received if args.mode == 'logview' else shown
+print('mode            %s' % args.mode)
+print('lines/s         %.0f' % (received / elapsed))
+if args.mode == 'logview':
+    print('dropped         %d' % log.dropped)
+    print('coalesced       %d' % log.coalesced)
+print('ticks           %d' % len(ticks))
+print('tick median ms  %.2f' % (statistics.median(ticks) * 1e3))
+print('tick max ms     %.2f' % (max(ticks) * 1e3))
+print('after(0) p50 ms %.2f' % (statistics.median(probes) * 1e3))
+print('after(0) max ms %.2f' % (max(probes) * 1e3))
@@ -0,0 +1,104 @@
+# A read-only Text widget for showing a high volume of log lines.
+#
+# write() may be called from any thread; it just appends the line to a
+# deque (which is safe to do without a lock).  On the Tk side, a tick
+# every 'interval' milliseconds takes everything that is waiting, joins it
+# into a single string and inserts it with one call, then trims the oldest
+# lines beyond 'maxlines' with one delete.  If more than 'maxpending' lines
+# pile up between ticks, new ones are dropped rather than letting memory
+# grow; lines that arrive in a batch but would be trimmed right away are
+# never inserted at all.  Both are counted (as messages, each of which may
+# have several lines; trimming counts the lines themselves).
+#
+# Functions added to 'watchers' are called after each change, with
+# ('deleted', count) when lines are trimmed from the top, and with
+# ('inserted', text) with exactly what was added at the end (starting
+# with a newline, unless the widget was empty).
+
+from tkinter import *
+from collections import deque
+import threading
+import time
+
+
+class LogView(Text):
+    def __init__(self, parent, maxlines=1000, interval=50, maxpending=100000, **kwargs):
+        kwargs.setdefault('state', 'disabled')
+        super().__init__(parent, **kwargs)
+        self.maxlines = maxlines
+        self.interval = interval
+        self.maxpending = maxpending
+        self.queue = deque()
+        self.lock = threading.Lock()
+        self.lines = 0
+        self.received = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.ticktime = 0
+        self.watchers = []
+        self.ticking = self.after(interval, self.tick)
+
+    def destroy(self):
+        if self.ticking:
+            self.after_cancel(self.ticking)
+            self.ticking = None
+        super().destroy()
+
+    def write(self, line):
+        if len(self.queue) >= self.maxpending:
+            with self.lock:
+                self.dropped += 1
+            return
+        self.queue.append(line)
+
+    def tick(self):
+        self.drain()
+        self.ticking = self.after(self.interval, self.tick)
+
+    def drain(self):
+        count = len(self.queue)
+        if not count:
+            return
+        start = time.perf_counter()
+        popleft = self.queue.popleft
+        batch = [popleft() for i in range(count)]
+        self.received += count
+        if count > self.maxlines:
+            self.coalesced += count - self.maxlines
+            batch = batch[-self.maxlines:]
+        text = '\n'.join(batch)
+        added = text.count('\n') + 1
+        if added > self.maxlines:
+            # Some messages have several lines: keep only the last
+            # maxlines lines, skipping the messages (or parts) before them.
+            sizes = [line.count('\n') + 1 for line in batch]
+            kept, n = 0, len(batch)
+            while kept < self.maxlines:
+                n -= 1
+                kept += sizes[n]
+            self.coalesced += n
+            text = '\n'.join(batch[n:])
+            if kept > self.maxlines:
+                text = text.split('\n', kept - self.maxlines)[-1]
+            added = self.maxlines
+        atbottom = self.yview()[1] >= 1.0
+        self['state'] = 'normal'
+        excess = self.lines + added - self.maxlines
+        deleted = min(max(excess, 0), self.lines)
+        if excess >= self.lines:
+            self.delete('1.0', 'end')
+            self.lines = 0
+        elif excess > 0:
+            self.delete('1.0', '%d.0' % (excess + 1))
+            self.lines -= excess
+        text = ('\n' if self.lines else '') + text
+        self.insert('end', text)
+        self.lines += added
+        self['state'] = 'disabled'
+        if atbottom:
+            self.see('end')
+        for watcher in self.watchers:
+            if deleted:
+                watcher('deleted', deleted)
+            watcher('inserted', text)
+        self.ticktime = time.perf_counter() - start
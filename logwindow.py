@@ -1,26 +1,37 @@
 from tkinter import *
 from tkinter import ttk
 from datetime import datetime
+from logview import LogView
+from textsearch import TextIndex, Search
+import threading
+import time
 
 root = Tk()
-log = Text(root, state='disabled', width=80, height=24, wrap='none')
-log.grid()
+log = LogView(root, maxlines=24, width=80, height=24, wrap='none')
+log.grid(column=0, row=0, columnspan=3)
 
+# Search the log: hits are highlighted as new lines arrive and old ones
+# scroll off the top, using an index kept up to date as it changes.
+search = Search(log, TextIndex(log))
+query = StringVar()
+query.trace_add('write', lambda *args: search.find(query.get()))
+e = ttk.Entry(root, textvariable=query)
+e.grid(column=0, row=1, sticky='we', padx=5, pady=5)
+e.bind('<Return>', lambda e: search.next())
+ttk.Button(root, text='Previous', command=search.prev).grid(column=1, row=1, pady=5)
+ttk.Button(root, text='Next', command=search.next).grid(column=2, row=1, padx=5, pady=5)
+
+# Safe to call from any thread; the LogView batches what it receives
+# and adds it to the Text widget on its next tick.
 def writeToLog(msg):
-    numlines = int(log.index('end - 1 line').split('.')[0])
-    log['state'] = 'normal'
-    if numlines == 24:
-        log.delete(1.0, 2.0)
-    if log.index('end-1c')!='1.0':
-        log.insert('end', '\n')
-    log.insert('end', msg)
-    log['state'] = 'disabled'
+    log.write(msg)
 
 
 def writemsg():
-    writeToLog(str(datetime.now())+": all is well")
-    root.after(200, writemsg)
-    
-root.after(200, writemsg)
+    while True:
+        writeToLog(str(datetime.now())+": all is well")
+        time.sleep(0.2)
+
+threading.Thread(target=writemsg, daemon=True).start()
 
 root.mainloop()
@@ -1,5 +1,6 @@
 from tkinter import *
 from tkinter import ttk, messagebox
+from palette import Palette
 
 root = Tk()
 ttk.Entry(root).grid()
@@ -10,6 +11,12 @@ m_edit.add_command(label="Paste", command=lambda: root.focus_get().event_generat
 m_edit.add_command(label="Find...", command=lambda: root.event_generate("<<OpenFindDialog>>"))
 root['menu'] = m
 
+# Find and run any menu command by typing part of its name.
+palette = Palette(root, m)
+m_edit.add_separator()
+m_edit.add_command(label="Command Palette...", accelerator="Ctrl+Shift+P", command=palette.show)
+root.bind("<Control-Shift-P>", palette.show)
+
 def launchFindDialog(*args):
     messagebox.showinfo(message="I hope you find what you're looking for!")
     
@@ -3,13 +3,12 @@ from tkinter import ttk
 
 root=Tk()
 
-import re
-def check_num(newval):
-    return re.match('^[0-9]*$', newval) is not None and len(newval) <= 5
-check_num_wrapper = (root.register(check_num), '%P')
+from validators import Form
+form = Form(root)
 
 num = StringVar()
-e = ttk.Entry(root, textvariable=num, validate='key', validatecommand=check_num_wrapper)
+e = ttk.Entry(root, textvariable=num)
+form.add(e, '[0-9]{0,5}')
 e.grid(column=0, row=0, sticky='we')
 
 root.mainloop()
@@ -0,0 +1,188 @@
+# A command palette: type a few letters to find and run any menu command.
+#
+# A MenuIndex walks a menu and its cascades once, recording each command's
+# label, accelerator and where it lives ("Edit > Find...").  Matching is
+# fuzzy: the letters typed must appear in order, not necessarily together.
+# To make that fast with thousands of commands, the index keeps, for each
+# command, a bit mask of the letters it contains (a command can only match
+# if it has all the letters typed), and for each three-letter sequence, the
+# commands containing it (so commands containing the query as-is can be
+# found, and ranked first, without looking at the rest).  As each letter
+# is typed, only the commands that matched so far are considered.
+#
+# Each menu the index has walked is watched: adding, inserting, deleting
+# or reconfiguring its entries (through the Menu methods) marks it to be
+# walked again before the next search.
+#
+# Picking a result calls the menu's own invoke, so it runs exactly the
+# same command (or generates the same virtual event) as the menu would,
+# once the palette is gone and the focus is back where it was.
+
+from tkinter import *
+from tkinter import ttk
+from dialogs import Dialog
+import heapq
+import re
+
+
+class Command:
+    def __init__(self, menu, index, label, path, accelerator):
+        self.menu, self.index = menu, index
+        self.label, self.path, self.accelerator = label, path, accelerator
+        self.text = (path + ' > ' + label if path else label).casefold()
+        self.mask = mask(self.text)
+
+    def invoke(self):
+        self.menu.invoke(self.index)
+
+
+def mask(text):
+    m = 0
+    for ch in set(text):
+        m |= 1 << (ord(ch) & 63)
+    return m
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class MenuIndex:
+    def __init__(self, menu):
+        self.menu = menu
+        self.commands = []
+        self.trigrams = {}
+        self.dirty = True
+        self.version = 0
+        self.watched = set()
+        self.stack = []
+
+    def _walk(self, menu, path, seen):
+        if str(menu) in seen:
+            return
+        seen.add(str(menu))
+        self._watch(menu)
+        last = menu.index('end')
+        for i in range(0 if last is None else last + 1):
+            kind = menu.type(i)
+            if kind in ('separator', 'tearoff'):
+                continue
+            label = str(menu.entrycget(i, 'label'))
+            if kind == 'cascade':
+                sub = menu.entrycget(i, 'menu')
+                if sub:
+                    self._walk(menu.nametowidget(sub), path + ' > ' + label if path else label, seen)
+            elif str(menu.entrycget(i, 'state')) != 'disabled':
+                self.commands.append(Command(menu, i, label, path, str(menu.entrycget(i, 'accelerator'))))
+
+    # Wrap the menu's methods for changing entries, so the index notices.
+    def _watch(self, menu):
+        if str(menu) in self.watched:
+            return
+        self.watched.add(str(menu))
+        for name in ('add', 'insert', 'delete', 'entryconfigure', 'entryconfig'):
+            method = getattr(menu, name)
+            def changed(*args, method=method, **kwargs):
+                self.dirty = True
+                return method(*args, **kwargs)
+            setattr(menu, name, changed)
+
+    def refresh(self):
+        if not self.dirty:
+            return
+        self.dirty = False
+        self.commands = []
+        self._walk(self.menu, '', set())
+        self.trigrams = {}
+        for n, command in enumerate(self.commands):
+            for t in trigrams(command.text):
+                self.trigrams.setdefault(t, []).append(n)
+        self.stack = []
+        self.version += 1
+
+    # The best matches for a query, best first.
+    def search(self, query, limit=50):
+        self.refresh()
+        query = query.casefold().strip()
+        if not query:
+            return self.commands[:limit]
+        while self.stack and not query.startswith(self.stack[-1][0]):
+            self.stack.pop()
+        candidates = self.stack[-1][1] if self.stack else range(len(self.commands))
+        commands, m = self.commands, mask(query)
+        candidates = [n for n in candidates if commands[n].mask & m == m]
+        exact = set()
+        if len(query) >= 3:
+            lists = sorted((self.trigrams.get(t, ()) for t in trigrams(query)), key=len)
+            exact = set(lists[0]).intersection(*lists[1:]) if lists else set()
+        pattern = re.compile('.*?'.join(map(re.escape, query)))
+        scored, matched = [], []
+        for n in candidates:
+            text = commands[n].text
+            if len(query) < 3 or n in exact:
+                pos = text.find(query)
+                if pos >= 0:
+                    start = pos == 0 or not text[pos - 1].isalnum()
+                    scored.append((2000 + 500 * start - 5 * pos - len(text), n))
+                    matched.append(n)
+                    continue
+            found = pattern.search(text)
+            if found:
+                scored.append((1000 - 5 * (found.end() - found.start()) - len(text), n))
+                matched.append(n)
+        self.stack.append((query, matched))
+        return [commands[n] for score, n in heapq.nlargest(limit, scored)]
+
+
+class Palette:
+    def __init__(self, root, menu, rows=15):
+        self.root, self.rows = root, rows
+        self.index = MenuIndex(menu)
+        self.results = []
+        self.dialog = Dialog(root, self._build, self._reset, title='Commands')
+
+    def _build(self, dialog):
+        self.query = StringVar()
+        self.entry = ttk.Entry(dialog.top, textvariable=self.query, width=60)
+        self.list = Listbox(dialog.top, height=self.rows, activestyle='none', exportselection=False)
+        self.entry.grid(column=0, row=0, sticky=(W, E), padx=5, pady=5)
+        self.list.grid(column=0, row=1, sticky=(N, W, E, S), padx=5, pady=(0, 5))
+        dialog.top.columnconfigure(0, weight=1)
+        dialog.top.rowconfigure(1, weight=1)
+        self.query.trace_add('write', lambda *args: self.update())
+        self.entry.bind('<Return>', lambda e: self.choose())
+        self.list.bind('<Double-1>', lambda e: self.choose())
+        self.entry.bind('<Up>', lambda e: self._move(-1))
+        self.entry.bind('<Down>', lambda e: self._move(1))
+        dialog.top.bind('<Escape>', lambda e: dialog.dismiss())
+
+    def _reset(self, dialog):
+        self.query.set('')
+        self.entry.focus_set()
+
+    def show(self, *args):
+        self.dialog.show(wait=False)
+
+    def update(self):
+        self.results = self.index.search(self.query.get(), self.rows)
+        self.list.delete(0, 'end')
+        if self.results:
+            self.list.insert(0, *['%s    %s%s' % (c.label, '(%s)' % c.path if c.path else '',
+                                                 '   ' + c.accelerator if c.accelerator else '')
+                                  for c in self.results])
+            self.list.selection_set(0)
+
+    def _move(self, amount):
+        selection = self.list.curselection()
+        i = max(0, min((selection[0] if selection else 0) + amount, len(self.results) - 1))
+        self.list.selection_clear(0, 'end')
+        self.list.selection_set(i)
+        self.list.see(i)
+        return 'break'
+
+    def choose(self):
+        selection = self.list.curselection()
+        if selection:
+            command = self.results[selection[0]]
+            self.dialog.dismiss()
+            command.invoke()
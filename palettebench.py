@@ -0,0 +1,68 @@
+# Per-keystroke latency of the command palette's search over a big menu.
+#
+#   python palettebench.py [--commands 10000] [--cascades 100]
+#
+# Builds a menu bar of --cascades cascades (each with a submenu) holding
+# --commands commands in all, indexes it, then types several queries a
+# letter at a time, timing each search plus filling the result list.
+# Exits with status 1 if any keystroke takes longer than a frame (16.7 ms).
+
+from tkinter import *
+import argparse
+import random
+import statistics
+import sys
+import time
+from palette import Palette
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--commands', type=int, default=10000)
+parser.add_argument('--cascades', type=int, default=100)
+parser.add_argument('--budget', type=float, default=16.7, help='ms per keystroke')
+args = parser.parse_args()
+
+random.seed(1)
+words = ['open', 'save', 'find', 'replace', 'format', 'insert', 'table', 'image', 'window', 'view',
+         'zoom', 'select', 'copy', 'paste', 'export', 'import', 'print', 'settings', 'layer', 'align']
+root = Tk()
+menubar = Menu(root)
+root['menu'] = menubar
+invoked = []
+menus = []
+for c in range(args.cascades):
+    menu = Menu(menubar, tearoff=0)
+    menubar.add_cascade(menu=menu, label='Menu %d' % c)
+    sub = Menu(menu, tearoff=0)
+    menu.add_cascade(menu=sub, label='More')
+    menus += [menu, sub]
+for i in range(args.commands):
+    label = ' '.join(random.choice(words) for w in range(random.randint(1, 3))).title() + ' %d' % i
+    random.choice(menus).add_command(label=label, accelerator='Ctrl+%d' % (i % 10),
+                                     command=lambda i=i: invoked.append(i))
+
+palette = Palette(root, menubar)
+start = time.perf_counter()
+palette.index.refresh()
+print('%d commands indexed in %.1f ms' % (len(palette.index.commands), (time.perf_counter() - start) * 1000))
+palette.show()
+
+times = []
+for query in ('find', 'replace table', 'fmt', 'export image 42', 'zzz', 'open'):
+    palette.query.set('')
+    for k in range(1, len(query) + 1):
+        start = time.perf_counter()
+        palette.query.set(query[:k])      # search runs from the variable trace
+        times.append(time.perf_counter() - start)
+    root.update()
+    print('%-16r -> %s' % (query, palette.results[0].label if palette.results else '(none)'))
+
+palette.query.set('find')
+palette.choose()
+print('picked a result: command %s ran' % invoked)
+
+ms = sorted(t * 1000 for t in times)
+print('%d keystrokes: median %.2f ms, max %.2f ms' % (len(ms), statistics.median(ms), ms[-1]))
+root.destroy()
+if ms[-1] > args.budget:
+    print('FAIL: slowest keystroke over %.1f ms' % args.budget)
+    sys.exit(1)
@@ -0,0 +1,71 @@
+# Pan across a large drawing (by default 1,000,000 segments spread over a
+# 100,000 x 100,000 board), once with every stroke as a canvas item and
+# once with a Viewport that only materializes strokes near the view.
+#
+#   python panbench.py [--strokes 50000] [--segments 20] [--size 100000] [--steps 200]
+
+from tkinter import *
+import argparse
+import random
+import statistics
+import time
+from benchmark import rss_mb
+from strokes import StrokeList
+from viewport import Viewport
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--strokes', type=int, default=50000)
+parser.add_argument('--segments', type=int, default=20, help='segments per stroke')
+parser.add_argument('--size', type=int, default=100000)
+parser.add_argument('--steps', type=int, default=200, help='pan steps across the board')
+args = parser.parse_args()
+
+def drawing():
+    rnd = random.Random(1)
+    for n in range(args.strokes):
+        x, y = rnd.uniform(0, args.size), rnd.uniform(0, args.size)
+        coords = [x, y]
+        for i in range(args.segments):
+            x, y = x + rnd.uniform(-10, 10), y + rnd.uniform(-10, 10)
+            coords += (x, y)
+        yield coords
+
+root = Tk()
+
+def run(cull):
+    base = rss_mb()
+    canvas = Canvas(root, width=800, height=600, scrollregion=(0, 0, args.size, args.size))
+    canvas.grid(column=0, row=0)
+    root.update()
+    strokes = StrokeList(canvas)
+    start = time.perf_counter()
+    for coords in drawing():
+        strokes.append(coords, draw=not cull)
+    view = Viewport(strokes) if cull else None
+    root.update()
+    build = time.perf_counter() - start
+
+    steps = []
+    for i in range(args.steps):
+        start = time.perf_counter()
+        canvas.xview_moveto(i / args.steps)
+        canvas.yview_moveto(i / args.steps)
+        if view:
+            view.refresh()
+        root.update_idletasks()
+        steps.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    if view:
+        view.find(args.size / 2, args.size / 2, halo=50)
+    else:
+        canvas.find_overlapping(args.size/2 - 50, args.size/2 - 50, args.size/2 + 50, args.size/2 + 50)
+    hit = time.perf_counter() - start
+    print('%-9s %9d %8.1f %8.2f %9.2f %9.2f %9.3f' % ('viewport' if cull else 'all items',
+          len(canvas.find('all')), rss_mb() - base, build, statistics.median(steps) * 1e3,
+          max(steps) * 1e3, hit * 1e3))
+    canvas.destroy()
+
+print('%-9s %9s %8s %8s %9s %9s %9s' % ('mode', 'items', 'rss MB', 'build s', 'pan ms', 'worst ms', 'hit ms'))
+run(True)
+run(False)
+root.destroy()
@@ -0,0 +1,85 @@
+# Per-keystroke latency of filter-as-you-type over a large place list
+# (250,000 synthetic names by default), using the indexed PrefixFilter
+# and VirtualListbox, versus rescanning every name and resetting a
+# listvariable on each keystroke.
+#
+#   python placebench.py [--places 250000] [--csv FILE]
+
+from tkinter import *
+import argparse
+import random
+import statistics
+import time
+from places import Places, PrefixFilter
+from virtuallist import VirtualListbox
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--places', type=int, default=250000)
+parser.add_argument('--csv', help='load places from a CSV file instead')
+args = parser.parse_args()
+
+def synthetic(count):
+    rnd = random.Random(1)
+    syllables = ['ba', 'ca', 'da', 'el', 'fo', 'gu', 'ha', 'in', 'jo', 'ka', 'lu', 'ma',
+                 'ne', 'or', 'pa', 'qu', 'ri', 'sa', 'to', 'ur', 'vi', 'wa', 'xe', 'yo', 'za']
+    for i in range(count):
+        name = ''.join(rnd.choice(syllables) for j in range(rnd.randint(2, 5))).capitalize()
+        yield 'p%d' % i, name, rnd.randint(100, 10000000)
+
+start = time.perf_counter()
+places = Places.from_csv(args.csv) if args.csv else Places(synthetic(args.places))
+print('loaded %d places in %.2f s' % (len(places), time.perf_counter() - start))
+
+# Type a few names a character at a time, with some backspacing.
+rnd = random.Random(2)
+keystrokes = []
+for i in range(20):
+    name = places.name(rnd.randrange(len(places)))
+    for n in range(1, len(name) + 1):
+        keystrokes.append(name[:n])
+    for n in range(len(name) - 1, len(name) // 2, -1):
+        keystrokes.append(name[:n])
+    keystrokes.append('')
+
+root = Tk()
+
+def report(label, times):
+    times.sort()
+    print('%-10s %9.3f %9.3f %9.3f %8d' % (label, statistics.median(times) * 1e3,
+          times[int(len(times) * 0.99)] * 1e3, times[-1] * 1e3, sum(t > 1/60 for t in times)))
+
+def indexed():
+    lbox = VirtualListbox(root, places.names, height=20)
+    lbox.grid(column=0, row=0)
+    root.update()
+    prefix = PrefixFilter(places)
+    times = []
+    for text in keystrokes:
+        start = time.perf_counter()
+        lbox.set_items(prefix.update(text))
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+    lbox.destroy()
+    return times
+
+def rescan():
+    cnames = StringVar(value=places.names)
+    lbox = Listbox(root, listvariable=cnames, height=20)
+    lbox.grid(column=0, row=0)
+    root.update()
+    keys = [name.casefold() for name in places.names]
+    times = []
+    for text in keystrokes:
+        start = time.perf_counter()
+        key = text.casefold()
+        cnames.set([places.names[i] for i, k in enumerate(keys) if k.startswith(key)])
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+    lbox.destroy()
+    return times
+
+print('%d keystrokes; one frame is %.1f ms' % (len(keystrokes), 1000/60))
+print('%-10s %9s %9s %9s %8s' % ('mode', 'p50 ms', 'p99 ms', 'max ms', '>frame'))
+report('indexed', indexed())
+report('rescan', rescan())
+root.destroy()
@@ -0,0 +1,89 @@
+# A compact store for a large list of places (code, name, population),
+# with filter-as-you-type on the names.
+#
+# Instead of parallel tuples and a dict, the data is kept column by column:
+# the codes packed into one fixed-width byte string, the populations in an
+# array, and the names in a list.  A sorted index over the (case-folded)
+# names means all names starting with a given prefix sit next to each
+# other, so a prefix search is two binary searches.  A PrefixFilter goes a
+# step further: when the user types one more character, it only searches
+# within the previous matches, and when they delete one, it goes back to
+# the matches it had before.
+
+from array import array
+from bisect import bisect_left
+import csv
+
+
+class Places:
+    def __init__(self, rows=()):
+        codes, self.names, self.populations = [], [], array('q')
+        for code, name, population in rows:
+            codes.append(code.encode('utf-8'))
+            self.names.append(name)
+            self.populations.append(int(population or 0))
+        self.codewidth = max(map(len, codes), default=1)
+        self.codes = b''.join(code.ljust(self.codewidth, b'\0') for code in codes)
+        keys = [name.casefold() for name in self.names]
+        self.order = array('l', sorted(range(len(keys)), key=keys.__getitem__))
+        self.keys = [keys[i] for i in self.order]
+
+    @classmethod
+    def from_csv(cls, path, code='code', name='name', population='population'):
+        with open(path, newline='', encoding='utf-8') as f:
+            return cls((row[code], row[name], row[population]) for row in csv.DictReader(f))
+
+    def __len__(self):
+        return len(self.names)
+
+    def code(self, i):
+        w = self.codewidth
+        return self.codes[i*w:(i+1)*w].rstrip(b'\0').decode('utf-8')
+
+    def name(self, i):
+        return self.names[i]
+
+    def population(self, i):
+        return self.populations[i]
+
+
+# The places whose names fall within positions lo..hi-1 of the sorted
+# index, usable wherever a sequence of names is expected (for example as
+# the items of a VirtualListbox).  record() maps a position back to the
+# record number to look up in the Places store.
+class Matches:
+    def __init__(self, places, lo, hi):
+        self.places, self.lo, self.hi = places, lo, hi
+
+    def __len__(self):
+        return self.hi - self.lo
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.places.names[self.places.order[self.lo + j]] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.places.names[self.places.order[self.lo + i]]
+
+    def record(self, i):
+        return self.places.order[self.lo + i]
+
+
+class PrefixFilter:
+    def __init__(self, places):
+        self.places = places
+        self.stack = [('', 0, len(places))]
+
+    def update(self, text):
+        key = text.casefold()
+        while not key.startswith(self.stack[-1][0]):
+            self.stack.pop()
+        prefix, lo, hi = self.stack[-1]
+        if key != prefix:
+            keys = self.places.keys
+            lo = bisect_left(keys, key, lo, hi)
+            hi = bisect_left(keys, key + '\U0010ffff', lo, hi)
+            self.stack.append((key, lo, hi))
+        return Matches(self.places, lo, hi)
@@ -0,0 +1,91 @@
+# A very small software rasterizer for stroke geometry, used to turn
+# polylines into image data without going through a canvas.  Pixels are
+# kept as RGBA bytes so untouched areas stay transparent, and the result
+# can be encoded as a PNG, which Tk's photo images load directly.
+
+import io
+import struct
+import zlib
+from math import floor, sqrt
+
+
+class Raster:
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.pixels = bytearray(width * height * 4)
+
+    # Draw a polyline given as a flat list of coordinates, shifted left and
+    # up by (dx, dy).  'color' is an (r, g, b) tuple.  The line is built by
+    # stamping a disc of the given width at every pixel step along each
+    # segment; anything outside the raster is clipped.
+    def line(self, coords, color, width=1, dx=0, dy=0):
+        radius = max(width, 1) / 2
+        reach = int(radius) + 1
+        spans = [(oy, int(sqrt(max(radius*radius - oy*oy, 0))))
+                 for oy in range(-int(radius), int(radius) + 1)]
+        pixel = bytes(color[:3]) + b'\xff'
+        w, h, buf = self.width, self.height, self.pixels
+        x0, y0 = coords[0] - dx, coords[1] - dy
+        if len(coords) == 2:
+            coords = list(coords) * 2
+        for i in range(2, len(coords), 2):
+            x1, y1 = coords[i] - dx, coords[i+1] - dy
+            if max(x0, x1) < -reach or min(x0, x1) > w + reach or \
+               max(y0, y1) < -reach or min(y0, y1) > h + reach:
+                x0, y0 = x1, y1
+                continue
+            steps = max(int(max(abs(x1 - x0), abs(y1 - y0))), 1)
+            for step in range(0 if i == 2 else 1, steps + 1):
+                cx = floor(x0 + (x1 - x0) * step / steps + 0.5)
+                cy = floor(y0 + (y1 - y0) * step / steps + 0.5)
+                for oy, half in spans:
+                    y = cy + oy
+                    if 0 <= y < h:
+                        a, b = max(cx - half, 0), min(cx + half + 1, w)
+                        if a < b:
+                            buf[(y*w + a)*4:(y*w + b)*4] = pixel * (b - a)
+            x0, y0 = x1, y1
+
+    def rows(self):
+        stride = self.width * 4
+        for y in range(self.height):
+            yield self.pixels[y*stride:(y+1)*stride]
+
+    def png(self):
+        return png(self.width, self.height, self.rows())
+
+
+def _chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + \
+        struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+# Write an RGBA PNG to a file a band of rows at a time, compressing as it
+# goes, so the whole image never has to be in memory at once.
+class PNGWriter:
+    def __init__(self, f, width, height, level=-1):
+        self.f, self.width, self.height = f, width, height
+        self.compressor = zlib.compressobj(level)
+        self.written = 0
+        f.write(b'\x89PNG\r\n\x1a\n' + _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)))
+
+    # rows is an iterable of bytes objects, each width * 4 long.
+    def write(self, rows):
+        rows = [b'\0' + bytes(row) for row in rows]
+        self.written += len(rows)
+        data = self.compressor.compress(b''.join(rows))
+        if data:
+            self.f.write(_chunk(b'IDAT', data))
+
+    def close(self):
+        if self.written != self.height:
+            raise ValueError('PNG has %d rows, %d written' % (self.height, self.written))
+        self.f.write(_chunk(b'IDAT', self.compressor.flush()) + _chunk(b'IEND', b''))
+
+
+# Encode RGBA rows (an iterable of bytes objects) as a PNG.
+def png(width, height, rows):
+    f = io.BytesIO()
+    writer = PNGWriter(f, width, height)
+    writer.write(rows)
+    writer.close()
+    return f.getvalue()
@@ -0,0 +1,126 @@
+# An "Open Recent" menu that doesn't hold up the application.
+#
+# RecentFiles is a short most-recently-used list, saved to a JSON file (if
+# given one) so it survives between runs.  DirectoryScan looks for files (say, every .py
+# file in the current directory) using os.scandir in a background thread,
+# keeping the most recently modified ones, so a big directory doesn't
+# delay the window appearing.  RecentMenu fills in a menu from both, but
+# only when the menu is about to be posted (via its postcommand), and only
+# rebuilds the entries if either list has changed since it last did.
+
+import heapq
+import json
+import os
+import threading
+
+
+class RecentFiles:
+    def __init__(self, path=None, limit=10):
+        self.path = path
+        self.limit = limit
+        self.version = 0
+        self.files = []
+        if path is None:
+            return
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.files = [str(name) for name in json.load(f)][:limit]
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __len__(self):
+        return len(self.files)
+
+    def add(self, filename):
+        filename = os.path.abspath(filename)
+        if self.files[:1] != [filename]:
+            if filename in self.files:
+                self.files.remove(filename)
+            self.files.insert(0, filename)
+            del self.files[self.limit:]
+            self.changed()
+
+    def remove(self, filename):
+        if filename in self.files:
+            self.files.remove(filename)
+            self.changed()
+
+    def changed(self):
+        self.version += 1
+        self.save()
+
+    # Write to a temporary file and rename it over the real one, so a
+    # crash part-way can't leave a truncated list behind.
+    def save(self):
+        if self.path is None:
+            return
+        temp = self.path + '.tmp'
+        try:
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(self.files, f, indent=1)
+            os.replace(temp, self.path)
+        except OSError:
+            pass
+
+
+class DirectoryScan:
+    def __init__(self, directory='.', suffixes=('.py',), limit=20):
+        self.directory, self.suffixes, self.limit = directory, tuple(suffixes), limit
+        self.files = []
+        self.version = 0
+        self.done = False
+        self.thread = threading.Thread(target=self.scan, daemon=True)
+        self.thread.start()
+
+    def scan(self):
+        found = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(self.suffixes):
+                        try:
+                            if entry.is_file():
+                                found.append((entry.stat().st_mtime, entry.path))
+                        except OSError:
+                            pass
+        except OSError:
+            pass
+        newest = heapq.nlargest(self.limit, found)
+        self.files = [os.path.abspath(path) for mtime, path in newest]
+        self.version += 1
+        self.done = True
+
+
+class RecentMenu:
+    def __init__(self, menu, open, recent, scan=None, limit=20):
+        self.menu, self.open, self.recent, self.scan = menu, open, recent, scan
+        self.limit = limit
+        self.shown = None
+        self.builds = 0
+        menu.configure(postcommand=self.refresh)
+
+    def refresh(self):
+        key = (self.recent.version, self.scan.version if self.scan else None,
+               self.scan.done if self.scan else True)
+        if key == self.shown:
+            return
+        self.shown = key
+        self.builds += 1
+        files = list(self.recent)
+        if self.scan:
+            seen = set(files)
+            files += [f for f in self.scan.files if f not in seen]
+        self.menu.delete(0, 'end')
+        for f in files[:self.limit]:
+            self.menu.add_command(label=os.path.basename(f), command=lambda f=f: self.choose(f))
+        if self.scan and not self.scan.done:
+            self.menu.add_command(label='Scanning...', state='disabled')
+        elif not files:
+            self.menu.add_command(label='(None)', state='disabled')
+
+    def choose(self, filename):
+        self.recent.add(filename)
+        self.open(filename)
@@ -0,0 +1,66 @@
+# Time to get the window up, and to open the Open Recent menu the first
+# time, with the original recentfiles.py approach (glob, then a menu entry
+# per file, all before the window appears) and with recent.py.
+#
+#   python recentbench.py [--mode lazy|eager] [--files 20000] [--dir DIR]
+#
+# Creates --files empty .py files in a temporary directory (or scans
+# --dir).  Opening the menu is approximated by running its postcommand
+# and having Tk lay out its entries.
+
+from tkinter import *
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+from recent import RecentFiles, DirectoryScan, RecentMenu
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--mode', choices=('lazy', 'eager'), default='lazy')
+parser.add_argument('--files', type=int, default=20000)
+parser.add_argument('--dir')
+args = parser.parse_args()
+
+directory = args.dir
+if not directory:
+    directory = tempfile.mkdtemp()
+    for i in range(args.files):
+        open(os.path.join(directory, 'file%05d.py' % i), 'w').close()
+
+start = time.perf_counter()
+root = Tk()
+menubar = Menu(root)
+root['menu'] = menubar
+menu_file = Menu(menubar)
+menubar.add_cascade(menu=menu_file, label='File')
+menu_recent = Menu(menu_file)
+menu_file.add_cascade(menu=menu_recent, label='Open Recent')
+if args.mode == 'eager':
+    for f in glob.glob(directory + '/*.py'):
+        menu_recent.add_command(label=os.path.basename(f), command=lambda f=f: print(f))
+else:
+    store = os.path.join(tempfile.gettempdir(), 'recentbench.json')
+    scan = DirectoryScan(directory)
+    recent = RecentMenu(menu_recent, print, RecentFiles(store), scan)
+root.update()
+startup = time.perf_counter() - start
+
+if args.mode == 'lazy':
+    scan.thread.join()
+start = time.perf_counter()
+postcommand = menu_recent.cget('postcommand')
+if postcommand:
+    root.tk.eval(postcommand)
+menu_recent.yposition('last')
+root.update_idletasks()
+first = time.perf_counter() - start
+entries = (menu_recent.index('end') or 0) + 1
+root.destroy()
+if not args.dir:
+    shutil.rmtree(directory)
+
+print('mode %s: %d entries' % (args.mode, entries))
+print('startup (to window shown): %.1f ms' % (startup * 1000))
+print('first open of menu: %.1f ms' % (first * 1000))
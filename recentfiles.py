@@ -1,14 +1,17 @@
 from tkinter import *
 from tkinter import ttk
-import glob
+from recent import RecentFiles, DirectoryScan, RecentMenu
 import os
-import os.path
 root=Tk()
 
 def openFile(f):
     print(f)
 
-recent_files = glob.glob(os.getcwd()+'/*.py')
+# Files opened before (saved between runs, next to this example), plus
+# the most recently modified .py files here, found in the background; the
+# menu is filled in when it's first opened.
+recent_files = RecentFiles(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recentfiles.json'))
+scan = DirectoryScan(os.getcwd(), suffixes=('.py',))
 menubar = Menu(root)
 root['menu'] = menubar
 menu_file = Menu(menubar)
@@ -17,9 +20,6 @@ menubar.add_cascade(menu=menu_file, label='File')
 menubar.add_cascade(menu=menu_edit, label='Edit')
 menu_recent = Menu(menu_file)
 menu_file.add_cascade(menu=menu_recent, label='Open Recent')
-for f in recent_files:
-    menu_recent.add_command(label=os.path.basename(f), command=lambda: openFile(f))
+RecentMenu(menu_recent, openFile, recent_files, scan)
 
 root.mainloop()
-
-
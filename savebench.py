@@ -0,0 +1,85 @@
+# How fast a drawing saves and loads, and how big the file is, in the
+# chunked binary format of sketchfile.py or as JSON.
+#
+#   python savebench.py [--mode binary|json] [--points 1000000] [--length 200]
+#
+# The drawing is --points random-walk points, in strokes of about --length
+# points each, in a handful of colors and widths.  JSON is saved as a list
+# of {"color", "width", "coords"} objects, one per stroke, with the
+# coordinates as generated (rounded to 0.1) rather than the float32 values
+# a Drawing holds, which would print with many more digits.  Loading means
+# getting back every stroke's coordinates and style; "first" is how long
+# until the first chunk's strokes are available, which is when a
+# SketchLoader can put them on screen.
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from sketchfile import Drawing, pieces
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--mode', choices=('binary', 'json'), default='binary')
+parser.add_argument('--points', type=int, default=1000000)
+parser.add_argument('--length', type=int, default=200)
+args = parser.parse_args()
+
+rnd = random.Random(1)
+drawing = Drawing()
+records = []
+points = 0
+while points < args.points:
+    n = min(args.points - points, rnd.randint(args.length // 2, args.length * 3 // 2))
+    x, y = rnd.uniform(0, 1000), rnd.uniform(0, 1000)
+    coords = []
+    for i in range(n):
+        x += rnd.uniform(-3, 3)
+        y += rnd.uniform(-3, 3)
+        coords += (round(x, 1), round(y, 1))
+    color, width = rnd.choice(('black', 'red', 'blue')), rnd.choice((1, 1, 5))
+    drawing.add(coords, color, width)
+    if args.mode == 'json':
+        records.append({'color': color, 'width': width, 'coords': coords})
+    points += n
+
+path = os.path.join(tempfile.mkdtemp(), 'drawing.' + ('sketch' if args.mode == 'binary' else 'json'))
+
+start = time.perf_counter()
+if args.mode == 'binary':
+    drawing.save(path)
+else:
+    with open(path, 'w') as f:
+        json.dump(records, f)
+save = time.perf_counter() - start
+
+start = time.perf_counter()
+first = None
+strokes = loaded = 0
+if args.mode == 'binary':
+    for piece in pieces(path):
+        for coords, style in piece:
+            strokes += 1
+            loaded += len(coords) // 2
+        if first is None:
+            first = time.perf_counter() - start
+else:
+    with open(path) as f:
+        for stroke in json.load(f):
+            strokes += 1
+            loaded += len(stroke['coords']) // 2
+    first = time.perf_counter() - start
+load = time.perf_counter() - start
+assert loaded == points
+
+size = os.path.getsize(path)
+os.remove(path)
+os.rmdir(os.path.dirname(path))
+
+mb = size / 2**20
+print('mode %s, %d strokes, %d points' % (args.mode, strokes, points))
+print('file: %.1f MB (%.1f bytes/point)' % (mb, size / points))
+print('save: %.3f s (%.0f MB/s, %.1f M points/s)' % (save, mb / save, points / save / 1e6))
+print('load: %.3f s (%.0f MB/s, %.1f M points/s), first strokes after %.1f ms' %
+      (load, mb / load, points / load / 1e6, first * 1000))
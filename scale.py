@@ -1,7 +1,9 @@
 from tkinter import *
 from tkinter import ttk
+from throttle import FrameScheduler
 
 root=Tk()
+frames = FrameScheduler(root)
 
 # label tied to the same variable as the scale, so auto-updates
 num = StringVar()
@@ -11,6 +13,8 @@ ttk.Label(root, textvariable=num).grid(column=0, row=0, sticky='we')
 manual = ttk.Label(root)
 manual.grid(column=0, row=1, sticky='we')
 
+# throttled: when dragging, the label is updated once per frame at most
+@frames.throttle
 def update_lbl(val):
    manual['text'] = "Scale at " + val
 
@@ -10,6 +10,5 @@ l['yscrollcommand'] = s.set
 ttk.Label(root, text="Status message here", anchor=(W)).grid(column=0, columnspan=2, row=1, sticky=(W,E))
 root.grid_columnconfigure(0, weight=1)
 root.grid_rowconfigure(0, weight=1)
-for i in range(1,101):
-    l.insert('end', 'Line %d of 100' % i)
+l.insert('end', *['Line %d of 100' % i for i in range(1,101)])
 root.mainloop()
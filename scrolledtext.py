@@ -1,5 +1,10 @@
 from tkinter import *
 from tkinter import ttk
+from textload import StreamLoader, LazyTagger
+from textsearch import TextIndex, Search
+import keyword
+import re
+import sys
 
 root=Tk()
 
@@ -8,11 +13,63 @@ ys = ttk.Scrollbar(root, orient = 'vertical', command = t.yview)
 xs = ttk.Scrollbar(root, orient = 'horizontal', command = t.xview)
 t['yscrollcommand'] = ys.set
 t['xscrollcommand'] = xs.set
-t.insert('end', "Lorem ipsum...\n...\n... dolor sit amet, consectetur adipiscing elit. Cras tincidunt tortor sit amet pretium semper. Pellentesque ac laoreet nulla. Fusce quis sapien ut magna ornare lacinia condimentum vel dui. Pellentesque volutpat pulvinar facilisis. Nunc lacus justo, imperdiet a urna at, condimentum gravida erat. \nAliquam ornare mi id dui blandit laoreet. Donec sed \nelit pretium arcu elementum lobortis ac at est. Curabitur nec \nsapien quam. Duis sit amet lectus quis odio finibus viverra. Duis dapibus dui a tempus mollis. Vestibulum porta sem id tristique maximus. Fusce molestie purus ligula, eu auctor mi egestas quis.")
 t.grid(column = 0, row = 0, sticky = 'nwes')
 xs.grid(column = 0, row = 1, sticky = 'we')
 ys.grid(column = 1, row = 0, sticky = 'ns')
 root.grid_columnconfigure(0, weight = 1)
 root.grid_rowconfigure(0, weight = 1)
 
+# Color Python keywords and comments, a block of lines at a time (only
+# what's visible straight away, the rest later, when idle).
+words = re.compile(r'#.*|\b(%s)\b' % '|'.join(keyword.kwlist))
+t.tag_configure('keyword', foreground = 'blue')
+t.tag_configure('comment', foreground = 'gray50')
+def colorLines(t, first, last):
+    t.tag_remove('keyword', '%d.0' % first, '%d.0' % last)
+    t.tag_remove('comment', '%d.0' % first, '%d.0' % last)
+    ranges = {'keyword': [], 'comment': []}
+    for n, line in enumerate(t.get('%d.0' % first, '%d.0' % last).split('\n'), first):
+        for m in words.finditer(line):
+            kind = 'comment' if m.group().startswith('#') else 'keyword'
+            ranges[kind] += ['%d.%d' % (n, m.start()), '%d.%d' % (n, m.end())]
+    for tag, indices in ranges.items():
+        if indices:
+            t.tag_add(tag, *indices)
+
+# Index the words in the text as it changes (set up before anything is
+# loaded), for the search bar below.
+index = TextIndex(t)
+
+# With a filename on the command line, stream it in a chunk at a time
+# (big files load without freezing the window), with a progress bar and
+# a button to stop loading.
+if len(sys.argv) > 1:
+    status = ttk.Frame(root)
+    status.grid(column = 0, row = 2, columnspan = 2, sticky = 'we')
+    p = ttk.Progressbar(status, orient = 'horizontal', mode = 'determinate', maximum = 1.0)
+    p.grid(column = 0, row = 0, sticky = 'we', padx = 5, pady = 5)
+    stop = ttk.Button(status, text = 'Stop')
+    stop.grid(column = 1, row = 0, padx = 5, pady = 5)
+    status.grid_columnconfigure(0, weight = 1)
+    loader = StreamLoader(t, sys.argv[1], tagger = LazyTagger(t, colorLines),
+                          progress = lambda fraction: p.configure(value = fraction),
+                          done = lambda complete: status.grid_remove())
+    stop['command'] = loader.cancel
+else:
+    t.insert('end', "Lorem ipsum...\n...\n... dolor sit amet, consectetur adipiscing elit. Cras tincidunt tortor sit amet pretium semper. Pellentesque ac laoreet nulla. Fusce quis sapien ut magna ornare lacinia condimentum vel dui. Pellentesque volutpat pulvinar facilisis. Nunc lacus justo, imperdiet a urna at, condimentum gravida erat. \nAliquam ornare mi id dui blandit laoreet. Donec sed \nelit pretium arcu elementum lobortis ac at est. Curabitur nec \nsapien quam. Duis sit amet lectus quis odio finibus viverra. Duis dapibus dui a tempus mollis. Vestibulum porta sem id tristique maximus. Fusce molestie purus ligula, eu auctor mi egestas quis.")
+
+# Search: every hit in view is highlighted, and Return or Next moves to
+# the next one.
+search = Search(t, index)
+query = StringVar()
+query.trace_add('write', lambda *args: search.find(query.get()))
+bar = ttk.Frame(root)
+bar.grid(column = 0, row = 3, columnspan = 2, sticky = 'we')
+e = ttk.Entry(bar, textvariable = query)
+e.grid(column = 0, row = 0, sticky = 'we', padx = 5, pady = 5)
+e.bind('<Return>', lambda e: search.next())
+ttk.Button(bar, text = 'Previous', command = search.prev).grid(column = 1, row = 0, pady = 5)
+ttk.Button(bar, text = 'Next', command = search.next).grid(column = 2, row = 0, padx = 5, pady = 5)
+bar.grid_columnconfigure(0, weight = 1)
+
 root.mainloop()
@@ -0,0 +1,85 @@
+# Per-query latency for searching a big Text widget: a TextIndex and
+# Search, versus highlighting every hit found by Text.search.
+#
+#   python searchbench.py [--lines 1000000] [--mode index|tk] [--queries 20]
+#
+# Fills a Text widget with log-like lines, then runs each query (a common
+# word, a rarer one, two words together, and a missing one), timing the
+# search plus highlighting, and jumping to the next hit a few times.
+
+from tkinter import *
+import argparse
+import random
+import statistics
+import time
+from textsearch import TextIndex, Search, unpack
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--lines', type=int, default=1000000)
+parser.add_argument('--mode', choices=('index', 'tk'), default='index')
+parser.add_argument('--queries', type=int, default=20, help='repetitions of each query')
+args = parser.parse_args()
+
+# Positions far along a very long line (over 4M characters, where columns
+# once spilled into the line number) must come back exactly.
+check = TextIndex()
+check.append('x' * (5 << 20) + ' needle ' + 'y' * 2000)
+check.append('\nneedle')
+assert [unpack(key) for key in check.find('needle')] == [(0, (5 << 20) + 1), (1, 0)]
+assert [unpack(key) for key in check.find('y' * 2000)] == [(0, (5 << 20) + 8)]
+
+random.seed(1)
+vocabulary = ['word%d' % i for i in range(5000)]
+levels = ['INFO'] * 20 + ['WARNING'] * 4 + ['ERROR']
+lines = ['%06d %s worker%d %s %s %s' % (i, random.choice(levels), i % 16, random.choice(vocabulary),
+                                        random.choice(vocabulary), random.choice(vocabulary))
+         for i in range(args.lines)]
+text = '\n'.join(lines)
+
+root = Tk()
+t = Text(root, width=100, height=40, wrap='none')
+t.grid()
+start = time.perf_counter()
+t.insert('end', text)
+root.update()
+print('%d lines, inserted in %.2f s' % (args.lines, time.perf_counter() - start))
+
+if args.mode == 'index':
+    start = time.perf_counter()
+    index = TextIndex(t)
+    print('index built in %.2f s (%d words)' % (time.perf_counter() - start, len(index.postings)))
+    search = Search(t, index)
+
+    def run(query):
+        count = search.find(query)
+        for i in range(5):
+            search.next()
+        return count
+else:
+    t.tag_configure('found', background='yellow')
+
+    def run(query):
+        t.tag_remove('found', '1.0', 'end')
+        pattern = r'\m%s\M' % r'\M.*\m'.join(query.split())
+        found = t.tk.splitlist(t.tk.call(t, 'search', '-all', '-nocase', '-regexp',
+                                         '-count', 'lengths', pattern, '1.0', 'end'))
+        lengths = t.tk.splitlist(t.tk.getvar('lengths')) if found else ()
+        ranges = []
+        for index, length in zip(found, lengths):
+            ranges += [index, '%s + %s chars' % (index, length)]
+        if ranges:
+            t.tag_add('found', *ranges)
+        for i in range(5):
+            t.search(pattern, 'insert + 1 char', regexp=True, nocase=True)
+        return len(found)
+
+for query in ('INFO', 'ERROR', 'word42', 'error word42', 'nothing'):
+    times = []
+    for i in range(args.queries):
+        start = time.perf_counter()
+        count = run(query)
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+    ms = sorted(x * 1000 for x in times)
+    print('%-14r %8d hits: median %8.2f ms, max %8.2f ms' % (query, count, statistics.median(ms), ms[-1]))
+root.destroy()
@@ -2,14 +2,21 @@ from tkinter import *
 from tkinter import ttk
 
 lastx, lasty = 0, 0
+line = None
 
 def xy(event):
-    global lastx, lasty
+    global lastx, lasty, line
     lastx, lasty = event.x, event.y
+    line = None
 
+# The first motion of a stroke creates a line item; later motions append
+# their point to that same item instead of creating a new one each time.
 def addLine(event):
-    global lastx, lasty
-    canvas.create_line((lastx, lasty, event.x, event.y))
+    global lastx, lasty, line
+    if line is None:
+        line = canvas.create_line((lastx, lasty, event.x, event.y))
+    else:
+        canvas.insert(line, 'end', (event.x, event.y))
     lastx, lasty = event.x, event.y
 
 root = Tk()
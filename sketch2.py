@@ -2,19 +2,26 @@ from tkinter import *
 from tkinter import ttk
 
 lastx, lasty = 0, 0
+line = None
 color = "black"
 
 def xy(event):
-    global lastx, lasty
+    global lastx, lasty, line
     lastx, lasty = event.x, event.y
+    line = None
 
 def setColor(newcolor):
     global color
     color = newcolor
 
+# The first motion of a stroke creates a line item; later motions append
+# their point to that same item instead of creating a new one each time.
 def addLine(event):
-    global lastx, lasty
-    canvas.create_line((lastx, lasty, event.x, event.y), fill=color)
+    global lastx, lasty, line
+    if line is None:
+        line = canvas.create_line((lastx, lasty, event.x, event.y), fill=color)
+    else:
+        canvas.insert(line, 'end', (event.x, event.y))
     lastx, lasty = event.x, event.y
 
 root = Tk()
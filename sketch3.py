@@ -1,12 +1,13 @@
 from tkinter import *
 from tkinter import ttk
+from tkinter import filedialog, messagebox
+from strokes import StrokeList
+from sketchfile import Drawing, SketchLoader
 
-lastx, lasty = 0, 0
 color = "black"
 
 def xy(event):
-    global lastx, lasty
-    lastx, lasty = event.x, event.y
+    strokes.begin(event.x, event.y, fill=color)
 
 def setColor(newcolor):
     global color
@@ -17,12 +18,22 @@ def setColor(newcolor):
     canvas.itemconfigure('paletteSelected', outline='#999999')
 
 def addLine(event):
-    global lastx, lasty
-    canvas.create_line((lastx, lasty, event.x, event.y), fill=color, width=5, tags='currentline')
-    lastx, lasty = event.x, event.y
+    strokes.add(event.x, event.y)
 
 def doneStroke(event):
-    canvas.itemconfigure('currentline', width=1)        
+    strokes.finish(width=1)
+
+# Right-click deletes the stroke under the mouse, shift-right-click gives
+# it the current color; Control-z and Control-y undo and redo.
+def deleteStroke(event):
+    for stroke in map(strokes.find, canvas.find_withtag('current')):
+        if stroke is not None:
+            strokes.delete(stroke)
+
+def recolorStroke(event):
+    for stroke in map(strokes.find, canvas.find_withtag('current')):
+        if stroke is not None:
+            strokes.recolor(stroke, color)
 
 root = Tk()
 root.columnconfigure(0, weight=1)
@@ -33,6 +44,31 @@ canvas.grid(column=0, row=0, sticky=(N, W, E, S))
 canvas.bind("<Button-1>", xy)
 canvas.bind("<B1-Motion>", addLine)
 canvas.bind("<B1-ButtonRelease>", doneStroke)
+canvas.bind("<Button-3>", deleteStroke)
+canvas.bind("<Shift-Button-3>", recolorStroke)
+root.bind("<Control-z>", lambda e: strokes.undo())
+root.bind("<Control-y>", lambda e: strokes.redo())
+strokes = StrokeList(canvas, mindist=2, tolerance=0.5, width=5)
+
+# Control-s saves the drawing; Control-o adds the strokes saved in a file
+# to it, a chunk at a time so the window keeps responding.
+filetypes = [("Sketches", "*.sketch"), ("All files", "*")]
+
+def save(event):
+    path = filedialog.asksaveasfilename(defaultextension=".sketch", filetypes=filetypes)
+    if path:
+        try:
+            Drawing.from_strokes(strokes).save(path)
+        except OSError as e:
+            messagebox.showerror(title='Save', message="Couldn't save %s" % path, detail=str(e))
+
+def load(event):
+    path = filedialog.askopenfilename(filetypes=filetypes)
+    if path:
+        SketchLoader(strokes, path)
+
+root.bind("<Control-s>", save)
+root.bind("<Control-o>", load)
 
 id = canvas.create_rectangle((10, 10, 30, 30), fill="red", tags=('palette', 'palettered'))
 canvas.tag_bind(id, "<Button-1>", lambda x: setColor("red"))
@@ -1,5 +1,12 @@
+import sys
 from tkinter import *
 from tkinter import ttk
+from tkinter import filedialog, messagebox
+from strokes import StrokeList
+from sketchfile import Drawing, SketchLoader
+from export import Exporter
+from tasks import TaskRunner
+from flatten import FlattenLayer
 root = Tk()
 
 h = ttk.Scrollbar(root, orient=HORIZONTAL)
@@ -14,11 +21,8 @@ v.grid(column=1, row=0, sticky=(N,S))
 root.grid_columnconfigure(0, weight=1)
 root.grid_rowconfigure(0, weight=1)
 
-lastx, lasty = 0, 0
-
 def xy(event):
-    global lastx, lasty
-    lastx, lasty = canvas.canvasx(event.x), canvas.canvasy(event.y)
+    strokes.begin(canvas.canvasx(event.x), canvas.canvasy(event.y), fill=color)
 
 def setColor(newcolor):
     global color
@@ -29,17 +33,79 @@ def setColor(newcolor):
     canvas.itemconfigure('paletteSelected', outline='#999999')
 
 def addLine(event):
-    global lastx, lasty
-    x, y = canvas.canvasx(event.x), canvas.canvasy(event.y)
-    canvas.create_line((lastx, lasty, x, y), fill=color, width=5, tags='currentline')
-    lastx, lasty = x, y
+    strokes.add(canvas.canvasx(event.x), canvas.canvasy(event.y))
 
 def doneStroke(event):
-    canvas.itemconfigure('currentline', width=1)        
-        
+    strokes.finish(width=1)
+
+# Right-click deletes the stroke under the mouse, shift-right-click gives
+# it the current color; Control-z and Control-y undo and redo.  A stroke
+# that has been flattened into an image (see below) is found through the
+# layer.
+def strokeAt(event):
+    for stroke in map(strokes.find, canvas.find_withtag('current')):
+        if stroke is not None:
+            return stroke
+    if layer is not None:
+        return layer.find(canvas.canvasx(event.x), canvas.canvasy(event.y))
+    return None
+
+def deleteStroke(event):
+    stroke = strokeAt(event)
+    if stroke is not None:
+        strokes.delete(stroke)
+
+def recolorStroke(event):
+    stroke = strokeAt(event)
+    if stroke is not None:
+        strokes.recolor(stroke, color)
+
 canvas.bind("<Button-1>", xy)
 canvas.bind("<B1-Motion>", addLine)
 canvas.bind("<B1-ButtonRelease>", doneStroke)
+canvas.bind("<Button-3>", deleteStroke)
+canvas.bind("<Shift-Button-3>", recolorStroke)
+root.bind("<Control-z>", lambda e: strokes.undo())
+root.bind("<Control-y>", lambda e: strokes.redo())
+strokes = StrokeList(canvas, mindist=2, tolerance=0.5, width=5)
+
+# With --flatten, all but the latest 200 strokes are rendered into image
+# tiles in the background, so the number of canvas items stays bounded.
+layer = FlattenLayer(strokes, keep=200) if '--flatten' in sys.argv[1:] else None
+
+# Control-s saves the drawing; Control-o adds the strokes saved in a file
+# to it, a chunk at a time so the window keeps responding.
+filetypes = [("Sketches", "*.sketch"), ("All files", "*")]
+
+def save(event):
+    path = filedialog.asksaveasfilename(defaultextension=".sketch", filetypes=filetypes)
+    if path:
+        try:
+            Drawing.from_strokes(strokes).save(path)
+        except OSError as e:
+            messagebox.showerror(title='Save', message="Couldn't save %s" % path, detail=str(e))
+
+def load(event):
+    path = filedialog.askopenfilename(filetypes=filetypes)
+    if path:
+        SketchLoader(strokes, path)
+
+root.bind("<Control-s>", save)
+root.bind("<Control-o>", load)
+
+# Control-e exports the scrollregion as PNG or PostScript (.ps), rendered
+# in other processes, with progress shown in the title bar.
+exporter = Exporter(TaskRunner(root, workers=1), strokes)
+
+def export(event):
+    path = filedialog.asksaveasfilename(defaultextension=".png",
+                                        filetypes=[("PNG", "*.png"), ("PostScript", "*.ps"), ("All files", "*")])
+    if path:
+        title = root.title()
+        exporter.export(path, progress=lambda f: root.title('%s - exporting %d%%' % (title, f * 100)),
+                        done=lambda result: root.title(title))
+
+root.bind("<Control-e>", export)
 
 id = canvas.create_rectangle((10, 10, 30, 30), fill="red", tags=('palette', 'palettered'))
 canvas.tag_bind(id, "<Button-1>", lambda x: setColor("red"))
@@ -0,0 +1,105 @@
+from tkinter import *
+from tkinter import ttk
+from tkinter import filedialog, messagebox
+from strokes import StrokeList
+from sketchfile import Drawing, SketchLoader
+from viewport import Viewport
+root = Tk()
+
+# A 100,000 x 100,000 drawing board.  Only the strokes near the visible
+# part of the canvas actually exist as canvas items; see viewport.py.
+h = ttk.Scrollbar(root, orient=HORIZONTAL)
+v = ttk.Scrollbar(root, orient=VERTICAL)
+canvas = Canvas(root, scrollregion=(0, 0, 100000, 100000), yscrollcommand=v.set, xscrollcommand=h.set)
+h['command'] = canvas.xview
+v['command'] = canvas.yview
+
+canvas.grid(column=0, row=0, sticky=(N,W,E,S))
+h.grid(column=0, row=1, sticky=(W,E))
+v.grid(column=1, row=0, sticky=(N,S))
+root.grid_columnconfigure(0, weight=1)
+root.grid_rowconfigure(0, weight=1)
+
+strokes = StrokeList(canvas, mindist=2, tolerance=0.5, width=1)
+view = Viewport(strokes)
+selection = []
+bandx, bandy = 0, 0
+
+def xy(event):
+    strokes.begin(canvas.canvasx(event.x), canvas.canvasy(event.y))
+
+def addLine(event):
+    strokes.add(canvas.canvasx(event.x), canvas.canvasy(event.y))
+
+def doneStroke(event):
+    strokes.finish()
+
+# Right-click deletes the stroke under the mouse, found via the index.
+def deleteStroke(event):
+    stroke = view.find(canvas.canvasx(event.x), canvas.canvasy(event.y))
+    if stroke is not None:
+        strokes.delete(stroke)
+
+# Shift-drag draws a rubber band; strokes entirely inside it are selected
+# and can be removed with the Delete key.
+def startBand(event):
+    global bandx, bandy
+    bandx, bandy = canvas.canvasx(event.x), canvas.canvasy(event.y)
+    canvas.delete('band')
+    canvas.create_rectangle((bandx, bandy, bandx, bandy), dash=(4, 4), tags='band')
+
+def dragBand(event):
+    canvas.coords('band', (bandx, bandy, canvas.canvasx(event.x), canvas.canvasy(event.y)))
+
+def endBand(event):
+    global selection
+    selection = view.enclosed(bandx, bandy, canvas.canvasx(event.x), canvas.canvasy(event.y))
+    canvas.itemconfigure('band', outline='blue' if selection else 'black')
+
+def deleteSelection(event):
+    global selection
+    # Skip any already deleted (by a right-click) since they were selected.
+    for stroke in {stroke.id: stroke for stroke in selection}.values():
+        if stroke.id in strokes.strokes:
+            strokes.delete(stroke)
+    selection = []
+    canvas.delete('band')
+
+canvas.bind("<Button-1>", xy)
+canvas.bind("<B1-Motion>", addLine)
+canvas.bind("<B1-ButtonRelease>", doneStroke)
+canvas.bind("<Button-3>", deleteStroke)
+canvas.bind("<Shift-Button-1>", startBand)
+canvas.bind("<Shift-B1-Motion>", dragBand)
+canvas.bind("<Shift-B1-ButtonRelease>", endBand)
+canvas.bind("<Button-2>", lambda e: canvas.scan_mark(e.x, e.y))
+canvas.bind("<B2-Motion>", lambda e: canvas.scan_dragto(e.x, e.y, gain=1))
+root.bind("<Delete>", deleteSelection)
+root.bind("<Control-z>", lambda e: strokes.undo())
+root.bind("<Control-y>", lambda e: strokes.redo())
+
+# Control-s saves the drawing; Control-o adds the strokes saved in a file
+# to it, a chunk at a time so the window keeps responding.  Loaded
+# strokes get canvas items only once the Viewport finds them near the
+# visible area.
+filetypes = [("Sketches", "*.sketch"), ("All files", "*")]
+
+def save(event):
+    path = filedialog.asksaveasfilename(defaultextension=".sketch", filetypes=filetypes)
+    if path:
+        try:
+            Drawing.from_strokes(strokes).save(path)
+        except OSError as e:
+            messagebox.showerror(title='Save', message="Couldn't save %s" % path, detail=str(e))
+
+def load(event):
+    path = filedialog.askopenfilename(filetypes=filetypes)
+    if path:
+        SketchLoader(strokes, path, draw=False)
+
+root.bind("<Control-s>", save)
+root.bind("<Control-o>", load)
+
+canvas.xview_moveto(0.5)
+canvas.yview_moveto(0.5)
+root.mainloop()
@@ -0,0 +1,97 @@
+# Replay a stream of synthetic mouse motion events against a canvas, once
+# creating a two-point line item per event (the original sketch examples)
+# and once growing a single polyline per stroke, and compare the two.
+#
+#   python sketchbench.py [--events 100000] [--stroke 200] [--mindist 0] [--tolerance 0]
+#
+# Each mode runs in its own process so the memory figures don't overlap.
+
+from tkinter import *
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+from benchmark import rss_mb
+from strokes import Stroke
+
+def motions(count, strokelen, seed=1):
+    rnd = random.Random(seed)
+    x, y = 400, 300
+    for i in range(count):
+        if i % strokelen == 0:
+            x, y = rnd.randrange(800), rnd.randrange(600)
+            yield 'press', x, y
+        x = min(max(x + rnd.randint(-4, 4), 0), 800)
+        y = min(max(y + rnd.randint(-4, 4), 0), 600)
+        yield 'motion', x, y
+        if i % strokelen == strokelen - 1:
+            yield 'release', x, y
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+def run(mode, args):
+    root = Tk()
+    canvas = Canvas(root, width=800, height=600)
+    canvas.grid()
+    root.update()
+    base = rss_mb()
+    latencies = []
+    stroke = None
+    lastx = lasty = 0
+    for kind, x, y in motions(args.events, args.stroke):
+        start = time.perf_counter()
+        if kind == 'press':
+            lastx, lasty = x, y
+            stroke = Stroke(canvas, x, y, mindist=args.mindist, tolerance=args.tolerance)
+        elif kind == 'release':
+            if mode == 'polyline':
+                stroke.finish()
+        elif mode == 'polyline':
+            stroke.add(x, y)
+        else:
+            canvas.create_line((lastx, lasty, x, y))
+            lastx, lasty = x, y
+        if kind == 'motion':
+            latencies.append(time.perf_counter() - start)
+            if len(latencies) % 1000 == 0:
+                root.update_idletasks()
+    root.update()
+    start = time.perf_counter()
+    items = len(canvas.find('all'))
+    find = time.perf_counter() - start
+    start = time.perf_counter()
+    canvas.move('all', 0, 0)
+    root.update_idletasks()
+    redraw = time.perf_counter() - start
+    latencies.sort()
+    result = dict(mode=mode, events=len(latencies), items=items,
+                  rss_mb=round(rss_mb() - base, 1),
+                  p50_us=round(percentile(latencies, 50) * 1e6, 1),
+                  p99_us=round(percentile(latencies, 99) * 1e6, 1),
+                  max_us=round(latencies[-1] * 1e6, 1),
+                  total_s=round(sum(latencies), 3),
+                  find_ms=round(find * 1e3, 2), redraw_ms=round(redraw * 1e3, 2))
+    root.destroy()
+    return result
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--events', type=int, default=100000)
+parser.add_argument('--stroke', type=int, default=200, help='motion events per stroke')
+parser.add_argument('--mindist', type=float, default=0)
+parser.add_argument('--tolerance', type=float, default=0)
+parser.add_argument('--mode', choices=('segments', 'polyline'))
+args = parser.parse_args()
+
+if args.mode:
+    print(json.dumps(run(args.mode, args)))
+else:
+    print('%-10s %8s %8s %9s %9s %9s %9s %10s' % ('mode', 'items', 'rss MB', 'p50 us', 'p99 us', 'total s', 'find ms', 'redraw ms'))
+    for mode in ('segments', 'polyline'):
+        out = subprocess.run([sys.executable, __file__, '--mode', mode] + sys.argv[1:],
+                             capture_output=True, text=True, check=True).stdout
+        r = json.loads(out)
+        print('%-10s %8d %8.1f %9.1f %9.1f %9.3f %9.2f %10.2f' % (mode, r['items'], r['rss_mb'],
+              r['p50_us'], r['p99_us'], r['total_s'], r['find_ms'], r['redraw_ms']))
@@ -0,0 +1,243 @@
+# Save drawings to a compact binary file, and load them back piece by piece.
+#
+# A Drawing holds the geometry of any number of strokes in a few flat
+# arrays rather than as Python objects: every stroke's points one after
+# another as 32-bit floats, where each stroke ends, and for each stroke an
+# index into a palette of (color, width) pairs.  It is built from the
+# strokes' own coordinates (see Drawing.from_strokes), so saving needs no
+# round trips to the canvas to ask for each item's coords and options.
+#
+# The file is a short header followed by chunks, each a four-letter type,
+# a length and the data, all little-endian and kept 4-byte aligned:
+#
+#   header   b'TKSKETCH', version, 0
+#   PALT     number of entries, then each width (float), color length and color
+#   STRK     number of strokes n and coordinates m, then palette index[n]
+#            (padded to 4 bytes), end of each stroke within the chunk[n],
+#            coordinates[m]
+#   ...      more STRK chunks of up to 'chunk' coordinates each
+#
+# Loading maps the file into memory and copies each chunk's arrays
+# straight out of it.  pieces() yields the drawing one chunk at a time,
+# so a SketchLoader can add the first strokes to the canvas and let the
+# window repaint before the rest of the file has even been looked at.
+
+from array import array
+import mmap
+import os
+import struct
+import sys
+from tkinter import TclError, messagebox
+
+MAGIC = b'TKSKETCH'
+VERSION = 1
+HEADER = struct.Struct('<8sII')
+CHUNK = struct.Struct('<4sI')
+COUNTS = struct.Struct('<II')
+SWAP = sys.byteorder == 'big'
+
+
+def pad(n):
+    return -n % 4
+
+
+class Drawing:
+    def __init__(self, palette=None):
+        self.coords = array('f')    # x, y, x, y, ... for all the strokes
+        self.ends = array('I')      # where each stroke's coordinates end
+        self.styles = array('H')    # each stroke's entry in the palette
+        self.palette = palette if palette is not None else []
+        self.lookup = {entry: i for i, entry in enumerate(self.palette)}
+
+    def __len__(self):
+        return len(self.ends)
+
+    def __iter__(self):
+        start = 0
+        for end, style in zip(self.ends, self.styles):
+            yield self.coords[start:end], self.palette[style]
+            start = end
+
+    def style(self, color, width):
+        entry = (color, float(width))
+        if entry not in self.lookup:
+            self.lookup[entry] = len(self.palette)
+            self.palette.append(entry)
+        return self.lookup[entry]
+
+    def add(self, coords, color='black', width=1):
+        self.coords.extend(coords)
+        self.ends.append(len(self.coords))
+        self.styles.append(self.style(color, width))
+
+    @classmethod
+    def from_strokes(cls, strokes):
+        drawing = cls()
+        for stroke in strokes:
+            drawing.add(stroke.coords, stroke.options.get('fill', 'black'), stroke.options.get('width', 1))
+        return drawing
+
+    def save(self, path, chunk=1 << 16):
+        temp = path + '.tmp'
+        try:
+            with open(temp, 'wb') as f:
+                self._save(f, chunk)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+        os.replace(temp, path)
+
+    def _save(self, f, chunk):
+        f.write(HEADER.pack(MAGIC, VERSION, 0))
+        data = bytearray(struct.pack('<I', len(self.palette)))
+        for color, width in self.palette:
+            name = color.encode('utf-8')
+            data += struct.pack('<fH', width, len(name)) + name
+        data += bytes(pad(len(data)))
+        f.write(CHUNK.pack(b'PALT', len(data)) + data)
+        first = start = 0
+        for i, end in enumerate(self.ends):
+            if end - start >= chunk or i == len(self.ends) - 1:
+                self._write(f, first, i + 1, start)
+                first, start = i + 1, end
+
+    # Strokes first..last-1, whose coordinates begin at start.
+    def _write(self, f, first, last, start):
+        styles, ends = self.styles[first:last], array('I', (e - start for e in self.ends[first:last]))
+        coords = self.coords[start:self.ends[last - 1]]
+        if SWAP:
+            for a in (styles, ends, coords):
+                a.byteswap()
+        size = COUNTS.size + len(styles) * 2 + pad(len(styles) * 2) + len(ends) * 4 + len(coords) * 4
+        f.write(CHUNK.pack(b'STRK', size) + COUNTS.pack(len(styles), len(coords)))
+        f.write(styles.tobytes() + bytes(pad(len(styles) * 2)))
+        f.write(ends.tobytes())
+        f.write(coords.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        drawing = None
+        for piece in pieces(path):
+            if drawing is None:
+                drawing = cls(piece.palette)
+            base = len(drawing.coords)
+            drawing.coords.extend(piece.coords)
+            drawing.ends.extend(e + base for e in piece.ends)
+            drawing.styles.extend(piece.styles)
+        return drawing or cls()
+
+
+# The drawing in a file as a series of Drawings, one per chunk, all
+# sharing the same palette.
+def pieces(path):
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER.size:
+            raise ValueError('%s: not a sketch file' % path)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, flags = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC:
+                raise ValueError('%s: not a sketch file' % path)
+            if version > VERSION:
+                raise ValueError('%s: saved by a newer version (%d)' % (path, version))
+            palette = []
+            pos = HEADER.size
+            while pos + CHUNK.size <= size:
+                kind, length = CHUNK.unpack_from(mm, pos)
+                pos += CHUNK.size
+                if pos + length > size:
+                    raise ValueError('%s: truncated' % path)
+                if kind == b'PALT':
+                    palette[:] = _palette(mm, pos)
+                elif kind == b'STRK':
+                    yield _strokes(mm, pos, palette)
+                pos += length       # skipping any chunk types we don't know
+
+
+def _palette(mm, pos):
+    count, = struct.unpack_from('<I', mm, pos)
+    pos += 4
+    entries = []
+    for i in range(count):
+        width, length = struct.unpack_from('<fH', mm, pos)
+        pos += 6
+        entries.append((mm[pos:pos + length].decode('utf-8'), width))
+        pos += length
+    return entries
+
+
+def _strokes(mm, pos, palette):
+    piece = Drawing(palette)
+    n, m = COUNTS.unpack_from(mm, pos)
+    pos += COUNTS.size
+    with memoryview(mm) as view:
+        piece.styles.frombytes(view[pos:pos + n * 2])
+        pos += n * 2 + pad(n * 2)
+        piece.ends.frombytes(view[pos:pos + n * 4])
+        pos += n * 4
+        piece.coords.frombytes(view[pos:pos + m * 4])
+    if SWAP:
+        for a in (piece.styles, piece.ends, piece.coords):
+            a.byteswap()
+    # Every stroke needs at least one point, and a style in the palette.
+    start = 0
+    for end in piece.ends:
+        if end - start < 2 or end % 2:
+            raise ValueError('corrupt stroke data')
+        start = end
+    if start != m or len(piece.coords) != m or (n and max(piece.styles) >= len(palette)):
+        raise ValueError('corrupt stroke data')
+    return piece
+
+
+# Add the strokes in a file to a StrokeList, a chunk each time Tk is idle.
+# progress(fraction) is called after each chunk, done(complete) at the
+# end, with False if it was cancelled or the file couldn't be read.  Any
+# such error is passed to error(exception), or shown in a message box.
+# With draw=False, strokes get no canvas items until restored (e.g. by a
+# Viewport).
+class SketchLoader:
+    def __init__(self, strokes, path, progress=None, done=None, error=None, draw=True):
+        self.strokes, self.path, self.draw = strokes, path, draw
+        self.progress, self.done, self.error = progress, done, error
+        self.total = None
+        self.pieces = pieces(path)
+        self.loaded = 0
+        self.finished = False
+        self.pending = strokes.canvas.after_idle(self.tick)
+
+    def tick(self):
+        try:
+            if self.total is None:
+                self.total = os.path.getsize(self.path) or 1
+            piece = next(self.pieces)
+            for coords, (color, width) in piece:
+                self.strokes.append(coords.tolist(), self.draw, fill=color, width=width)
+        except StopIteration:
+            self._finish(True)
+            return
+        except (OSError, ValueError, struct.error, TclError) as e:
+            self._finish(False)
+            if self.error:
+                self.error(e)
+            else:
+                messagebox.showerror(title='Open', message="Couldn't read %s" % self.path, detail=str(e),
+                                     parent=self.strokes.canvas)
+            return
+        self.loaded += 4 * (len(piece.coords) + len(piece.ends)) + 2 * len(piece.styles)
+        if self.progress:
+            self.progress(min(1.0, self.loaded / self.total))
+        self.pending = self.strokes.canvas.after_idle(self.tick)
+
+    def cancel(self):
+        if not self.finished:
+            self.strokes.canvas.after_cancel(self.pending)
+            self._finish(False)
+
+    def _finish(self, complete):
+        self.finished = True
+        self.pending = None
+        self.pieces.close()
+        if self.done:
+            self.done(complete)
@@ -1,24 +1,64 @@
 from tkinter import *
 from tkinter import ttk
+from tkinter import filedialog, messagebox
+from strokes import StrokeList
+from sketchfile import Drawing, SketchLoader
 
+# mode='polyline' draws each stroke as one line item that grows as the
+# mouse moves, kept in a StrokeList; mode='segments' creates a new line
+# item per motion event (and, having no strokes, has nothing to save).
 class Sketchpad(Canvas):
-    def __init__(self, parent, **kwargs):
+    def __init__(self, parent, mode='polyline', mindist=0, tolerance=0, **kwargs):
         super().__init__(parent, **kwargs)
-        self.bind("<Button-1>", self.save_posn)
+        self.mode = mode
+        self.strokes = StrokeList(self, mindist=mindist, tolerance=tolerance)
+        self.bind("<Button-1>", self.start_stroke)
         self.bind("<B1-Motion>", self.add_line)
-        
+        self.bind("<B1-ButtonRelease>", self.done_stroke)
+
     def save_posn(self, event):
         self.lastx, self.lasty = event.x, event.y
 
+    def start_stroke(self, event):
+        self.save_posn(event)
+        if self.mode == 'polyline':
+            self.strokes.begin(event.x, event.y)
+
     def add_line(self, event):
-        self.create_line((self.lastx, self.lasty, event.x, event.y))
+        if self.mode == 'polyline':
+            self.strokes.add(event.x, event.y)
+        else:
+            self.create_line((self.lastx, self.lasty, event.x, event.y))
         self.save_posn(event)
 
+    def done_stroke(self, event):
+        self.strokes.finish()
+
 root = Tk()
 root.columnconfigure(0, weight=1)
 root.rowconfigure(0, weight=1)
 
-sketch = Sketchpad(root)
+sketch = Sketchpad(root, mindist=2, tolerance=0.5)
 sketch.grid(column=0, row=0, sticky=(N, W, E, S))
 
+# Control-s saves the drawing; Control-o adds the strokes saved in a file
+# to it, a chunk at a time so the window keeps responding.
+filetypes = [("Sketches", "*.sketch"), ("All files", "*")]
+
+def save(event):
+    path = filedialog.asksaveasfilename(defaultextension=".sketch", filetypes=filetypes)
+    if path:
+        try:
+            Drawing.from_strokes(sketch.strokes).save(path)
+        except OSError as e:
+            messagebox.showerror(title='Save', message="Couldn't save %s" % path, detail=str(e))
+
+def load(event):
+    path = filedialog.askopenfilename(filetypes=filetypes)
+    if path:
+        SketchLoader(sketch.strokes, path)
+
+root.bind("<Control-s>", save)
+root.bind("<Control-o>", load)
+
 root.mainloop()
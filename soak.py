@@ -0,0 +1,151 @@
+# Run the examples for a long (simulated) time, and check that nothing
+# keeps piling up: Tcl commands, variable traces, pending after() events
+# and canvas items.
+#
+#   python soak.py [example ...] [--hours 8] [--every 15] [--xvfb]
+#
+# Each example runs in its own process, taken over at mainloop() as in
+# benchmark.py and driven by the same scripted input, with tkleaks
+# tracking what it creates.  Time is simulated: each simulated minute is
+# one short burst of activity (a few strokes drawn and undone, a round of
+# typing, a few dozen selections, a burst of log messages), after which
+# Tk is left to catch up.  Every --every minutes the live Tcl commands,
+# traces, after events and canvas items are counted.
+#
+# Something that's bounded levels off, so after the first half of the run
+# it shouldn't reach new highs; if it does (by more than a little slack),
+# the example fails, and the call sites that grew the most are listed.
+# The exit status is 1 if any example failed.
+
+import argparse
+import json
+import os
+import runpy
+import subprocess
+import sys
+import tkinter
+import tkleaks
+from benchmark import Driver, HERE, drags, flooding, selecting, typing, xvfb
+
+
+def drawing(d):
+    drags(d, strokes=3, points=40)
+
+
+# Strokes drawn and then undone, so the drawing itself doesn't grow.
+def undoing(d):
+    drags(d, strokes=3, points=40)
+    d.root.focus_force()
+    for i in range(3):
+        d.event(d.root, '<Control-z>')
+
+
+# Example, a minute's activity, and what is expected to stay bounded (on
+# the plain sketches the drawing, and so the canvas items, grow by design).
+SOAK = {
+    'sketch1': ('sketch1.py', drawing, ('tcl', 'command', 'trace', 'after')),
+    'sketch2': ('sketch2.py', drawing, ('tcl', 'command', 'trace', 'after')),
+    'sketch3': ('sketch3.py', undoing, ('tcl', 'command', 'trace', 'after', 'items')),
+    'sketch4': ('sketch4.py', undoing, ('tcl', 'command', 'trace', 'after', 'items')),
+    'sketcho': ('sketcho.py', drawing, ('tcl', 'command', 'trace', 'after')),
+    'validate': ('validate.py', lambda d: typing(d, rounds=1), ('tcl', 'command', 'trace', 'after')),
+    'numvalidate': ('numvalidate.py', lambda d: typing(d, '12x345', 1), ('tcl', 'command', 'trace', 'after')),
+    'country': ('country.py', lambda d: selecting(d, clicks=30), ('tcl', 'command', 'trace', 'after')),
+    'logwindow': ('logwindow.py', lambda d: flooding(d, bursts=1, size=200), ('tcl', 'command', 'trace', 'after')),
+}
+
+# How far past its first-half high a count may go without failing.
+SLACK = {'tcl': 0, 'command': 0, 'trace': 0, 'after': 2, 'items': 0}
+
+
+class Finished(Exception):
+    pass
+
+
+# In the child process: run the example, taking over at mainloop().
+def run(name, minutes, every):
+    path, activity, checked = SOAK[name]
+    tracker = tkleaks.enable()
+    results = {'samples': [], 'checked': checked}
+
+    def mainloop(root, n=0):
+        driver = Driver(root, sys._getframe(1).f_globals)
+        root.update()
+        for minute in range(1, minutes + 1):
+            activity(driver)
+            driver.latencies.clear()
+            root.update()
+            if minute % every == 0:
+                snapshot = tracker.snapshot()
+                results['samples'].append(dict(snapshot.totals, minute=minute))
+                if minute * 2 <= minutes:
+                    middle = snapshot
+        results['growth'] = [str(d) for d in snapshot.compare_to(middle) if d.diff > 0][:10]
+        raise Finished
+
+    tkinter.Misc.mainloop = mainloop
+    sys.argv = [path]
+    sys.path.insert(0, HERE)
+    try:
+        runpy.run_path(os.path.join(HERE, path), run_name='__main__')
+    except Finished:
+        pass
+    print(json.dumps(results))
+
+
+# Counts that set new highs in the second half of the run.
+def unbounded(results):
+    samples = results['samples']
+    half = len(samples) // 2
+    grown = []
+    for kind in results['checked']:
+        early = max((s.get(kind, 0) for s in samples[:half]), default=None)
+        late = max((s.get(kind, 0) for s in samples[half:]), default=None)
+        if early is not None and late > early + SLACK[kind]:
+            grown.append('%s %d -> %d' % (kind, early, late))
+    return grown
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('examples', nargs='*', help='default: all of %s' % ', '.join(SOAK))
+    parser.add_argument('--hours', type=float, default=8, help='simulated hours')
+    parser.add_argument('--every', type=int, default=15, help='simulated minutes between counts')
+    parser.add_argument('--xvfb', action='store_true', help='always run under Xvfb')
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    minutes = max(args.every * 2, round(args.hours * 60))
+    if args.run:
+        return run(args.run, minutes, args.every)
+
+    server = xvfb() if args.xvfb or not os.environ.get('DISPLAY') else None
+    failed = False
+    try:
+        for name in args.examples or SOAK:
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--run', name,
+                                   '--hours', str(args.hours), '--every', str(args.every)],
+                                  capture_output=True, text=True)
+            lines = proc.stdout.strip().splitlines()
+            if proc.returncode or not lines:
+                print('%-12s FAILED\n%s' % (name, proc.stderr.strip()))
+                failed = True
+                continue
+            results = json.loads(lines[-1])
+            last = results['samples'][-1]
+            grown = unbounded(results)
+            print('%-12s %s after %d minutes: %s' %
+                  (name, 'GROWING' if grown else 'ok', last['minute'],
+                   ', '.join('%s %d' % (kind, last.get(kind, 0)) for kind in ('tcl', 'command', 'trace', 'after', 'items'))))
+            if grown:
+                failed = True
+                print('    ' + '; '.join(grown))
+                for line in results['growth']:
+                    print('    ' + line)
+    finally:
+        if server:
+            server.terminate()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# Measure how long finishing a stroke (the mouse release) takes as the
+# drawing grows, comparing the original sketch3/sketch4 approach (retag
+# every 'currentline' item ever drawn) with the per-stroke StrokeList.
+#
+#   python strokebench.py [--strokes 10000] [--points 20] [--modes tag,registry]
+#
+# Prints the median and worst release latency for each block of strokes;
+# with StrokeList the numbers should stay flat as the drawing grows.
+
+from tkinter import *
+import argparse
+import random
+import statistics
+import time
+from strokes import Stroke, StrokeList
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--strokes', type=int, default=10000)
+parser.add_argument('--points', type=int, default=20, help='motion events per stroke')
+parser.add_argument('--block', type=int, default=1000)
+parser.add_argument('--modes', default='tag,registry')
+args = parser.parse_args()
+
+root = Tk()
+
+def run(mode):
+    canvas = Canvas(root, width=800, height=600)
+    canvas.grid(column=0, row=0)
+    root.update()
+    strokes = StrokeList(canvas, width=5)
+    rnd = random.Random(1)
+    block = []
+    print('%s:' % mode)
+    print('%8s %12s %12s' % ('strokes', 'median us', 'max us'))
+    for n in range(1, args.strokes + 1):
+        x, y = rnd.randrange(800), rnd.randrange(600)
+        if mode == 'tag':
+            stroke = Stroke(canvas, x, y, width=5, tags='currentline')
+        else:
+            stroke = strokes.begin(x, y)
+        for i in range(args.points):
+            x, y = x + rnd.randint(-4, 4), y + rnd.randint(-4, 4)
+            stroke.add(x, y)
+        start = time.perf_counter()
+        if mode == 'tag':
+            stroke.finish()
+            canvas.itemconfigure('currentline', width=1)
+        else:
+            strokes.finish(width=1)
+        block.append(time.perf_counter() - start)
+        if n % args.block == 0:
+            print('%8d %12.1f %12.1f' % (n, statistics.median(block) * 1e6, max(block) * 1e6), flush=True)
+            block = []
+            root.update()
+    canvas.destroy()
+
+for mode in args.modes.split(','):
+    run(mode)
+root.destroy()
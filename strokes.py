@@ -0,0 +1,249 @@
+# Helpers for drawing freehand strokes on a canvas.
+#
+# Creating a separate two-point line item for every mouse motion event
+# quickly leaves tens of thousands of items on the canvas.  A Stroke
+# instead creates one line item when the gesture starts, and appends each
+# new point to that same item in place using the canvas "insert" command.
+
+from math import hypot
+
+
+# Ramer-Douglas-Peucker simplification: keep only the points that deviate
+# more than 'tolerance' from the line joining their neighbours.
+def simplify(coords, tolerance):
+    n = len(coords) // 2
+    if n < 3:
+        return list(coords)
+    keep = bytearray(n)
+    keep[0] = keep[n-1] = 1
+    pending = [(0, n-1)]
+    while pending:
+        first, last = pending.pop()
+        x1, y1 = coords[2*first], coords[2*first+1]
+        dx, dy = coords[2*last] - x1, coords[2*last+1] - y1
+        norm = hypot(dx, dy)
+        worst, index = tolerance, -1
+        for i in range(first+1, last):
+            px, py = coords[2*i] - x1, coords[2*i+1] - y1
+            d = abs(dy*px - dx*py) / norm if norm else hypot(px, py)
+            if d > worst:
+                worst, index = d, i
+        if index >= 0:
+            keep[index] = 1
+            pending.append((first, index))
+            pending.append((index, last))
+    return [c for i in range(n) if keep[i] for c in (coords[2*i], coords[2*i+1])]
+
+
+# One press-drag-release gesture, drawn as a single growing polyline.
+# Points closer than 'mindist' to the previous one are skipped while
+# drawing; 'tolerance' simplifies the finished line when it is released.
+class Stroke:
+    def __init__(self, canvas, x, y, mindist=0, tolerance=0, **options):
+        self.canvas = canvas
+        self.id = None
+        self.coords = [x, y]
+        self.mindist = mindist
+        self.tolerance = tolerance
+        self.options = options
+        self.item = None
+        self.skipped = None
+
+    def add(self, x, y):
+        if self.mindist and hypot(x - self.coords[-2], y - self.coords[-1]) < self.mindist:
+            self.skipped = (x, y)
+            return
+        self.skipped = None
+        self.coords += (x, y)
+        if self.item is None:
+            self.item = self.canvas.create_line(self.coords, **self.options)
+        else:
+            self.canvas.insert(self.item, 'end', (x, y))
+
+    def finish(self):
+        if self.skipped is not None:
+            mindist, self.mindist = self.mindist, 0
+            self.add(*self.skipped)
+            self.mindist = mindist
+        if self.item is not None and self.tolerance and len(self.coords) > 4:
+            self.coords = simplify(self.coords, self.tolerance)
+            self.canvas.coords(self.item, self.coords)
+
+    # Bounding box of the stroke, including its line width.
+    def bounds(self):
+        xs, ys = self.coords[0::2], self.coords[1::2]
+        pad = float(self.options.get('width', 1)) / 2 + 1
+        return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
+
+    # Recreate the line item from the saved coordinates (e.g. on redo), or
+    # reuse a hidden line item handed back earlier by erase(recycle=True).
+    def draw(self, item=None):
+        if self.item is not None or len(self.coords) < 4:
+            return
+        if item is None:
+            self.item = self.canvas.create_line(self.coords, **self.options)
+        else:
+            self.canvas.coords(item, self.coords)
+            self.canvas.itemconfigure(item, state='normal', **self.options)
+            self.item = item
+
+    def erase(self, recycle=False):
+        item, self.item = self.item, None
+        if item is not None and recycle:
+            self.canvas.itemconfigure(item, state='hidden', tags='')
+            return item
+        if item is not None:
+            self.canvas.delete(item)
+
+    def configure(self, **options):
+        self.options.update(options)
+        if self.item is not None:
+            self.canvas.itemconfigure(self.item, **options)
+
+
+# A registry of all the strokes drawn on a canvas.  Every stroke gets its
+# own id and a 'stroke<id>' tag, and every operation below addresses just
+# that stroke's canvas item by its item id (which Tk looks up in a hash
+# table, unlike tag names, which it matches by scanning every item).  So
+# finishing, recoloring, deleting, undoing or redoing a stroke costs the
+# same no matter how much has already been drawn.
+#
+# Functions added to 'watchers' are called as watcher(event, stroke)
+# whenever a stroke is 'added' to the drawing (finished, or brought back
+# by undo/redo), 'removed' from it, or 'changed'.
+class StrokeList:
+    def __init__(self, canvas, **defaults):
+        self.canvas = canvas
+        self.defaults = defaults
+        self.strokes = {}
+        self.items = {}
+        self.current = None
+        self.lastid = 0
+        self.done = []
+        self.undone = []
+        self.watchers = []
+
+    def __len__(self):
+        return len(self.strokes)
+
+    def __iter__(self):
+        return iter(self.strokes.values())
+
+    def begin(self, x, y, **options):
+        self.lastid += 1
+        options = dict(self.defaults, **options)
+        options['tags'] = _tags(options.get('tags')) + ('stroke%d' % self.lastid,)
+        self.current = Stroke(self.canvas, x, y, **options)
+        self.current.id = self.lastid
+        return self.current
+
+    def add(self, x, y):
+        if self.current is not None:
+            self.current.add(x, y)
+
+    # Finish the stroke in progress, applying any final item options
+    # (such as a thinner width) to it alone.
+    def finish(self, **options):
+        stroke, self.current = self.current, None
+        if stroke is None:
+            return None
+        stroke.finish()
+        if stroke.item is None:
+            return None
+        if options:
+            stroke.configure(**options)
+        self._insert(stroke)
+        self._record(('add', stroke))
+        return stroke
+
+    # Add an already complete stroke, e.g. one loaded from a file; with
+    # draw=False no canvas item is created for it until restore() is called.
+    def append(self, coords, draw=True, **options):
+        self.lastid += 1
+        options = dict(self.defaults, **options)
+        options['tags'] = _tags(options.get('tags')) + ('stroke%d' % self.lastid,)
+        stroke = Stroke(self.canvas, coords[0], coords[1], **options)
+        stroke.id = self.lastid
+        stroke.coords = list(coords)
+        if draw:
+            stroke.draw()
+        self._insert(stroke)
+        return stroke
+
+    def find(self, item):
+        return self.items.get(item)
+
+    # Drop the stroke's canvas item while keeping the stroke itself in the
+    # drawing, e.g. once it has been rendered some other way or scrolled
+    # out of sight.  With recycle=True the item is hidden and returned
+    # rather than deleted, so it can be handed to restore() later.
+    def release(self, stroke, recycle=False):
+        self.items.pop(stroke.item, None)
+        return stroke.erase(recycle)
+
+    def restore(self, stroke, item=None):
+        stroke.draw(item)
+        if stroke.item is not None:
+            self.items[stroke.item] = stroke
+
+    def recolor(self, stroke, color):
+        self._record(('recolor', stroke, stroke.options.get('fill', 'black'), color))
+        self._configure(stroke, fill=color)
+
+    def delete(self, stroke):
+        self._remove(stroke)
+        self._record(('delete', stroke))
+
+    def undo(self):
+        if self.done:
+            action = self.done.pop()
+            self._apply(action, undo=True)
+            self.undone.append(action)
+
+    def redo(self):
+        if self.undone:
+            action = self.undone.pop()
+            self._apply(action, undo=False)
+            self.done.append(action)
+
+    def _record(self, action):
+        self.done.append(action)
+        self.undone.clear()
+
+    def _apply(self, action, undo):
+        kind, stroke = action[0], action[1]
+        if kind == 'recolor':
+            self._configure(stroke, fill=action[2] if undo else action[3])
+        elif (kind == 'add') == undo:
+            self._remove(stroke)
+        else:
+            stroke.draw()
+            self._insert(stroke)
+
+    def _configure(self, stroke, **options):
+        stroke.configure(**options)
+        self._notify('changed', stroke)
+
+    def _insert(self, stroke):
+        self.strokes[stroke.id] = stroke
+        if stroke.item is not None:
+            self.items[stroke.item] = stroke
+        self._notify('added', stroke)
+
+    def _remove(self, stroke):
+        self.strokes.pop(stroke.id, None)
+        self.items.pop(stroke.item, None)
+        stroke.erase()
+        self._notify('removed', stroke)
+
+    def _notify(self, event, stroke):
+        for watcher in self.watchers:
+            watcher(event, stroke)
+
+
+def _tags(tags):
+    if tags is None:
+        return ()
+    if isinstance(tags, str):
+        return (tags,)
+    return tuple(tags)
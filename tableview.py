@@ -0,0 +1,193 @@
+# A sortable, multi-column table that stays fast with hundreds of
+# thousands of rows.
+#
+# Like VirtualListbox, a VirtualTable only holds the rows currently on
+# screen: its Treeview contains one item per visible row, and scrolling or
+# sorting just gives those items new values, without deleting or
+# inserting anything.  Clicking a column heading sorts by that column
+# (clicking again reverses the order).  The sort order for each column is
+# computed once, as an array of row numbers, and kept until the data
+# changes (call invalidate()); reversing just reads the same array
+# backwards.
+#
+# Selected rows are remembered by row number, so the selection survives
+# scrolling and sorting.  The <<TableSelect>> event is generated on the
+# table whenever the selection changes.
+
+from tkinter import *
+from tkinter import ttk
+from array import array
+
+
+# value(row) gives the column's value for a row, format(value) the text
+# shown for it, and key(row), if given, what to sort on instead of value.
+class Column:
+    def __init__(self, name, heading, value, format=str, key=None, anchor='w', width=120):
+        self.name, self.heading, self.value = name, heading, value
+        self.format, self.key = format, key or value
+        self.anchor, self.width = anchor, width
+
+
+class VirtualTable(ttk.Frame):
+    def __init__(self, parent, count, columns, height=20, selectmode='browse'):
+        super().__init__(parent)
+        self.count = count
+        self.columns = columns
+        self.rows = height
+        self.top = 0
+        self.orders = {}
+        self.ranks = {}
+        self.sortby = None
+        self.reverse = False
+        self.selected = set()
+        self.clicked = False
+        self.tree = ttk.Treeview(self, columns=[c.name for c in columns], show='headings',
+                                 height=height, selectmode=selectmode)
+        for c in columns:
+            self.tree.heading(c.name, text=c.heading, command=lambda name=c.name: self.sort(name))
+            self.tree.column(c.name, anchor=c.anchor, width=c.width)
+        self.ids = [self.tree.insert('', 'end') for i in range(height)]
+        self.attached = height
+        self.ys = ttk.Scrollbar(self, orient=VERTICAL, command=self.yview)
+        self.tree.grid(column=0, row=0, sticky=(N,W,E,S))
+        self.ys.grid(column=1, row=0, sticky=(N,S))
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.tree.bind('<<TreeviewSelect>>', self._sync)
+        self.tree.bind('<Button-1>', self._clicked)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-e.delta // 120 * 3))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+        self.tree.bind('<Up>', lambda e: self._step(-1))
+        self.tree.bind('<Down>', lambda e: self._step(1))
+        self.tree.bind('<Prior>', lambda e: self.scroll(-self.rows))
+        self.tree.bind('<Next>', lambda e: self.scroll(self.rows))
+        self.render()
+
+    # The data has changed (possibly its length too): forget cached sort
+    # orders and redraw.
+    def invalidate(self, count=None):
+        if count is not None:
+            self.count = count
+            self.selected = {r for r in self.selected if r < count}
+        self.orders.clear()
+        self.ranks.clear()
+        if self.sortby is not None:
+            self.orders[self.sortby] = self._order(self.sortby)
+        self.top = max(0, min(self.top, self.count - self.rows))
+        self.render()
+
+    def _order(self, name):
+        if name not in self.orders:
+            key = next(c for c in self.columns if c.name == name).key
+            self.orders[name] = array('l', sorted(range(self.count), key=key))
+        return self.orders[name]
+
+    def sort(self, name):
+        self.reverse = not self.reverse if name == self.sortby else False
+        self.sortby = name
+        self._order(name)
+        for c in self.columns:
+            mark = (' ▼' if self.reverse else ' ▲') if c.name == name else ''
+            self.tree.heading(c.name, text=c.heading + mark)
+        self.render()
+
+    # Row number of the record shown at a given position.
+    def record(self, position):
+        if self.sortby is None:
+            return position
+        order = self.orders[self.sortby]
+        return order[self.count - 1 - position] if self.reverse else order[position]
+
+    # And the reverse, using the inverse of the sort order (built on
+    # first use, and cached like the order itself).
+    def position(self, record):
+        if self.sortby is None:
+            return record
+        if self.sortby not in self.ranks:
+            rank = array('l', [0]) * self.count
+            for position, r in enumerate(self.orders[self.sortby]):
+                rank[r] = position
+            self.ranks[self.sortby] = rank
+        position = self.ranks[self.sortby][record]
+        return self.count - 1 - position if self.reverse else position
+
+    def render(self):
+        shown = max(0, min(self.rows, self.count - self.top))
+        for k in range(shown, self.attached):
+            self.tree.detach(self.ids[k])
+        for k in range(self.attached, shown):
+            self.tree.move(self.ids[k], '', k)
+        self.attached = shown
+        visible = []
+        for k in range(shown):
+            r = self.record(self.top + k)
+            self.tree.item(self.ids[k], values=[c.format(c.value(r)) for c in self.columns])
+            if r in self.selected:
+                visible.append(self.ids[k])
+        # Only if it's different: setting it generates <<TreeviewSelect>>.
+        if set(visible) != set(self.tree.selection()):
+            self.tree.selection_set(visible)
+        total = max(self.count, 1)
+        self.ys.set(self.top / total, min(1.0, (self.top + self.rows) / total))
+
+    def curselection(self):
+        return tuple(sorted(self.selected))
+
+    def selection_set(self, records):
+        self.selected = set(records)
+        self.render()
+        self.event_generate('<<TableSelect>>')
+
+    def see(self, record):
+        position = self.position(record)
+        if not self.top <= position < self.top + self.rows:
+            self.goto(position - self.rows // 2)
+
+    def goto(self, position):
+        self.top = max(0, min(position, self.count - self.rows))
+        self.render()
+
+    def scroll(self, amount):
+        self.goto(self.top + amount)
+        return 'break'
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.goto(int(float(args[1]) * self.count))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self.scroll(amount * self.rows if args[2] == 'pages' else amount)
+
+    def _step(self, amount):
+        if self.count:
+            idxs = self.curselection()
+            position = self.position(idxs[0]) + amount if idxs else 0
+            record = self.record(max(0, min(position, self.count - 1)))
+            self.selection_set([record])
+            self.see(record)
+        return 'break'
+
+    # A click without Shift or Control replaces the whole selection in
+    # 'extended' mode, not just the part that's visible.
+    def _clicked(self, event):
+        self.clicked = not event.state & 0x5
+
+    # The Treeview selection changed; it only knows about visible rows, so
+    # update our selection for just those.
+    def _sync(self, event):
+        chosen = set(self.tree.selection())
+        selected = set(self.selected)
+        mode = str(self.tree['selectmode'])
+        if chosen and (mode == 'browse' or (mode == 'extended' and self.clicked)):
+            selected.clear()
+        self.clicked = False
+        for k in range(self.attached):
+            r = self.record(self.top + k)
+            if self.ids[k] in chosen:
+                selected.add(r)
+            else:
+                selected.discard(r)
+        if selected != self.selected:
+            self.selected = selected
+            self.event_generate('<<TableSelect>>')
@@ -0,0 +1,107 @@
+# Check that the user interface stays responsive while a CPU-heavy job
+# runs, by measuring how late after(0) callbacks fire in the meantime.
+#
+#   python taskbench.py [--mode threads|processes|blocking] [--jobs 1]
+#                       [--work 2000000] [--budget 50]
+#
+# 'blocking' runs the job in steps from the event loop, the way
+# longrunning.py used to.  Exits with status 1 if the worst latency seen
+# exceeds --budget milliseconds.
+
+from tkinter import *
+from tkinter import ttk
+import argparse
+import statistics
+import sys
+import time
+from tasks import TaskRunner
+
+
+# Pure-Python busywork, reporting progress far more often than anyone
+# could see it.
+def crunch(control, n, steps=1000):
+    total = 0
+    for step in range(steps):
+        if control.cancelled():
+            return None
+        for i in range(step * n // steps, (step + 1) * n // steps):
+            total += i * i % 7
+        control.progress(step + 1)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mode', choices=('threads', 'processes', 'blocking'), default='threads')
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--work', type=int, default=2000000)
+    parser.add_argument('--budget', type=float, default=50, help='max latency, ms')
+    args = parser.parse_args()
+
+    root = Tk()
+    bars = [ttk.Progressbar(root, length=300, maximum=1000) for i in range(args.jobs)]
+    for bar in bars:
+        bar.pack(padx=5, pady=5)
+    latencies = []
+    updates = [0]
+    remaining = [args.jobs]
+    running = [True]
+
+    def probe():
+        scheduled = time.perf_counter()
+        def fired():
+            latencies.append(time.perf_counter() - scheduled)
+            if running[0]:
+                root.after(1, probe)
+        root.after(0, fired)
+
+    def progress(bar, value):
+        updates[0] += 1
+        bar['value'] = value
+
+    def done(result):
+        remaining[0] -= 1
+        if not remaining[0]:
+            running[0] = False
+            root.after(50, root.destroy)
+
+    def blocking(bar, step=0, total=0, steps=1000):
+        n = args.work
+        for i in range(step * n // steps, (step + 1) * n // steps):
+            total += i * i % 7
+        progress(bar, step + 1)
+        if step + 1 < steps:
+            root.after(1, blocking, bar, step + 1, total)
+        else:
+            done(total)
+
+    runner = None
+    if args.mode == 'blocking':
+        for bar in bars:
+            root.after(10, blocking, bar)
+    else:
+        runner = TaskRunner(root, workers=args.jobs, processes=args.mode == 'processes')
+        for bar in bars:
+            runner.submit(crunch, args.work, done=done,
+                          progress=lambda value, bar=bar: progress(bar, value))
+    start = time.perf_counter()
+    root.after(10, probe)
+    root.mainloop()
+    elapsed = time.perf_counter() - start
+    if runner:
+        runner.shutdown()
+
+    ms = sorted(l * 1000 for l in latencies)
+    worst = ms[-1] if ms else 0
+    print('mode %s, %d job(s): %.2f s, %d progress updates (%d reported)' %
+          (args.mode, args.jobs, elapsed, updates[0], args.jobs * 1000))
+    if ms:
+        print('after(0) latency: %d probes, median %.2f ms, p99 %.2f ms, max %.2f ms' %
+              (len(ms), statistics.median(ms), ms[int(len(ms) * 0.99) - 1], worst))
+    if worst > args.budget:
+        print('FAIL: max latency %.1f ms exceeds budget of %.1f ms' % (worst, args.budget))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# Run long operations off the Tk thread.
+#
+# A TaskRunner hands jobs to a pool of worker threads (or processes, for
+# CPU-heavy pure-Python work that would otherwise compete with the user
+# interface for the interpreter lock).  A job is a function taking a
+# Control as its first argument; it calls control.progress(value) as it
+# goes, and should check control.cancelled() regularly and return early if
+# it's set.
+#
+# Progress reports and results are posted to a queue, which the runner
+# drains on the Tk thread once per frame while any job is running.  Only
+# the latest progress value of each job is passed on, so a job reporting
+# thousands of times a second still causes at most one update per frame.
+# Several jobs can run at once.
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import itertools
+import multiprocessing
+import queue
+import threading
+import sys
+
+
+class Control:
+    def __init__(self, id, queue, event):
+        self.id, self.queue, self.event = id, queue, event
+
+    def progress(self, value):
+        self.queue.put((self.id, 'progress', value))
+
+    def cancelled(self):
+        return self.event.is_set()
+
+
+class Job:
+    def __init__(self, control, future, progress, done, error=None):
+        self.control, self.future = control, future
+        self.onprogress, self.ondone, self.onerror = progress, done, error
+
+    # Too late once the job has finished: its result stands.
+    def cancel(self):
+        if not self.future.done():
+            self.control.event.set()
+            self.future.cancel()
+
+
+class TaskRunner:
+    def __init__(self, root, workers=None, processes=False, interval=16):
+        self.root = root
+        self.interval = interval
+        if processes:
+            self.manager = multiprocessing.Manager()
+            self.queue = self.manager.Queue()
+            self.newevent = self.manager.Event
+            self.executor = ProcessPoolExecutor(workers)
+        else:
+            self.queue = queue.SimpleQueue()
+            self.newevent = threading.Event
+            self.executor = ThreadPoolExecutor(workers)
+        self.ids = itertools.count(1)
+        self.jobs = {}
+        self.ticking = False
+
+    # Start fn(control, *args) on a worker.  progress(value) and
+    # done(result) are then called on the Tk thread; a cancelled job's
+    # result is None.  If the job raises an exception, it's passed to
+    # error(exception) instead of done, or without an error function,
+    # reported as for any callback and done(None) called.
+    def submit(self, fn, *args, progress=None, done=None, error=None):
+        control = Control(next(self.ids), self.queue, self.newevent())
+        future = self.executor.submit(fn, control, *args)
+        job = self.jobs[control.id] = Job(control, future, progress, done, error)
+        future.add_done_callback(lambda f: self.queue.put((control.id, 'done', None)))
+        if not self.ticking:
+            self.ticking = True
+            self.root.after(self.interval, self.tick)
+        return job
+
+    def tick(self):
+        latest, finished = {}, []
+        while True:
+            try:
+                id, kind, value = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                latest[id] = value
+            else:
+                finished.append(id)
+        for id, value in latest.items():
+            job = self.jobs.get(id)
+            if job and job.onprogress and not job.control.cancelled():
+                job.onprogress(value)
+        for id in finished:
+            job = self.jobs.pop(id, None)
+            if job:
+                self._finish(job)
+        if self.jobs:
+            self.root.after(self.interval, self.tick)
+        else:
+            self.ticking = False
+
+    def _finish(self, job):
+        result = None
+        if not job.future.cancelled():
+            try:
+                result = job.future.result()
+            except Exception as e:
+                if job.onerror:
+                    job.onerror(e)
+                    return
+                self.root.report_callback_exception(*sys.exc_info())
+        if job.control.cancelled():
+            result = None
+        if job.ondone:
+            job.ondone(result)
+
+    def shutdown(self):
+        for job in self.jobs.values():
+            job.cancel()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,157 @@
+# Load big documents into a Text widget without freezing the window.
+#
+# Inserting a whole large file in one go blocks the event loop until Tk has
+# taken it all in.  A StreamLoader instead reads the file in fixed-size
+# chunks (from a generator) and inserts one chunk each time Tk is idle, so
+# the window appears, repaints and responds to the user throughout.  It
+# reports progress as a fraction, and can be cancelled.
+#
+# Tagging, such as syntax coloring, is the other thing that gets expensive
+# with a lot of text.  A LazyTagger only tags what's on screen straight
+# away; the rest is done a block of lines at a time when Tk is idle,
+# working outward from the visible region, and whatever is scrolled into
+# view is tagged first.
+
+import codecs
+import io
+import os
+
+
+# The text of a file, decoded as open() in text mode would, as pairs of a
+# chunk and how many bytes of the file have been read so far.  Progress
+# comes from the bytes, since the text can be shorter (line endings) or
+# longer (replaced invalid bytes) than the file.
+def _read(path, size, encoding):
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(errors='replace'), True)
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(size)
+            chunk = decoder.decode(data, final=not data)
+            if chunk:
+                yield chunk, f.tell()
+            if not data:
+                return
+
+
+def chunks(path, size=1 << 16, encoding='utf-8'):
+    for chunk, offset in _read(path, size, encoding):
+        yield chunk
+
+
+class StreamLoader:
+    # source is a filename or any iterable of strings.  progress(fraction)
+    # is called after each chunk, done(complete) at the end, with False
+    # if it was cancelled.
+    def __init__(self, text, source, chunksize=1 << 16, progress=None, done=None, tagger=None):
+        self.text = text
+        self.progress, self.done, self.tagger = progress, done, tagger
+        if isinstance(source, (str, os.PathLike)):
+            self.total = os.path.getsize(source) or 1
+            source = _read(source, chunksize, 'utf-8')
+        else:
+            self.total = None
+        self.chunks = iter(source)
+        self.loaded = 0
+        self.finished = False
+        self.pending = text.after_idle(self.tick)
+
+    def tick(self):
+        try:
+            if self.total:
+                chunk, self.loaded = next(self.chunks)
+            else:
+                chunk = next(self.chunks)
+                self.loaded += len(chunk)
+        except StopIteration:
+            self._finish(True)
+            return
+        state = self.text['state']
+        self.text['state'] = 'normal'
+        self.text.insert('end', chunk)
+        self.text['state'] = state
+        if self.tagger:
+            self.tagger.grown()
+        if self.progress and self.total:
+            self.progress(min(1.0, self.loaded / self.total))
+        self.pending = self.text.after_idle(self.tick)
+
+    def cancel(self):
+        if not self.finished:
+            self.text.after_cancel(self.pending)
+            self._finish(False)
+
+    def _finish(self, complete):
+        self.finished = True
+        self.pending = None
+        close = getattr(self.chunks, 'close', None)
+        if close:
+            close()
+        if self.done:
+            self.done(complete)
+
+
+# tag(text, first, last) should tag lines first..last-1 (numbered from 1).
+class LazyTagger:
+    def __init__(self, text, tag, block=200):
+        self.text, self.tag, self.block = text, tag, block
+        self.tagged = set()
+        self.pending = None
+        self.count = self.lines()
+        # Watch for scrolling by sitting in front of the existing
+        # yscrollcommand (so set that up first).
+        self.yscroll = text.tk.splitlist(text['yscrollcommand'])
+        text['yscrollcommand'] = self._scrolled
+
+    def _scrolled(self, first, last):
+        if self.yscroll:
+            self.text.tk.call(*self.yscroll, first, last)
+        self.visible()
+
+    def lines(self):
+        return int(self.text.index('end - 1 char').split('.')[0])
+
+    def view(self):
+        first = int(self.text.index('@0,0').split('.')[0])
+        last = int(self.text.index('@0,%d' % self.text.winfo_height()).split('.')[0])
+        return first, last
+
+    # More text has been added at the end; the last block may have been
+    # tagged while it was incomplete.
+    def grown(self):
+        self.tagged.discard((self.count - 1) // self.block)
+        self.count = self.lines()
+        self._schedule()
+
+    def visible(self):
+        first, last = self.view()
+        for b in range((first - 1) // self.block, (last - 1) // self.block + 1):
+            self._tag(b)
+        self._schedule()
+
+    def _tag(self, b):
+        if b in self.tagged:
+            return False
+        self.tagged.add(b)
+        first = b * self.block + 1
+        self.tag(self.text, first, min(first + self.block, self.lines() + 1))
+        return True
+
+    def _schedule(self):
+        if not self.pending:
+            self.pending = self.text.after_idle(self._spread)
+
+    # Tag the untagged block nearest the visible region.
+    def _spread(self):
+        self.pending = None
+        blocks = (self.lines() - 1) // self.block + 1
+        first, last = self.view()
+        below, above = (last - 1) // self.block + 1, (first - 1) // self.block - 1
+        while below < blocks or above >= 0:
+            if below < blocks and self._tag(below):
+                break
+            if above >= 0 and self._tag(above):
+                break
+            below, above = below + 1, above - 1
+        else:
+            return
+        self._schedule()
@@ -0,0 +1,371 @@
+# Fast search in large (and growing) Text widgets.
+#
+# Text.search scans the text for each match, which is far too slow for
+# highlighting every hit in a big document.  A TextIndex instead keeps an
+# inverted index: for each word (case-folded), the positions where it
+# occurs, packed into an array in document order.  Lines are numbered
+# from the start of everything ever added, so text added at the end just
+# adds to the end of those arrays (carrying on from the line and column
+# where the last addition stopped, so it may arrive in arbitrary chunks),
+# and trimming lines off the top (as a LogView does) only moves the
+# index's idea of where the first line is; stale positions are skipped
+# with a binary search, and compacted away once they make up most of the
+# index.  Any other change marks the index stale from the first line it
+# touched, and that part is indexed again before the next search.
+#
+# Text added to a LogView is indexed automatically (it tells its
+# watchers about each insert and trim).  Any other Text widget is
+# followed by wrapping its widget command, so inserts, deletes and undo,
+# from the program or the user, all keep the index up to date.
+#
+# A Search uses the index to find all hits of a query (every word in it,
+# on lines containing all of them), highlights just those in the visible
+# part of the widget with a single tag_add, and moves between hits with a
+# binary search.
+
+from array import array
+from bisect import bisect_left, bisect_right
+import heapq
+import itertools
+import re
+from tkinter import TclError
+
+words = re.compile(r'\w+')
+
+# A position is packed into one integer, line then column, so sorting
+# positions sorts by line and column.  Words starting further along a line
+# than 2**COLBITS characters aren't indexed.  The length of each word isn't
+# kept: it's found again from the text itself when a hit is highlighted.
+COLBITS = 32
+SHIFT = COLBITS
+MAXCOL = (1 << COLBITS) - 1
+
+
+def pack(line, col=0):
+    return (line << SHIFT) | min(col, MAXCOL)
+
+
+def unpack(key):
+    return key >> SHIFT, key & MAXCOL
+
+
+class TextIndex:
+    def __init__(self, text=None):
+        self.postings = {}      # word -> array of packed positions
+        self.first = 0          # line number of the first line still present
+        self.line = 0           # line number of the last line
+        self.column = 0         # length of the last line so far
+        self.tail = None        # (word, key, column, text) of a word that ends the text
+        self.stale = None       # line from which the index must be rebuilt
+        self.compacted = 0      # value of first when last compacted
+        self.version = 0
+        self.watchers = []
+        self.text = text
+        self.pending = None
+        if text is not None:
+            self.rebuild(text)
+            if hasattr(text, 'watchers'):
+                text.watchers.append(self.update)
+            else:
+                self._watch(text)
+
+    def rebuild(self, text):
+        self.postings.clear()
+        self.first = self.line = self.column = self.compacted = 0
+        self.tail = self.stale = None
+        self._add(text.get('1.0', 'end - 1 char'))
+        self._changed()
+
+    # LogView watcher: it inserted some text at the end, or deleted lines
+    # from the top.
+    def update(self, event, value):
+        if event == 'inserted':
+            self.append(value)
+        elif event == 'deleted':
+            self.trim(value)
+
+    # Text added at the end, carrying on from the end of the last line.
+    def append(self, text):
+        if self.stale is None:
+            self._add(text)
+        self._changed()
+
+    def _add(self, text):
+        if not text:
+            return
+        postings, line, col = self.postings, self.line, self.column
+        finditer = words.finditer
+        # A word at the very end of what was indexed before may continue.
+        if self.tail and words.match(text):
+            word, key, col, before = self.tail
+            p = postings[word]
+            if p and p[-1] == key:
+                p.pop()
+                if not p:
+                    del postings[word]
+            text = before + text
+        self.tail = None
+        m = None
+        for n, content in enumerate(text.split('\n')):
+            if n:
+                line, col = line + 1, 0
+            base = line << SHIFT
+            m = None
+            for m in finditer(content):
+                start = col + m.start()
+                if start > MAXCOL:
+                    m = None
+                    break
+                key = base | start
+                word = m.group().casefold()
+                try:
+                    postings[word].append(key)
+                except KeyError:
+                    postings[word] = array('q', [key])
+        if m is not None and m.end() == len(content):
+            self.tail = (word, key, col + m.start(), m.group())
+        self.line, self.column = line, col + len(content)
+
+    def trim(self, lines):
+        self.first += lines
+        if self.first > self.line:
+            # Everything went: what's left is one empty line.
+            self.line, self.column, self.tail = self.first, 0, None
+        if self.stale is not None:
+            self.stale = max(self.stale, self.first)
+        if self.first - self.compacted > self.line + 1 - self.first:
+            self.compact()
+        self._changed()
+
+    # Lines from 'line' on have changed in some other way; they're indexed
+    # again the next time the index is searched.
+    def invalidate(self, line):
+        self.stale = line if self.stale is None else min(self.stale, line)
+        self._changed()
+
+    def refresh(self):
+        if self.stale is None or self.text is None:
+            return
+        line, self.stale = max(self.stale, self.first), None
+        cutoff = pack(line)
+        for word in list(self.postings):
+            p = self.postings[word]
+            del p[bisect_left(p, cutoff):]
+            if not p:
+                del self.postings[word]
+        self.line, self.column, self.tail = line, 0, None
+        self._add(self.text.get('%d.0' % (line - self.first + 1), 'end - 1 char'))
+        self.version += 1
+
+    def _changed(self):
+        self.version += 1
+        for watcher in self.watchers:
+            watcher()
+
+    # Follow every change made to a plain Text widget, whether by the
+    # program or by the user typing, by putting a Tcl procedure in place of
+    # its widget command.  Text added at the end is indexed straight away,
+    # lines deleted from the top are trimmed, and anything else marks the
+    # index stale from the first line affected.
+    def _watch(self, text):
+        w = str(text)
+        self.orig = w + '#indexed'
+        before, after = text.register(self._before), text.register(self._after)
+        text.tk.call('rename', w, self.orig)
+        text.tk.call('proc', w, 'args', """
+            if {[lindex $args 0] in {insert delete replace edit}} {
+                %s {*}$args
+                set result [uplevel 1 [list %s {*}$args]]
+                %s
+                return $result
+            }
+            uplevel 1 [list %s {*}$args]""" % (before, self.orig, after, self.orig))
+        text.bind('<Destroy>', lambda e: e.widget is text and text.tk.call('rename', w, ''), add=True)
+
+    def _lines(self):
+        return int(str(self.text.tk.call(self.orig, 'index', 'end - 1 char')).split('.')[0])
+
+    def _before(self, op, *args):
+        call = self.text.tk.call
+        self.pending = None
+        try:
+            if op == 'edit':
+                if args and args[0] in ('undo', 'redo'):
+                    self.pending = ('edit', 1)
+            elif self.stale is None and op == 'insert' and \
+                    self.text.tk.getboolean(call(self.orig, 'compare', args[0], '>=', 'end - 1 char')):
+                self.pending = ('insert', str(call(self.orig, 'index', 'end - 1 char')))
+            elif self.stale is None and op == 'delete' and len(args) == 2 and \
+                    str(call(self.orig, 'index', args[0])) == '1.0' and \
+                    str(call(self.orig, 'index', args[1])).endswith('.0'):
+                self.pending = ('trim', self._lines())
+            else:
+                indices = args[:1] if op == 'insert' else args[:2] if op == 'replace' else args
+                first = min(int(str(call(self.orig, 'index', a)).split('.')[0]) for a in indices)
+                self.pending = ('edit', first)
+        except TclError:
+            pass    # a bad index: the command itself will fail
+
+    def _after(self):
+        pending, self.pending = self.pending, None
+        if pending is None:
+            return
+        kind, value = pending
+        if kind == 'insert':
+            self.append(str(self.text.tk.call(self.orig, 'get', value, 'end - 1 char')))
+        elif kind == 'trim':
+            if self.text.tk.call(self.orig, 'index', 'end - 1 char') == '1.0':
+                self.trim(self.line + 1 - self.first)
+            elif value > self._lines():
+                self.trim(value - self._lines())
+        else:
+            self.invalidate(self.first + value - 1)
+
+    def compact(self):
+        cutoff = pack(self.first)
+        for word in list(self.postings):
+            p = self.postings[word]
+            start = bisect_left(p, cutoff)
+            if start == len(p):
+                del self.postings[word]
+            elif start:
+                del p[:start]
+        self.compacted = self.first
+
+    # The live positions of a word, as an array and the index of the
+    # first live one in it.
+    def positions(self, word):
+        p = self.postings.get(word.casefold())
+        if p is None:
+            return array('q'), 0
+        return p, bisect_left(p, pack(self.first))
+
+    # All hits for a query, as a sorted list (or array) of packed positions.
+    def find(self, query):
+        terms = sorted(set(w.casefold() for w in words.findall(query)))
+        if not terms:
+            return []
+        self.refresh()
+        found = [self.positions(w) for w in terms]
+        if len(found) == 1:
+            p, start = found[0]
+            return p[start:]
+        lines = None
+        for p, start in sorted(found, key=lambda f: len(f[0]) - f[1]):
+            these = {key >> SHIFT for key in p[start:]}
+            lines = these if lines is None else lines & these
+            if not lines:
+                return []
+        return list(heapq.merge(*[[key for key in p[start:] if key >> SHIFT in lines]
+                                  for p, start in found]))
+
+
+class Search:
+    def __init__(self, text, index, tag='found', current='current'):
+        self.text, self.index = text, index
+        self.tag, self.current = tag, current
+        self.query = ''
+        self.hits = []
+        self.version = None
+        self.position = None
+        text.tag_configure(tag, background='yellow')
+        text.tag_configure(current, background='orange')
+        text.tag_raise(current, tag)
+        # Re-highlight when scrolled, by sitting in front of the existing
+        # yscrollcommand (so set that up first).
+        self.yscroll = text.tk.splitlist(text['yscrollcommand'])
+        text['yscrollcommand'] = self._scrolled
+        self.pending = None
+        index.watchers.append(self._changed)
+
+    # Text added at the end is highlighted right away; after other edits
+    # (the user typing, say) wait for a pause before indexing again.
+    def _changed(self):
+        if not self.query:
+            return
+        if self.index.stale is None:
+            self.highlight()
+        elif self.pending is None:
+            self.pending = self.text.after(300, self._rehighlight)
+
+    def _rehighlight(self):
+        self.pending = None
+        self.highlight()
+
+    def _scrolled(self, first, last):
+        if self.yscroll:
+            self.text.tk.call(*self.yscroll, first, last)
+        self.highlight()
+
+    def find(self, query):
+        self.query = query
+        self.version = None
+        self.position = None
+        self.text.tag_remove(self.current, '1.0', 'end')
+        self.highlight()
+        return len(self._hits())
+
+    def _hits(self):
+        if self.version != self.index.version:
+            self.hits = self.index.find(self.query)
+            self.version = self.index.version
+        return self.hits
+
+    # Start and end indices of the hits at the given positions, all on the
+    # same line; the end is wherever the word starting there ends.
+    def _ranges(self, keys):
+        line, first = unpack(keys[0])
+        line += 1 - self.index.first
+        content = self.text.get('%d.%d' % (line, first), '%d.end' % line)
+        ranges = []
+        for key in keys:
+            col = key & MAXCOL
+            m = words.match(content, col - first)
+            ranges += ['%d.%d' % (line, col), '%d.%d' % (line, col + (len(m.group()) if m else 0))]
+        return ranges
+
+    def _index(self, key):
+        return tuple(self._ranges([key]))
+
+    def highlight(self):
+        self.text.tag_remove(self.tag, '1.0', 'end')
+        hits = self._hits()
+        if not hits:
+            return
+        first = int(self.text.index('@0,0').split('.')[0])
+        last = int(self.text.index('@0,%d' % self.text.winfo_height()).split('.')[0])
+        base = self.index.first - 1
+        lo = bisect_left(hits, pack(first + base))
+        hi = bisect_left(hits, pack(last + base + 1))
+        ranges = []
+        for line, keys in itertools.groupby(hits[lo:hi], lambda key: key >> SHIFT):
+            ranges += self._ranges(list(keys))
+        if ranges:
+            self.text.tag_add(self.tag, *ranges)
+
+    def next(self):
+        return self._go(1)
+
+    def prev(self):
+        return self._go(-1)
+
+    # Go to the next (or previous) hit after the current one, or after the
+    # insertion cursor, wrapping around at the ends.
+    def _go(self, direction):
+        hits = self._hits()
+        if not hits:
+            return None
+        if self.position is None or self.position < pack(self.index.first):
+            line, col = map(int, self.text.index('insert').split('.'))
+            here = pack(line - 1 + self.index.first, col)
+            i = bisect_left(hits, here) if direction > 0 else bisect_left(hits, here) - 1
+        else:
+            i = bisect_right(hits, self.position) if direction > 0 else bisect_left(hits, self.position) - 1
+        key = hits[i % len(hits)]
+        self.position = key
+        start, end = self._index(key)
+        self.text.tag_remove(self.current, '1.0', 'end')
+        self.text.tag_add(self.current, start, end)
+        self.text.mark_set('insert', start)
+        self.text.see(start)
+        return start
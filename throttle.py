@@ -0,0 +1,89 @@
+# Keep fast input from swamping the display.
+#
+# Motion events, Scale callbacks and the like can arrive far faster than
+# the screen refreshes, and if each one reconfigures a widget, the work
+# (and the Tcl calls behind it) piles up and the interface lags behind the
+# pointer.  A FrameScheduler collects such calls instead, keeping only the
+# latest arguments for each key, and runs them at most once per frame
+# (every `interval` milliseconds), as soon as Tk is idle.
+#
+#   frames = FrameScheduler(root)
+#
+#   @frames.throttle
+#   def moved(event): ...           # at most once a frame, latest event
+#
+#   @frames.debounce(300)
+#   def search(*args): ...          # once input has stopped for 300 ms
+#
+# The received and done counters say how many calls came in and how many
+# were actually run.
+
+import time
+
+
+class FrameScheduler:
+    def __init__(self, root, interval=16):
+        self.root = root
+        self.interval = interval
+        self.pending = {}
+        self.scheduled = None
+        self.last = 0
+        self.delayed = {}
+        self.received = 0
+        self.done = 0
+
+    # Arrange for fn(*args) to run at the next flush, replacing anything
+    # already waiting under the same key.
+    def post(self, key, fn, *args):
+        self.received += 1
+        self.pending[key] = (fn, args)
+        if not self.scheduled:
+            wait = self.interval - (time.perf_counter() - self.last) * 1000
+            if wait > 0:
+                self.scheduled = self.root.after(int(wait) + 1, self._idle)
+            else:
+                self.scheduled = self.root.after_idle(self.flush)
+
+    def _idle(self):
+        self.scheduled = self.root.after_idle(self.flush)
+
+    def flush(self):
+        self.scheduled = None
+        self.last = time.perf_counter()
+        pending, self.pending = self.pending, {}
+        for fn, args in pending.values():
+            fn(*args)
+            self.done += 1
+
+    def throttle(self, fn=None, key=None):
+        def wrap(fn):
+            def throttled(*args):
+                self.post(key or throttled, fn, *args)
+            return throttled
+        return wrap(fn) if fn else wrap
+
+    # Run fn only once calls have stopped arriving for `delay` ms.
+    def debounce(self, delay, key=None):
+        def wrap(fn):
+            def debounced(*args):
+                self.received += 1
+                k = key or debounced
+                if k in self.delayed:
+                    self.root.after_cancel(self.delayed[k])
+                self.delayed[k] = self.root.after(delay, self._fire, k, fn, args)
+            return debounced
+        return wrap
+
+    def _fire(self, key, fn, args):
+        del self.delayed[key]
+        fn(*args)
+        self.done += 1
+
+    def cancel(self):
+        if self.scheduled:
+            self.root.after_cancel(self.scheduled)
+            self.scheduled = None
+        for id in self.delayed.values():
+            self.root.after_cancel(id)
+        self.pending.clear()
+        self.delayed.clear()
@@ -0,0 +1,116 @@
+# Use asyncio alongside Tk.
+#
+# An AsyncTk runs an asyncio event loop in a background thread, so
+# coroutines can await sockets, subprocesses and asyncio.sleep() without
+# blocking the user interface, and without anything polling.  Tk itself
+# still runs as usual in the main thread, via mainloop().
+#
+# Coroutines must not touch widgets directly, since they run in another
+# thread.  Instead they hand calls to the Tk thread: call(fn, *args) just
+# queues one, while "await aio.tk(fn, *args)" also waits for its result.
+# Queued calls are picked up as soon as Tk notices a byte written to a
+# pipe it's watching (with createfilehandler), so there's no polling
+# delay.  Where file handlers aren't available (Windows), the queue is
+# checked with after() every `poll` milliseconds instead.
+#
+# From the Tk side, submit(coroutine, done) starts a coroutine on the
+# asyncio loop; done(result) is later called on the Tk thread.
+
+import asyncio
+from collections import deque
+import os
+import threading
+import tkinter
+
+
+class AsyncTk:
+    def __init__(self, root, poll=20):
+        self.root = root
+        self.poll = poll
+        self.calls = deque()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.pipe = None
+        if hasattr(root.tk, 'createfilehandler'):
+            self.pipe = os.pipe()
+            os.set_blocking(self.pipe[0], False)
+            os.set_blocking(self.pipe[1], False)
+            root.tk.createfilehandler(self.pipe[0], tkinter.READABLE, self._wake)
+        else:
+            self.pending = root.after(poll, self._check)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    # Start a coroutine on the asyncio loop (from the Tk thread).  Returns
+    # a concurrent.futures.Future, which can be cancelled.
+    def submit(self, coroutine, done=None):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        if done:
+            future.add_done_callback(lambda f: self.call(self._done, f, done))
+        return future
+
+    def _done(self, future, done):
+        if future.cancelled():
+            done(None)
+        elif future.exception():
+            e = future.exception()
+            self.root.report_callback_exception(type(e), e, e.__traceback__)
+            done(None)
+        else:
+            done(future.result())
+
+    # Run fn(*args) on the Tk thread, soon.  Safe to call from any thread.
+    def call(self, fn, *args):
+        self.calls.append((fn, args))
+        if self.pipe:
+            try:
+                os.write(self.pipe[1], b'\0')
+            except BlockingIOError:
+                pass    # pipe full, so Tk has a wakeup pending anyway
+
+    # Awaitable from a coroutine: run fn(*args) on the Tk thread and return
+    # its result.
+    async def tk(self, fn, *args):
+        future = self.loop.create_future()
+        def run():
+            try:
+                result = fn(*args)
+            except Exception as e:
+                self.loop.call_soon_threadsafe(future.set_exception, e)
+            else:
+                self.loop.call_soon_threadsafe(future.set_result, result)
+        self.call(run)
+        return await future
+
+    def _wake(self, fd, mask):
+        try:
+            os.read(fd, 4096)
+        except BlockingIOError:
+            pass
+        self._drain()
+
+    def _check(self):
+        self._drain()
+        self.pending = self.root.after(self.poll, self._check)
+
+    def _drain(self):
+        for i in range(len(self.calls)):
+            fn, args = self.calls.popleft()
+            try:
+                fn(*args)
+            except Exception as e:
+                self.root.report_callback_exception(type(e), e, e.__traceback__)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(1)
+        if self.pipe:
+            self.root.tk.deletefilehandler(self.pipe[0])
+            os.close(self.pipe[0])
+            os.close(self.pipe[1])
+            self.pipe = None
+        else:
+            self.root.after_cancel(self.pending)
@@ -0,0 +1,178 @@
+# Track down state that piles up in long-running Tk applications.
+#
+# Every Python function handed to Tk (by register, bind, tag_bind, after,
+# command= options, variable traces, ...) becomes a Tcl command that
+# lives until it's explicitly deleted, or its widget is destroyed.
+# Pending after() events and canvas items can build up in the same way.  Once enabled, a
+# LeakTracker notes where in the program (file and line, outside tkinter
+# itself) each Tcl command, variable trace and after() event was created,
+# and forgets it again when it's deleted, cancelled or has run.
+#
+# snapshot() counts what's still alive, by kind and call site, along with
+# the item count of every canvas; comparing two snapshots, as with
+# tracemalloc, shows what has grown in between, and where it came from:
+#
+#   tracker = tkleaks.enable()
+#   before = tracker.snapshot()
+#   ...
+#   for diff in tracker.snapshot().compare_to(before)[:10]:
+#       print(diff)
+#
+# See soak.py for running the examples for a long time to look for growth.
+
+import os
+import sys
+import tkinter
+from collections import Counter
+
+TKINTER = os.path.dirname(tkinter.__file__)
+HERE = os.path.abspath(__file__)
+
+
+def callsite(depth=1):
+    frame = sys._getframe(2)
+    sites = []
+    while frame and len(sites) < depth:
+        filename = frame.f_code.co_filename
+        if not filename.startswith(TKINTER) and os.path.abspath(filename) != HERE:
+            sites.append('%s:%d' % (os.path.basename(filename), frame.f_lineno))
+        frame = frame.f_back
+    return ' <- '.join(sites) or '?'
+
+
+class Diff:
+    def __init__(self, kind, site, count, diff):
+        self.kind, self.site, self.count, self.diff = kind, site, count, diff
+
+    def __str__(self):
+        return '%-8s %-40s %+6d (now %d)' % (self.kind, self.site, self.diff, self.count)
+
+    __repr__ = __str__
+
+
+class Snapshot:
+    def __init__(self, counts, totals):
+        self.counts = counts    # Counter of (kind, site)
+        self.totals = totals    # dict of kind -> number alive
+
+    # What has grown (or shrunk) since an older snapshot, biggest growth first.
+    def compare_to(self, old):
+        keys = set(self.counts) | set(old.counts)
+        diffs = [Diff(kind, site, self.counts[kind, site], self.counts[kind, site] - old.counts[kind, site])
+                 for kind, site in keys]
+        return sorted((d for d in diffs if d.diff), key=lambda d: (-d.diff, d.kind, d.site))
+
+
+class LeakTracker:
+    def __init__(self, depth=1):
+        self.depth = depth
+        self.commands = {}      # Tcl command name -> site
+        self.traces = {}        # variable trace command name -> site
+        self.afters = {}        # after id -> site
+        self.canvases = {}      # canvas path -> (canvas, site)
+        self.original = None
+        self.root = None
+
+    def enable(self):
+        if self.original is not None:
+            return self
+        misc = tkinter.Misc
+        self.original = (misc._register, misc.deletecommand, misc.after, misc.after_cancel,
+                         tkinter.Canvas.__init__, tkinter.Variable._register)
+        register, deletecommand, after, after_cancel, canvas_init, trace = self.original
+        tracker = self
+
+        def _register(widget, func, subst=None, needcleanup=1):
+            name = register(widget, func, subst, needcleanup)
+            tracker.commands[name] = callsite(tracker.depth)
+            tracker.root = tracker.root or widget._root()
+            return name
+
+        def trace_(variable, callback):
+            name = trace(variable, callback)
+            tracker.traces[name] = callsite(tracker.depth)
+            tracker.root = tracker.root or variable._root
+            return name
+
+        def deletecommand_(widget, name):
+            tracker.commands.pop(name, None)
+            return deletecommand(widget, name)
+
+        def after_(widget, ms, func=None, *args):
+            id = after(widget, ms, func, *args)
+            if id:
+                tracker.afters[id] = callsite(tracker.depth)
+            return id
+
+        def after_cancel_(widget, id):
+            tracker.afters.pop(id, None)
+            return after_cancel(widget, id)
+
+        def canvas_init_(canvas, master=None, cnf={}, **kw):
+            canvas_init(canvas, master, cnf, **kw)
+            tracker.canvases[canvas._w] = (canvas, callsite(tracker.depth))
+
+        misc._register = misc.register = _register
+        misc.deletecommand = deletecommand_
+        misc.after = after_
+        misc.after_cancel = after_cancel_
+        tkinter.Canvas.__init__ = canvas_init_
+        tkinter.Variable._register = trace_
+        return self
+
+    def disable(self):
+        if self.original is not None:
+            misc = tkinter.Misc
+            (misc._register, misc.deletecommand, misc.after, misc.after_cancel,
+             tkinter.Canvas.__init__, tkinter.Variable._register) = self.original
+            misc.register = misc._register
+            self.original = None
+
+    def snapshot(self):
+        counts = Counter()
+        totals = {}
+        if self.root is not None:
+            # Drop after events that have run (or were cancelled in Tcl),
+            # and commands deleted behind our back: destroying a widget or
+            # removing a trace deletes them with tk.deletecommand directly.
+            tk = self.root.tk
+            pending = set(tk.splitlist(tk.call('after', 'info')))
+            for id in [id for id in self.afters if id not in pending]:
+                del self.afters[id]
+            existing = set(tk.splitlist(tk.call('info', 'commands')))
+            for tracked in (self.commands, self.traces):
+                for name in [name for name in tracked if name not in existing]:
+                    del tracked[name]
+            totals['tcl'] = len(existing)
+        for site in self.commands.values():
+            counts['command', site] += 1
+        for site in self.traces.values():
+            counts['trace', site] += 1
+        for site in self.afters.values():
+            counts['after', site] += 1
+        items = 0
+        for path, (canvas, site) in list(self.canvases.items()):
+            try:
+                n = len(canvas.find_all())
+            except tkinter.TclError:    # destroyed
+                del self.canvases[path]
+                continue
+            counts['items', site] += n
+            items += n
+        totals.update(command=len(self.commands), trace=len(self.traces), after=len(self.afters), items=items)
+        return Snapshot(counts, totals)
+
+
+tracker = None
+
+
+def enable(depth=1):
+    global tracker
+    if tracker is None:
+        tracker = LeakTracker(depth)
+    return tracker.enable()
+
+
+def disable():
+    if tracker:
+        tracker.disable()
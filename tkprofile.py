@@ -0,0 +1,284 @@
+# Find out which callbacks make the user interface stutter.
+#
+# Once enabled, every Python function handed to Tk from then on (through
+# bind, tag_bind, after, command= options, register and so on, which all
+# end up in Misc._register) is wrapped so that each call is timed, and the
+# number of Tcl commands it runs is counted (with 'info cmdcount').  For
+# each callback we keep the number of calls, total and worst time, a
+# histogram of times, Tcl commands run, and how many calls took longer
+# than a frame (by default 1/60 s); those are also reported as they happen,
+# if a 'slow' function is given.
+#
+#   import tkprofile
+#   profiler = tkprofile.enable()
+#   ...
+#   tkprofile.Overlay(root)                 # live table of the worst offenders
+#   profiler.report()                       # or print a summary
+#   profiler.write_trace('trace.json')      # Chrome/Perfetto/speedscope trace
+#   profiler.write_collapsed('stacks.txt')  # for flamegraph.pl
+#
+# or, without changing the program:
+#
+#   python tkprofile.py [--trace trace.json] [--collapsed stacks.txt] [--overlay] script.py [args]
+#
+# Nothing is patched until enable() is called, so there's no cost at all
+# otherwise; after disable(), callbacks already wrapped just check a flag.
+
+import argparse
+from collections import deque
+import json
+import os
+import runpy
+import sys
+import time
+import tkinter
+from tkinter import ttk
+
+# Histogram buckets: upper bounds in milliseconds.
+BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 133, float('inf'))
+
+
+class Stats:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.tcl = 0
+        self.slow = 0
+        self.histogram = [0] * len(BUCKETS)
+
+    def add(self, elapsed, tcl, slow):
+        self.calls += 1
+        self.total += elapsed
+        self.worst = max(self.worst, elapsed)
+        self.tcl += tcl
+        self.slow += slow
+        ms = elapsed * 1000
+        for i, bound in enumerate(BUCKETS):
+            if ms <= bound:
+                self.histogram[i] += 1
+                break
+
+
+def describe(func):
+    code = getattr(func, '__code__', None)
+    name = getattr(func, '__qualname__', None) or type(func).__qualname__
+    if code:
+        return '%s (%s:%d)' % (name, os.path.basename(code.co_filename), code.co_firstlineno)
+    return name
+
+
+class Profiler:
+    def __init__(self, budget=1/60, events=200000, slow=None):
+        self.budget, self.slow = budget, slow
+        self.stats = {}
+        self.events = deque(maxlen=events)   # (name, start, duration)
+        self.stack = []
+        self.collapsed = {}
+        self.active = False
+        self.original = None
+        self.epoch = time.perf_counter()
+
+    def enable(self):
+        if self.original is None:
+            misc = tkinter.Misc
+            self.original = misc._register, misc.after
+            register, after = self.original
+            profiler = self
+
+            def _register(widget, func, subst=None, needcleanup=1):
+                if not getattr(func, '_tkprofiled', False) and \
+                        not getattr(func, '__qualname__', '').startswith('Misc.after.'):
+                    func = profiler.wrap(widget, func)
+                return register(widget, func, subst, needcleanup)
+
+            def after_(widget, ms, func=None, *args):
+                if func is not None and not getattr(func, '_tkprofiled', False):
+                    func = profiler.wrap(widget, func)
+                return after(widget, ms, func, *args)
+
+            misc._register = misc.register = _register
+            misc.after = after_
+        self.active = True
+        return self
+
+    def disable(self):
+        self.active = False
+        if self.original is not None:
+            misc = tkinter.Misc
+            misc._register = misc.register = self.original[0]
+            misc.after = self.original[1]
+            self.original = None
+
+    def wrap(self, widget, func):
+        name = describe(func)
+        tk = widget.tk
+        profiler = self
+
+        def profiled(*args):
+            if not profiler.active:
+                return func(*args)
+            # Each stack entry is [name, time spent in nested callbacks].
+            stack = profiler.stack
+            stack.append([name, 0.0])
+            before = int(tk.call('info', 'cmdcount'))
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                elapsed = time.perf_counter() - start
+                tcl = int(tk.call('info', 'cmdcount')) - before - 1
+                slow = elapsed > profiler.budget
+                # Created only now, so that nothing (a report run from
+                # this very callback, say) sees it with no calls.
+                stats = profiler.stats.get(name) or profiler.stats.setdefault(name, Stats(name))
+                stats.add(elapsed, tcl, slow)
+                # Self time only: flame graph tools add nested stacks'
+                # time into their callers' themselves.
+                key = ';'.join(entry[0] for entry in stack)
+                nested = stack.pop()[1]
+                profiler.collapsed[key] = profiler.collapsed.get(key, 0) + elapsed - nested
+                if stack:
+                    stack[-1][1] += elapsed
+                profiler.events.append((name, start - profiler.epoch, elapsed))
+                if slow and profiler.slow:
+                    profiler.slow(name, elapsed)
+
+        profiled._tkprofiled = True
+        profiled.__name__ = getattr(func, '__name__', type(func).__name__)
+        profiled.__qualname__ = getattr(func, '__qualname__', profiled.__name__)
+        return profiled
+
+    def reset(self):
+        self.stats.clear()
+        self.events.clear()
+        self.collapsed.clear()
+
+    def ranked(self, key=lambda s: s.total):
+        return sorted(self.stats.values(), key=key, reverse=True)
+
+    def report(self, file=None, limit=25):
+        file = file or sys.stderr
+        print('%8s %10s %9s %9s %8s %6s  %s' % ('calls', 'total ms', 'mean ms', 'max ms', 'tcl/call', 'slow', 'callback'),
+              file=file)
+        for s in self.ranked()[:limit]:
+            print('%8d %10.1f %9.3f %9.2f %8.1f %6d  %s' %
+                  (s.calls, s.total * 1000, s.total * 1000 / s.calls, s.worst * 1000, s.tcl / s.calls, s.slow, s.name),
+                  file=file)
+
+    # Chrome trace event format, which chrome://tracing, Perfetto and
+    # speedscope can all read.  Everything runs on the Tk thread, so all
+    # events go on one thread, where nested callbacks show up nested.
+    def write_trace(self, path):
+        pid = os.getpid()
+        events = [{'name': name, 'cat': 'callback', 'ph': 'X', 'pid': pid, 'tid': 1,
+                   'ts': start * 1e6, 'dur': duration * 1e6}
+                  for name, start, duration in self.events]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    # "Collapsed stack" lines, weighted in microseconds of self time, as
+    # read by flamegraph.pl and speedscope.  Callbacks run from inside
+    # another callback (by event_generate or update, say) appear nested in
+    # it.
+    def write_collapsed(self, path):
+        with open(path, 'w') as f:
+            for stack, elapsed in sorted(self.collapsed.items()):
+                f.write('%s %d\n' % (stack.replace(' ', '_'), round(elapsed * 1e6)))
+
+
+profiler = None
+
+
+def enable(**kwargs):
+    global profiler
+    if profiler is None:
+        profiler = Profiler(**kwargs)
+    return profiler.enable()
+
+
+def disable():
+    if profiler:
+        profiler.disable()
+
+
+# A window showing the callbacks that have taken the most time so far,
+# refreshed every 'interval' ms.  Its own refreshing isn't profiled.
+class Overlay:
+    COLUMNS = (('calls', 60), ('total', 80), ('mean', 70), ('max', 70), ('tcl', 70), ('slow', 50), ('hist', 170))
+
+    def __init__(self, root, interval=500, rows=20):
+        self.profiler, self.interval, self.rows = profiler, interval, rows
+        self.top = tkinter.Toplevel(root)
+        self.top.title('Callback profile')
+        self.tree = ttk.Treeview(self.top, columns=[c for c, w in self.COLUMNS], height=rows)
+        self.tree.heading('#0', text='callback')
+        self.tree.column('#0', width=320)
+        for c, w in self.COLUMNS:
+            self.tree.heading(c, text=c)
+            self.tree.column(c, width=w, anchor='e')
+        self.tree.grid(sticky='nsew')
+        self.top.columnconfigure(0, weight=1)
+        self.top.rowconfigure(0, weight=1)
+        self.ids = [self.tree.insert('', 'end') for i in range(rows)]
+        self._schedule()
+
+    def _schedule(self):
+        def tick():
+            self.refresh()
+        tick._tkprofiled = True     # don't profile the overlay itself
+        self.top.after(self.interval, tick)
+
+    def refresh(self):
+        if not self.top.winfo_exists():
+            return
+        bars = ' ▁▂▃▄▅▆▇█'
+        ranked = self.profiler.ranked()[:self.rows] if self.profiler else []
+        for i, id in enumerate(self.ids):
+            if i < len(ranked):
+                s = ranked[i]
+                peak = max(s.histogram) or 1
+                hist = ''.join(bars[round(n / peak * 8)] for n in s.histogram)
+                self.tree.item(id, text=s.name, values=(s.calls, '%.1f' % (s.total * 1000),
+                               '%.2f' % (s.total * 1000 / s.calls), '%.1f' % (s.worst * 1000),
+                               '%.1f' % (s.tcl / s.calls), s.slow, hist))
+            else:
+                self.tree.item(id, text='', values=())
+        self._schedule()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile the Tk callbacks of a script.')
+    parser.add_argument('--trace', help='write a Chrome trace event file')
+    parser.add_argument('--collapsed', help='write collapsed stacks for flame graphs')
+    parser.add_argument('--overlay', action='store_true', help='show a live overlay window')
+    parser.add_argument('--budget', type=float, default=1000 / 60, help='frame budget, ms')
+    parser.add_argument('script')
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    def slow(name, elapsed):
+        print('tkprofile: %s took %.1f ms' % (name, elapsed * 1000), file=sys.stderr)
+
+    enable(budget=args.budget / 1000, slow=slow)
+    if args.overlay:
+        mainloop = tkinter.Misc.mainloop
+        def withoverlay(widget, n=0):
+            Overlay(widget._root())
+            return mainloop(widget, n)
+        tkinter.Misc.mainloop = withoverlay
+    sys.argv = [args.script] + args.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    try:
+        runpy.run_path(args.script, run_name='__main__')
+    finally:
+        profiler.report()
+        if args.trace:
+            profiler.write_trace(args.trace)
+        if args.collapsed:
+            profiler.write_collapsed(args.collapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,24 +3,13 @@ from tkinter import ttk
 
 root=Tk()
 
-import re
+from validators import Form
 errmsg = StringVar()
 formatmsg = "Zip should be ##### or #####-####"
 
-def check_zip(newval, op):
-    errmsg.set('')
-    valid = re.match('^[0-9]{5}(\-[0-9]{4})?$', newval) is not None
-    btn.state(['!disabled'] if valid else ['disabled'])
-    if op=='key':
-        ok_so_far = re.match('^[0-9\-]*$', newval) is not None and len(newval) <= 10
-        if not ok_so_far:
-            errmsg.set(formatmsg)
-        return ok_so_far
-    elif op=='focusout':
-        if not valid:
-            errmsg.set(formatmsg)
-    return valid
-check_zip_wrapper = (root.register(check_zip), '%P', '%V')
+# The Process button is only enabled while the form is valid; the
+# callbacks run only when validity changes, not on every keystroke.
+form = Form(root, onchange=lambda valid: btn.state(['!disabled'] if valid else ['disabled']))
 
 zip = StringVar()
 f = ttk.Frame(root)
@@ -28,13 +17,14 @@ f.grid(column=0, row=0)
 ttk.Label(f, text='Name:').grid(column=0, row=0, padx=5, pady=5)
 ttk.Entry(f).grid(column=1, row=0, padx=5, pady=5)
 ttk.Label(f, text='Zip:').grid(column=0, row=1, padx=5, pady=5)
-e = ttk.Entry(f, textvariable=zip, validate='all', validatecommand=check_zip_wrapper)
+e = ttk.Entry(f, textvariable=zip)
 e.grid(column=1, row=1, padx=5, pady=5)
 btn = ttk.Button(f, text="Process")
 btn.grid(column=2, row=1, padx=5, pady=5)
 btn.state(['disabled'])
 msg = ttk.Label(f, font='TkSmallCaptionFont', foreground='red', textvariable=errmsg)
 msg.grid(column=1, row=2, padx=5, pady=5, sticky='w')
+form.add(e, r'[0-9]{5}(-[0-9]{4})?', onerror=lambda error: errmsg.set(formatmsg if error else ''))
 
 root.mainloop()
 
@@ -0,0 +1,81 @@
+# Keystroke latency for validated entries: a Form of compiled rules
+# versus validate.py's original re.match-per-keystroke callbacks.
+#
+#   python validatebench.py [--mode form|regex] [--fields 200] [--paste 100000]
+#
+# Types a zip code into each of --fields entries a character at a time
+# (including some rejected characters), then pastes --paste characters of
+# comma-separated numbers into a bulk-input entry, one keystroke at a
+# time for the last 1000.
+
+from tkinter import *
+from tkinter import ttk
+import argparse
+import re
+import statistics
+import time
+from validators import Form
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--mode', choices=('form', 'regex'), default='form')
+parser.add_argument('--fields', type=int, default=200)
+parser.add_argument('--paste', type=int, default=100000)
+args = parser.parse_args()
+
+ZIP, BULK = r'[0-9]{5}(-[0-9]{4})?', r'([0-9]+,)*[0-9]*'
+root = Tk()
+f = ttk.Frame(root); f.grid()
+btn = ttk.Button(f, text='Process'); btn.grid()
+entries = [ttk.Entry(f) for i in range(args.fields)]
+bulk = ttk.Entry(f)
+
+if args.mode == 'form':
+    form = Form(root, onchange=lambda valid: btn.state(['!disabled'] if valid else ['disabled']))
+    for e in entries:
+        form.add(e, ZIP)
+    form.add(bulk, BULK)
+else:
+    def checker(full, partial):
+        def check(newval, op):
+            valid = re.match(full, newval) is not None
+            btn.state(['!disabled'] if valid else ['disabled'])
+            if op == 'key':
+                return re.match(partial, newval) is not None
+            return valid
+        return (root.register(check), '%P', '%V')
+    for e in entries:
+        e.configure(validate='all', validatecommand=checker('^%s$' % ZIP, r'^[0-9\-]*$'))
+    bulk.configure(validate='all', validatecommand=checker('^%s$' % BULK, r'^[0-9,]*$'))
+
+keys = []
+typed = '12a345-x6789'
+start = time.perf_counter()
+for e in entries:
+    for ch in typed:
+        t = time.perf_counter()
+        e.insert('end', ch)
+        keys.append(time.perf_counter() - t)
+typing = time.perf_counter() - start
+assert all(e.get() == '12345-6789' for e in entries)
+
+text = ','.join(str(i) for i in range(args.paste))[:args.paste]
+t = time.perf_counter()
+bulk.insert(0, text[:-1000])
+paste = time.perf_counter() - t
+tail = []
+for ch in text[-1000:]:
+    t = time.perf_counter()
+    bulk.insert('end', ch)
+    tail.append(time.perf_counter() - t)
+assert bulk.get() == text
+root.destroy()
+
+def report(name, times):
+    ms = sorted(x * 1000 for x in times)
+    print('%s: %d keystrokes, median %.3f ms, p99 %.3f ms, max %.3f ms' %
+          (name, len(ms), statistics.median(ms), ms[int(len(ms) * 0.99) - 1], ms[-1]))
+
+print('mode %s, %d fields' % (args.mode, args.fields))
+report('typing into fields', keys)
+print('paste of %d characters: %.2f ms' % (len(text) - 1000, paste * 1000))
+report('typing after a %d-character value' % (len(text) - 1000), tail)
@@ -0,0 +1,388 @@
+# Fast, incremental validation of entry widgets.
+#
+# Validating with re.match on every keystroke re-checks the whole value
+# each time, and needs a second, hand-written pattern to decide whether
+# what's been typed so far could still become valid.  Here each rule is
+# compiled once into an automaton that reads the value a character at a
+# time.  Whether the text so far is a valid prefix (it hasn't hit a dead
+# end) and whether it's a complete match (it's in an accepting state) both
+# fall out of the state it reaches.  The states along the current value are
+# remembered, so typing a character is a single step from the previous
+# state, and an edit in the middle only re-reads from where it was made.
+#
+# Rules use a subset of regular expression syntax: literal characters,
+# '.', classes like [0-9a-f] or [^,], the escapes \d \w \s (and escaped
+# punctuation), grouping with ( ), alternation with |, and the repeats
+# ? * + {m} {m,} {m,n}.  A rule always has to match the whole value, so
+# leading ^ and trailing $ are allowed but not needed.
+#
+# A Form ties rules to entries.  All its entries share a single registered
+# Tcl command; keystrokes that can't lead to a valid value are rejected,
+# and callbacks run only when a field (or the whole form) changes between
+# valid and invalid, rather than on every keystroke.
+
+import os
+
+DEAD = -1
+
+
+class CharSet:
+    def __init__(self, ranges, negate=False):
+        self.ranges, self.negate = ranges, negate
+
+    def __contains__(self, ch):
+        for lo, hi in self.ranges:
+            if lo <= ch <= hi:
+                return not self.negate
+        return self.negate
+
+
+ANY = CharSet([], negate=True)
+ESCAPES = {
+    'd': [('0', '9')],
+    'w': [('0', '9'), ('a', 'z'), ('A', 'Z'), ('_', '_')],
+    's': [(' ', ' '), ('\t', '\r')],
+}
+
+
+class Parser:
+    def __init__(self, pattern):
+        self.pattern, self.pos = pattern, 0
+
+    def error(self, msg):
+        raise ValueError('%s at position %d in %r' % (msg, self.pos, self.pattern))
+
+    def peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def next(self):
+        ch = self.peek()
+        if ch is None:
+            self.error('unexpected end of pattern')
+        self.pos += 1
+        return ch
+
+    def parse(self):
+        if self.peek() == '^':
+            self.pos += 1
+        node = self.alternatives()
+        if self.peek() == '$' and self.pos == len(self.pattern) - 1:
+            self.pos += 1
+        if self.peek() is not None:
+            self.error('unexpected %r' % self.peek())
+        return node
+
+    def alternatives(self):
+        choices = [self.sequence()]
+        while self.peek() == '|':
+            self.pos += 1
+            choices.append(self.sequence())
+        return choices[0] if len(choices) == 1 else ('alt', choices)
+
+    def sequence(self):
+        items = []
+        while self.peek() not in (None, '|', ')') and not (self.peek() == '$' and self.pos == len(self.pattern) - 1):
+            items.append(self.repeat())
+        return ('seq', items)
+
+    def repeat(self):
+        node = self.atom()
+        while True:
+            ch = self.peek()
+            if ch == '?':
+                low, high = 0, 1
+            elif ch == '*':
+                low, high = 0, None
+            elif ch == '+':
+                low, high = 1, None
+            elif ch == '{':
+                end = self.pattern.find('}', self.pos)
+                if end < 0:
+                    self.error("missing '}'")
+                low, sep, high = self.pattern[self.pos + 1:end].partition(',')
+                try:
+                    low = int(low)
+                    high = low if not sep else int(high) if high else None
+                except ValueError:
+                    self.error('bad repeat count')
+                if high is not None and high < low:
+                    self.error('bad repeat range')
+                self.pos = end
+            else:
+                return node
+            self.pos += 1
+            node = ('repeat', node, low, high)
+
+    def atom(self):
+        ch = self.next()
+        if ch == '(':
+            if self.pattern.startswith('?:', self.pos):
+                self.pos += 2
+            node = self.alternatives()
+            if self.peek() != ')':
+                self.error("missing ')'")
+            self.pos += 1
+            return node
+        if ch == '[':
+            return ('chars', self.charclass())
+        if ch == '.':
+            return ('chars', ANY)
+        if ch == '\\':
+            esc = self.next()
+            if esc in ESCAPES:
+                return ('chars', CharSet(ESCAPES[esc]))
+            if esc.isalnum():
+                self.error('unsupported escape \\%s' % esc)
+            return ('chars', CharSet([(esc, esc)]))
+        if ch in '*+?{':
+            self.error('nothing to repeat')
+        return ('chars', CharSet([(ch, ch)]))
+
+    def charclass(self):
+        negate = self.peek() == '^'
+        if negate:
+            self.pos += 1
+        ranges = []
+        first = True
+        while True:
+            ch = self.next()
+            if ch == ']' and not first:
+                return CharSet(ranges, negate)
+            first = False
+            if ch == '\\':
+                ch = self.next()
+                if ch in ESCAPES:
+                    ranges.extend(ESCAPES[ch])
+                    continue
+            if self.peek() == '-' and self.pattern[self.pos + 1:self.pos + 2] not in ('', ']'):
+                self.pos += 1
+                hi = self.next()
+                if hi == '\\':
+                    hi = self.next()
+                if hi < ch:
+                    self.error('bad character range')
+                ranges.append((ch, hi))
+            else:
+                ranges.append((ch, ch))
+
+
+# A rule, compiled into an automaton.  States are small integers, with 0
+# the start state and DEAD meaning no valid value starts this way.  The
+# automaton is built from a nondeterministic one, a step at a time: each
+# of its states stands for a set of states of the underlying one, and is
+# only worked out the first time some input leads to it.
+class Rule:
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.edges = []         # per NFA state: [(charset, target)]
+        self.empty = []         # per NFA state: [target] (epsilon moves)
+        start = self._state()
+        self.accept = self._build(Parser(pattern).parse(), start)
+        self.live = self._live()
+        self.sets = []
+        self.ids = {}
+        self.moves = []
+        self.accepting = []
+        self._intern(self._closure({start}))
+
+    def _state(self):
+        self.edges.append([])
+        self.empty.append([])
+        return len(self.edges) - 1
+
+    def _build(self, node, start):
+        kind = node[0]
+        if kind == 'chars':
+            end = self._state()
+            self.edges[start].append((node[1], end))
+            return end
+        if kind == 'seq':
+            for item in node[1]:
+                start = self._build(item, start)
+            return start
+        if kind == 'alt':
+            end = self._state()
+            for choice in node[1]:
+                self.empty[self._build(choice, start)].append(end)
+            return end
+        body, low, high = node[1:]
+        for i in range(low):
+            start = self._build(body, start)
+        if high is None:
+            loop = self._state()
+            self.empty[start].append(loop)
+            self.empty[self._build(body, loop)].append(loop)
+            return loop
+        end = self._state()
+        self.empty[start].append(end)
+        for i in range(high - low):
+            start = self._build(body, start)
+            self.empty[start].append(end)
+        return end
+
+    # The NFA states from which the accepting state can still be reached.
+    def _live(self):
+        back = [[] for s in self.edges]
+        for s in range(len(self.edges)):
+            for charset, t in self.edges[s]:
+                back[t].append(s)
+            for t in self.empty[s]:
+                back[t].append(s)
+        live, todo = {self.accept}, [self.accept]
+        while todo:
+            for s in back[todo.pop()]:
+                if s not in live:
+                    live.add(s)
+                    todo.append(s)
+        return live
+
+    def _closure(self, states):
+        todo = list(states)
+        states = set(states)
+        while todo:
+            for t in self.empty[todo.pop()]:
+                if t not in states:
+                    states.add(t)
+                    todo.append(t)
+        return frozenset(states & self.live)
+
+    def _intern(self, states):
+        if not states:
+            return DEAD
+        id = self.ids.get(states)
+        if id is None:
+            id = self.ids[states] = len(self.sets)
+            self.sets.append(states)
+            self.moves.append({})
+            self.accepting.append(self.accept in states)
+        return id
+
+    def step(self, state, ch):
+        if state == DEAD:
+            return DEAD
+        moves = self.moves[state]
+        target = moves.get(ch)
+        if target is None:
+            reached = {t for s in self.sets[state] for charset, t in self.edges[s] if ch in charset}
+            target = moves[ch] = self._intern(self._closure(reached))
+        return target
+
+    def run(self, text, state=0):
+        step = self.step
+        for ch in text:
+            state = step(state, ch)
+            if state == DEAD:
+                break
+        return state
+
+    def accepts(self, state):
+        return state != DEAD and self.accepting[state]
+
+    def prefix(self, text):
+        return self.run(text) != DEAD
+
+    def fullmatch(self, text):
+        return self.accepts(self.run(text))
+
+
+_rules = {}
+
+# Compiled rules are cached, so fields sharing a pattern share the work.
+def compile(pattern):
+    if pattern not in _rules:
+        _rules[pattern] = Rule(pattern)
+    return _rules[pattern]
+
+
+class Field:
+    def __init__(self, entry, rule, onchange=None, onerror=None):
+        self.entry, self.rule = entry, rule
+        self.onchange, self.onerror = onchange, onerror
+        self.text = ''
+        self.path = [0]         # state after each prefix of text
+        self.valid = rule.accepts(0)
+        self.error = False
+
+    # States for a new value, reusing those for the part it shares with
+    # the current one; None if it can't lead anywhere.
+    def states(self, text):
+        if text.startswith(self.text):
+            same = len(self.text)
+        else:
+            same = len(os.path.commonprefix([self.text, text]))
+        path = self.path[:same + 1]
+        state, step = path[-1], self.rule.step
+        for ch in text[same:]:
+            state = step(state, ch)
+            if state == DEAD:
+                return None
+            path.append(state)
+        return path
+
+    def seterror(self, error):
+        if error != self.error:
+            self.error = error
+            if self.onerror:
+                self.onerror(error)
+
+
+class Form:
+    def __init__(self, root, onchange=None):
+        self.onchange = onchange
+        self.fields = {}
+        self.invalid = 0
+        self.command = (root.register(self._validate), '%W', '%P', '%V')
+        self.calls = 0
+
+    # Validate an entry against a rule (a pattern or a compiled Rule).
+    # onchange(valid) is called when the value becomes or stops being a
+    # complete match, onerror(error) when the entry starts or stops
+    # showing an error: a rejected keystroke, or leaving it incomplete,
+    # until the next keystroke, focus change or change to its variable.
+    # If the form was given an onchange, it's called with whether all
+    # fields are valid, whenever that changes.
+    def add(self, entry, rule, onchange=None, onerror=None):
+        if isinstance(rule, str):
+            rule = compile(rule)
+        field = self.fields[str(entry)] = Field(entry, rule, onchange, onerror)
+        if not field.valid:
+            self.invalid += 1
+        self._update(field, entry.get())
+        entry.configure(validate='all', validatecommand=self.command)
+        return field
+
+    def valid(self):
+        return self.invalid == 0
+
+    def _validate(self, widget, newval, op):
+        self.calls += 1
+        field = self.fields[widget]
+        path = field.states(newval)
+        if op == 'key':
+            field.seterror(path is None)
+            if path is None:
+                return False
+        self._update(field, newval, path)
+        if op != 'key':
+            # An error shows until the next validation of any kind, as
+            # with a validatecommand that clears its message each time.
+            field.seterror(op == 'focusout' and not field.valid)
+        return field.valid if op in ('focusin', 'focusout') else True
+
+    def _update(self, field, text, path=False):
+        if path is False:
+            path = field.states(text)
+        if path is None:
+            field.text, field.path = '', [0]
+            valid = False
+        else:
+            field.text, field.path = text, path
+            valid = field.rule.accepts(path[-1])
+        if valid != field.valid:
+            was = self.valid()
+            field.valid = valid
+            self.invalid += -1 if valid else 1
+            if field.onchange:
+                field.onchange(valid)
+            if self.onchange and self.valid() != was:
+                self.onchange(self.valid())
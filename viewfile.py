@@ -0,0 +1,39 @@
+from tkinter import *
+from tkinter import ttk
+from tkinter import filedialog
+from fileview import FileView
+import sys
+
+root = Tk()
+path = sys.argv[1] if len(sys.argv) > 1 else filedialog.askopenfilename()
+if not path:
+    sys.exit()
+root.title(path)
+
+view = FileView(root, path, width=100, height=30)
+view.grid(column=0, row=0, columnspan=3, sticky=(N,W,E,S))
+
+# Jump straight to any line; this costs the same at line 10 as at line
+# 10,000,000.
+line = StringVar()
+def gotoLine(*args):
+    try:
+        view.goto(int(line.get()) - 1)
+    except ValueError:
+        pass
+
+ttk.Label(root, text='Line:').grid(column=0, row=1, padx=5, pady=5)
+e = ttk.Entry(root, textvariable=line, width=12)
+e.grid(column=1, row=1, sticky=W, pady=5)
+e.bind('<Return>', gotoLine)
+
+status = StringVar()
+ttk.Label(root, textvariable=status, anchor=E).grid(column=2, row=1, sticky=(W,E), padx=5)
+def showStatus():
+    status.set('%d lines%s' % (view.total, '' if view.follow else '  (not following)'))
+    root.after(500, showStatus)
+showStatus()
+
+root.grid_columnconfigure(2, weight=1)
+root.grid_rowconfigure(0, weight=1)
+root.mainloop()
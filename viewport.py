@@ -0,0 +1,160 @@
+# Viewport culling for drawings much larger than the window.
+#
+# A GridIndex is a simple spatial index: the plane is divided into square
+# cells, and each cell remembers which strokes' bounding boxes overlap it.
+# A Viewport keeps every stroke of a StrokeList in such an index, and
+# whenever the canvas view changes, it makes sure that only strokes near
+# the visible area have canvas items.  Items for strokes that scroll out
+# of range are hidden and recycled for strokes that scroll into range.
+# Hit-testing and rubber-band selection use the same index, so they never
+# need to ask the canvas about items that may not exist.
+
+from bisect import bisect_left
+from math import hypot
+
+
+class GridIndex:
+    def __init__(self, cellsize=512):
+        self.cellsize = cellsize
+        self.cells = {}
+        self.bounds = {}
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def _keys(self, x0, y0, x1, y1):
+        size = self.cellsize
+        return [(col, row) for col in range(int(x0 // size), int(x1 // size) + 1)
+                           for row in range(int(y0 // size), int(y1 // size) + 1)]
+
+    def insert(self, id, bounds):
+        if id in self.bounds:
+            self.remove(id)
+        self.bounds[id] = bounds
+        for key in self._keys(*bounds):
+            self.cells.setdefault(key, set()).add(id)
+
+    def remove(self, id):
+        bounds = self.bounds.pop(id, None)
+        if bounds is not None:
+            for key in self._keys(*bounds):
+                cell = self.cells[key]
+                cell.discard(id)
+                if not cell:
+                    del self.cells[key]
+
+    # Ids of everything whose bounding box overlaps the given rectangle.
+    def query(self, x0, y0, x1, y1):
+        found = set()
+        for key in self._keys(x0, y0, x1, y1):
+            for id in self.cells.get(key, ()):
+                if id not in found:
+                    bx0, by0, bx1, by1 = self.bounds[id]
+                    if bx0 <= x1 and bx1 >= x0 and by0 <= y1 and by1 >= y0:
+                        found.add(id)
+        return found
+
+
+class Viewport:
+    def __init__(self, strokes, margin=200, cellsize=512, poolsize=500):
+        self.strokes = strokes
+        self.canvas = strokes.canvas
+        self.margin = margin
+        self.poolsize = poolsize
+        self.index = GridIndex(cellsize)
+        self.shown = set()
+        self.pool = []
+        self.scheduled = None
+        for stroke in strokes:
+            self.index.insert(stroke.id, stroke.bounds())
+        strokes.watchers.append(self.update)
+        # Route the canvas's scroll commands through us, so we hear about
+        # every change to the view (scrollbars, scan_dragto, resizing...).
+        for option in ('xscrollcommand', 'yscrollcommand'):
+            self.canvas[option] = self._watch(self.canvas[option])
+        self.canvas.bind('<Configure>', lambda e: self.schedule(), add=True)
+        self.schedule()
+
+    def _watch(self, command):
+        command = self.canvas.tk.splitlist(command)
+        def scrolled(first, last):
+            if command:
+                self.canvas.tk.call(*command, first, last)
+            self.schedule()
+        return self.canvas.register(scrolled)
+
+    def update(self, event, stroke):
+        if event == 'added':
+            self.index.insert(stroke.id, stroke.bounds())
+            if stroke.item is not None:
+                self.shown.add(stroke.id)
+            self.schedule()
+        elif event == 'removed':
+            self.index.remove(stroke.id)
+            self.shown.discard(stroke.id)
+
+    def schedule(self):
+        if self.scheduled is None:
+            self.scheduled = self.canvas.after_idle(self.refresh)
+
+    def visible(self):
+        c, m = self.canvas, self.margin
+        return (c.canvasx(0) - m, c.canvasy(0) - m,
+                c.canvasx(c.winfo_width()) + m, c.canvasy(c.winfo_height()) + m)
+
+    def refresh(self):
+        self.scheduled = None
+        wanted = self.index.query(*self.visible())
+        strokes = self.strokes.strokes
+        for id in self.shown - wanted:
+            item = self.strokes.release(strokes[id], recycle=len(self.pool) < self.poolsize)
+            if item is not None:
+                self.pool.append(item)
+        # Items made or recycled for strokes coming into range go just
+        # below the next stroke drawn after them, so the stacking order
+        # stays the order they were drawn in.
+        order = sorted(id for id in self.shown & wanted if strokes[id].item is not None)
+        for id in sorted(wanted - self.shown):
+            stroke = strokes[id]
+            self.strokes.restore(stroke, self.pool.pop() if self.pool else None)
+            if stroke.item is not None:
+                i = bisect_left(order, id)
+                if i < len(order):
+                    self.canvas.tag_lower(stroke.item, strokes[order[i]].item)
+                else:
+                    self.canvas.tag_raise(stroke.item)
+                order.insert(i, id)
+        self.shown = wanted
+
+    # The topmost stroke passing within 'halo' of the point, or None.
+    def find(self, x, y, halo=3):
+        strokes = self.strokes.strokes
+        for id in sorted(self.index.query(x - halo, y - halo, x + halo, y + halo), reverse=True):
+            stroke = strokes[id]
+            reach = halo + float(stroke.options.get('width', 1)) / 2
+            if distance(stroke.coords, x, y) <= reach:
+                return stroke
+        return None
+
+    # All strokes lying entirely inside the rectangle.
+    def enclosed(self, x0, y0, x1, y1):
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        found = []
+        for id in sorted(self.index.query(x0, y0, x1, y1)):
+            bx0, by0, bx1, by1 = self.index.bounds[id]
+            if bx0 >= x0 and by0 >= y0 and bx1 <= x1 and by1 <= y1:
+                found.append(self.strokes.strokes[id])
+        return found
+
+
+# Shortest distance from a point to a polyline.
+def distance(coords, x, y):
+    best = hypot(coords[0] - x, coords[1] - y)
+    for i in range(2, len(coords), 2):
+        x0, y0, x1, y1 = coords[i-2], coords[i-1], coords[i], coords[i+1]
+        dx, dy = x1 - x0, y1 - y0
+        length = dx*dx + dy*dy
+        t = max(0, min(1, ((x - x0)*dx + (y - y0)*dy) / length)) if length else 0
+        best = min(best, hypot(x0 + t*dx - x, y0 + t*dy - y))
+    return best
@@ -0,0 +1,219 @@
+# A Listbox that can show a million rows.
+#
+# A VirtualListbox is given a Python sequence of strings, but only ever
+# holds the rows currently visible.  Scrolling changes which slice of the
+# sequence is shown; the scrollbar is told where that slice lies in the
+# whole sequence, so it behaves just as with an ordinary listbox.  The
+# selection is kept in a bytearray with one byte per row, striping is
+# applied only to the visible rows, and when the visible rows change only
+# the ones whose text differs are replaced.
+#
+# Indices passed to and returned from curselection, selection_set, see,
+# get and friends refer to positions in the whole sequence, and the
+# <<ListboxSelect>> event is generated as usual, so code written for a
+# plain Listbox keeps working.  Hook up a scrollbar the normal way, via
+# the scrollbar's command and the listbox's yscrollcommand.
+
+from tkinter import *
+from tkinter import font
+
+
+class VirtualListbox(Listbox):
+    def __init__(self, parent, items=(), stripe='#f0f0ff', **kwargs):
+        self.yscroll = kwargs.pop('yscrollcommand', None)
+        kwargs.setdefault('exportselection', False)
+        super().__init__(parent, **kwargs)
+        self.stripe = stripe
+        self.items = items
+        self.selected = bytearray(len(items))
+        self.top = 0
+        self.rows = int(self['height'])
+        self.shown = []
+        self.clicked = False
+        inset = int(self['borderwidth']) + int(self['highlightthickness'])
+        self.inset = inset
+        self.lineheight = font.Font(font=self['font']).metrics('linespace') + 1
+        # Our own bindings go first in the bindtags, so that the selection
+        # is synced before any <<ListboxSelect>> handler of the caller runs,
+        # and so our scrolling replaces the Listbox class's.
+        tag = 'VirtualListbox%s' % self._w
+        self.bindtags((tag,) + self.bindtags())
+        self.bind_class(tag, '<<ListboxSelect>>', self._sync)
+        self.bind_class(tag, '<Configure>', self._resized)
+        self.bind_class(tag, '<Button-1>', self._clicked)
+        self.bind_class(tag, '<MouseWheel>', lambda e: self._scroll(-e.delta // 120 * 3))
+        self.bind_class(tag, '<Button-4>', lambda e: self._scroll(-3))
+        self.bind_class(tag, '<Button-5>', lambda e: self._scroll(3))
+        self.bind_class(tag, '<Up>', lambda e: self._step(-1))
+        self.bind_class(tag, '<Down>', lambda e: self._step(1))
+        self.bind_class(tag, '<Prior>', lambda e: self._step(-self.rows))
+        self.bind_class(tag, '<Next>', lambda e: self._step(self.rows))
+        self.bind_class(tag, '<Home>', lambda e: self._step(-len(self.items)))
+        self.bind_class(tag, '<End>', lambda e: self._step(len(self.items)))
+        self.render()
+
+    def configure(self, cnf=None, **kw):
+        if cnf and 'yscrollcommand' in cnf:
+            cnf = dict(cnf)
+            self.yscroll = cnf.pop('yscrollcommand')
+        if 'yscrollcommand' in kw:
+            self.yscroll = kw.pop('yscrollcommand')
+            if not cnf and not kw:
+                return
+        return super().configure(cnf, **kw)
+    config = configure
+
+    def __setitem__(self, key, value):
+        self.configure({key: value})
+
+    # Show a different sequence, keeping the scroll position if possible.
+    def set_items(self, items):
+        self.items = items
+        self.selected = bytearray(len(items))
+        self.top = max(0, min(self.top, len(items) - self.rows))
+        self.render()
+
+    def render(self):
+        visible = [str(item) for item in self.items[self.top:self.top + self.rows + 1]]
+        shown = self.shown
+        changed = [i for i in range(len(visible)) if i >= len(shown) or visible[i] != shown[i]]
+        if len(changed) > len(visible) // 2:
+            super().delete(0, 'end')
+            if visible:
+                super().insert(0, *visible)
+        else:
+            if len(shown) > len(visible):
+                super().delete(len(visible), 'end')
+            for i in changed:
+                super().delete(i)
+                super().insert(i, visible[i])
+        self.shown = visible
+        if self.stripe:
+            for i in range(len(visible)):
+                super().itemconfigure(i, background=self.stripe if (self.top + i) % 2 == 0 else '')
+        super().selection_clear(0, 'end')
+        for i in range(len(visible)):
+            if self.selected[self.top + i]:
+                super().selection_set(i)
+        if self.yscroll:
+            first, last = self.yview()
+            if callable(self.yscroll):
+                self.yscroll(first, last)
+            else:
+                self.tk.call(self.yscroll, first, last)
+
+    def yview(self, *args):
+        if not args:
+            total = max(len(self.items), 1)
+            return self.top / total, min(1.0, (self.top + self.rows) / total)
+        if args[0] == 'moveto':
+            self._moveto(int(float(args[1]) * len(self.items)))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self._scroll(amount * self.rows if args[2] == 'pages' else amount)
+
+    def yview_moveto(self, fraction):
+        self.yview('moveto', fraction)
+
+    def yview_scroll(self, number, what):
+        self.yview('scroll', number, what)
+
+    def _moveto(self, top):
+        top = max(0, min(top, len(self.items) - self.rows))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def _scroll(self, amount):
+        self._moveto(self.top + amount)
+        return 'break'
+
+    # Keyboard navigation: move the (single) selection and keep it visible.
+    def _step(self, amount):
+        idxs = self.curselection()
+        index = max(0, min((idxs[0] + amount) if idxs else 0, len(self.items) - 1))
+        if self.items:
+            self.selection_clear(0, 'end')
+            self.selection_set(index)
+            self.see(index)
+            self.event_generate('<<ListboxSelect>>')
+        return 'break'
+
+    def _resized(self, event):
+        rows = max(1, (event.height - 2 * self.inset) // self.lineheight)
+        if rows != self.rows:
+            self.rows = rows
+            self.top = max(0, min(self.top, len(self.items) - rows))
+            self.render()
+
+    # A click without Shift or Control replaces the whole selection in
+    # 'extended' mode, not just the part that's visible.
+    def _clicked(self, event):
+        self.clicked = not event.state & 0x5
+
+    # The Listbox has just changed its selection in response to the user;
+    # record that against the rows currently shown.
+    def _sync(self, event):
+        visible = set(super().curselection())
+        mode = self['selectmode']
+        if mode in ('browse', 'single') or (mode == 'extended' and self.clicked):
+            if visible:
+                self.selected[:] = bytes(len(self.selected))
+        self.clicked = False
+        for i in range(len(self.shown)):
+            self.selected[self.top + i] = i in visible
+
+    def size(self):
+        return len(self.items)
+
+    def get(self, first, last=None):
+        first = self._index(first)
+        if last is None:
+            return self.items[first]
+        return tuple(self.items[first:self._index(last) + 1])
+
+    def nearest(self, y):
+        return self.top + super().nearest(y)
+
+    def curselection(self):
+        found, find, pos = [], self.selected.find, 0
+        while True:
+            pos = find(1, pos)
+            if pos < 0:
+                return tuple(found)
+            found.append(pos)
+            pos += 1
+
+    def selection_includes(self, index):
+        return bool(self.selected[self._index(index)])
+
+    def selection_set(self, first, last=None):
+        self._select(first, last, 1)
+
+    def selection_clear(self, first, last=None):
+        self._select(first, last, 0)
+
+    select_set, select_clear, select_includes = selection_set, selection_clear, selection_includes
+
+    def _select(self, first, last, value):
+        first = self._index(first)
+        last = first if last is None else self._index(last)
+        if last >= first:
+            self.selected[first:last + 1] = bytes([value]) * (last - first + 1)
+        for i in range(max(first, self.top), min(last + 1, self.top + len(self.shown))):
+            if value:
+                super().selection_set(i - self.top)
+            else:
+                super().selection_clear(i - self.top)
+
+    def see(self, index):
+        index = self._index(index)
+        if not self.top <= index < self.top + self.rows:
+            self._moveto(index - self.rows // 2)
+
+    def _index(self, index):
+        if index == 'end':
+            return len(self.items) - 1
+        if index in ('active', 'anchor'):
+            return self.top + int(super().index(index))
+        return int(index)